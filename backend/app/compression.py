@@ -0,0 +1,185 @@
+"""
+Response compression negotiated on Accept-Encoding
+
+COMPRESSION_ALGORITHMS lists the encodings the server may use in order
+of preference; "br" needs the optional brotli package and is skipped
+without it. Complete bodies under COMPRESSION_MIN_SIZE go out as they
+are. Streaming responses (the attendance export) are compressed chunk
+by chunk and flushed after each one, so nothing is buffered beyond the
+chunk in hand and the client keeps receiving data as it is produced.
+
+Compressed responses get Content-Encoding. Whenever an encoding was
+negotiated, the ETag is weakened (W/"...") on every response, 200 or
+304, compressed or sent as is (e.g. under the minimum size): the bytes
+may differ from the identity representation while the data is the
+same, and the 304 must repeat the validator the client holds.
+If-None-Match compares weakly, so revalidation works for either form.
+"""
+import zlib
+from typing import List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Content types worth compressing; everything else (e.g. Parquet) is already compact
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript")
+
+# Chunks at least this large are compressed off the event loop
+_OFFLOAD_BYTES = 256 * 1024
+
+
+def available_algorithms() -> List[str]:
+    """Configured encodings this process can produce, in preference order"""
+    allowed = [name.strip() for name in settings.COMPRESSION_ALGORITHMS.split(",") if name.strip()]
+    return [name for name in allowed if name == "gzip" or (name == "br" and brotli is not None)]
+
+
+def negotiate(accept_encoding: str, algorithms: List[str]) -> Optional[str]:
+    """Pick the encoding with the highest q-value, ties going to server preference"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for algorithm in algorithms:
+        weight = weights.get(algorithm, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = algorithm, weight
+    return best
+
+
+class Encoder:
+    """Incremental compressor for one response"""
+
+    def __init__(self, algorithm: str, gzip_level: int, brotli_quality: int):
+        self.algorithm = algorithm
+        if algorithm == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits 31: gzip container
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data and flush, so everything so far is decodable by the client"""
+        if self.algorithm == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last data and end the stream"""
+        if self.algorithm == "br":
+            return self._compressor.process(data) + self._compressor.finish()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _weak_etag(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    etag = _header(headers, b"etag")
+    if etag is None or etag.startswith(b"W/"):
+        return headers
+    return _without(headers, b"etag") + [(b"etag", b"W/" + etag)]
+
+
+def _without(headers: List[Tuple[bytes, bytes]], *names: bytes) -> List[Tuple[bytes, bytes]]:
+    return [(key, value) for key, value in headers if key.lower() not in names]
+
+
+async def _run(function, *args):
+    if sum(len(arg) for arg in args if isinstance(arg, bytes)) >= _OFFLOAD_BYTES:
+        return await run_in_threadpool(function, *args)
+    return function(*args)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses per COMPRESSION_* settings"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        algorithms = available_algorithms()
+        if not algorithms:
+            await self.app(scope, receive, send)
+            return
+        accept = _header(scope["headers"], b"accept-encoding")
+        algorithm = negotiate(accept.decode("latin-1"), algorithms) if accept else None
+
+        start = None
+        encoder: Optional[Encoder] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                if start["status"] == 304 and algorithm is not None:
+                    # Same validator as the 200 the client holds, weakened below
+                    start = {**start, "headers": _weak_etag(list(start.get("headers", [])))}
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                headers = list(start.get("headers", []))
+                content_type = (_header(headers, b"content-type") or b"").decode("latin-1")
+                compressible = start["status"] >= 200 and start["status"] not in (204, 304) \
+                    and content_type.startswith(COMPRESSIBLE_TYPES) \
+                    and _header(headers, b"content-encoding") is None
+                if compressible:
+                    # The representation depends on Accept-Encoding whether or not it is compressed
+                    vary = _header(headers, b"vary")
+                    headers = _without(headers, b"vary") + [
+                        (b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding")
+                    ]
+                if not compressible or algorithm is None or (not more_body and len(body) < settings.COMPRESSION_MIN_SIZE):
+                    passthrough = True
+                    if algorithm is not None:
+                        headers = _weak_etag(headers)
+                    await send({**start, "headers": headers})
+                    await send(message)
+                    return
+
+                encoder = Encoder(algorithm, settings.COMPRESSION_GZIP_LEVEL, settings.COMPRESSION_BROTLI_QUALITY)
+                headers = _weak_etag(_without(headers, b"content-length"))
+                headers.append((b"content-encoding", algorithm.encode()))
+                if not more_body:
+                    compressed = await _run(encoder.finish, body)
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                    await send({**start, "headers": headers})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send({**start, "headers": headers})
+
+            if more_body:
+                chunk = await _run(encoder.compress, body) if body else b""
+            else:
+                chunk = await _run(encoder.finish, body)
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
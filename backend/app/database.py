@@ -2,34 +2,102 @@
 Database configuration and session management.
 Supports both SQLite (local dev) and PostgreSQL (production).
 """
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from .config import settings
+from . import metrics
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._metrics_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
 
 
-def _get_engine_kwargs():
-    """Engine options: SQLite needs check_same_thread; PostgreSQL uses pool_pre_ping."""
-    url = settings.DATABASE_URL
+def _normalize_url(url: str) -> str:
+    """Normalize postgres:// to postgresql:// (e.g. Render, Heroku)"""
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://") :]
+    return url
+
+
+def _get_engine_kwargs(url: str):
+    """
+    Engine options: SQLite needs check_same_thread; PostgreSQL gets a sized,
+    instrumented pool with pre-ping, recycling and an optional statement timeout.
+    """
+    kwargs = {"query_cache_size": settings.DB_QUERY_CACHE_SIZE}
     if url.startswith("sqlite"):
-        return {"connect_args": {"check_same_thread": False}}
+        kwargs["connect_args"] = {"check_same_thread": False}
+        return kwargs
     # PostgreSQL (and others): validate connections with pool_pre_ping
-    return {"pool_pre_ping": True}
+    kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql"):
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return kwargs
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite ignores FOREIGN KEY clauses (and ON DELETE CASCADE) unless enabled per connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _create_engine(url: str):
+    url = _normalize_url(url)
+    created = create_engine(url, **_get_engine_kwargs(url))
+    if url.startswith("sqlite"):
+        event.listen(created, "connect", _enable_sqlite_foreign_keys)
+    # Attribute every statement to the current request for timing and query budgets
+    event.listen(created, "before_cursor_execute", metrics.before_cursor_execute)
+    event.listen(created, "after_cursor_execute", metrics.after_cursor_execute)
+    return created
 
 
-# Normalize postgres:// to postgresql:// (e.g. Render, Heroku)
-_db_url = settings.DATABASE_URL
-if _db_url.startswith("postgres://"):
-    _db_url = "postgresql://" + _db_url[len("postgres://") :]
+# Create database engine (primary, used for writes)
+engine = _create_engine(settings.DATABASE_URL)
 
-# Create database engine
-engine = create_engine(
-    _db_url,
-    **_get_engine_kwargs(),
-)
+# Optional read replica for GET routes; falls back to the primary
+read_engine = _create_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
 
-# Create session factory
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Base class for models
 Base = declarative_base()
@@ -47,10 +115,51 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """
+    Read-only database dependency for GET endpoints
+    Uses the read replica when DATABASE_READ_URL is set
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def pool_metrics():
+    """Connection pool utilization and checkout waits per engine"""
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["replica"] = read_engine
+    
+    metrics = {}
+    for name, bound_engine in engines.items():
+        pool = bound_engine.pool
+        stats = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+                utilization=round(pool.checkedout() / capacity, 4) if capacity else 0.0,
+            )
+        if isinstance(pool, InstrumentedQueuePool):
+            stats.update(
+                checkouts=pool.checkouts,
+                checkout_timeouts=pool.checkout_timeouts,
+                wait_seconds_total=round(pool.wait_seconds_total, 6),
+                wait_seconds_max=round(pool.wait_seconds_max, 6),
+            )
+        metrics[name] = stats
+    return metrics
+
+
 def init_db():
     """
-    Initialize database tables
-    Creates all tables defined in models
+    Create or upgrade the database schema
+    Applies pending migrations; run once per deploy with `python -m app.migrations`
     """
-    from .models import employee, attendance
-    Base.metadata.create_all(bind=engine)
+    from .migrations import migrate
+    migrate(engine)
@@ -1,42 +1,112 @@
 """
 Main FastAPI application
 """
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from .compression import CompressionMiddleware
 from .config import settings
-from .database import init_db
-from .routers import employee_router, attendance_router
-
-# Initialize database tables
-init_db()
-
-# Create FastAPI application
-app = FastAPI(
-    title=settings.APP_NAME,
-    version=settings.APP_VERSION,
-    description="A lightweight Human Resource Management System for managing employees and attendance",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Configure CORS - credentials only when using specific origins (not "*")
-_cors_origins = settings.get_cors_origins()
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=_cors_origins,
-    allow_credentials=("*" not in _cors_origins),
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],
-)
-
-# Include routers
-app.include_router(employee_router)
-app.include_router(attendance_router)
-
-
-@app.get("/", tags=["root"])
+from .database import engine, pool_metrics
+from .metrics import RequestTimingMiddleware, render_gauges, route_metrics
+from .migrations import schema_status
+from .routers import employee_router, attendance_router, batch_router
+from .services import partitions, rollups
+from .services.cache import cache_metrics
+from .services.directory import employee_directory
+from .services.single_flight import single_flight_metrics
+from .services.write_buffer import attendance_write_buffer
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup and shutdown
+    
+    Route handlers use the synchronous database session and run in the
+    threadpool, so its size bounds how many requests can query at once.
+    Background jobs (the rollup refresher, attendance partition
+    maintenance and the attendance write buffer) run until shutdown;
+    the write buffer commits everything still queued before exiting.
+    
+    The schema is managed by `python -m app.migrations`; startup only
+    checks that it has been run, so workers booting together never race
+    on DDL, and warms the employee directory.
+    """
+    current, expected = await to_thread.run_sync(schema_status, engine)
+    if current < expected:
+        raise RuntimeError(
+            f"Database schema is at version {current}, this release needs {expected}; "
+            "run `python -m app.migrations` first"
+        )
+    if current > expected:
+        logger.warning("Database schema version %s is newer than this release (%s)", current, expected)
+    
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    await to_thread.run_sync(employee_directory.warm, engine)
+    
+    stop = asyncio.Event()
+    background = []
+    if settings.ROLLUP_REFRESH_ENABLED:
+        background.append(asyncio.create_task(rollups.run_refresher(stop)))
+    if settings.ATTENDANCE_PARTITIONING or settings.ATTENDANCE_HOT_YEARS:
+        background.append(asyncio.create_task(partitions.run_maintenance(stop)))
+    if settings.ATTENDANCE_WRITE_BUFFER:
+        background.append(asyncio.create_task(attendance_write_buffer.run(stop)))
+    
+    yield
+    
+    stop.set()
+    await asyncio.gather(*background)
+
+
+health_router = APIRouter()
+
+
+def create_app() -> FastAPI:
+    """Build the application: middleware, API routers and the health routes"""
+    application = FastAPI(
+        title=settings.APP_NAME,
+        version=settings.APP_VERSION,
+        description="A lightweight Human Resource Management System for managing employees and attendance",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan,
+    )
+    
+    # Configure CORS - credentials only when using specific origins (not "*")
+    cors_origins = settings.get_cors_origins()
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_credentials=("*" not in cors_origins),
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["*"],
+    )
+    
+    # gzip/brotli negotiated on Accept-Encoding; streamed exports chunk by chunk
+    application.add_middleware(CompressionMiddleware)
+    
+    # Per-request wall time, SQL query counts and Server-Timing headers
+    application.add_middleware(RequestTimingMiddleware)
+    
+    # Include routers
+    application.include_router(employee_router)
+    application.include_router(attendance_router)
+    application.include_router(batch_router)
+    application.include_router(health_router)
+    return application
+
+
+@health_router.get("/", tags=["root"])
 async def root():
     """
     Root endpoint - API information
@@ -49,7 +119,7 @@ async def root():
     }
 
 
-@app.get("/health", tags=["health"])
+@health_router.get("/health", tags=["health"])
 async def health_check():
     """
     Health check endpoint
@@ -58,3 +128,68 @@ async def health_check():
         "status": "healthy",
         "version": settings.APP_VERSION
     }
+
+
+@health_router.get("/health/cache", tags=["health"])
+async def cache_health():
+    """
+    Cache hit/miss metrics for this worker process
+    """
+    return cache_metrics()
+
+
+@health_router.get("/health/pool", tags=["health"])
+async def pool_health():
+    """
+    Database connection pool utilization and checkout waits for this worker
+    """
+    return pool_metrics()
+
+
+@health_router.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus-style metrics for this worker process
+    
+    Per-route latency histograms and SQL totals, cache hit/miss counters,
+    single-flight counters and connection pool gauges.
+    """
+    lines = route_metrics.render()
+    
+    cache_values = {}
+    for name, values in cache_metrics().items():
+        for field in ("hits", "misses", "invalidations"):
+            cache_values[(("cache", name), ("result", field))] = values[field]
+    lines += render_gauges("hrms_cache_events", "Cache lookups and invalidations", cache_values)
+    
+    pool_values = {}
+    for name, values in pool_metrics().items():
+        for field, value in values.items():
+            if isinstance(value, (int, float)):
+                pool_values[(("engine", name), ("field", field))] = value
+    lines += render_gauges("hrms_db_pool", "Connection pool utilization and checkout waits", pool_values)
+    
+    flight_values = {}
+    for name, values in single_flight_metrics().items():
+        for field, value in values.items():
+            flight_values[(("handler", name), ("result", field))] = value
+    lines += render_gauges(
+        "hrms_single_flight_requests",
+        "Requests that computed, shared an in-flight computation or got a stale result",
+        flight_values,
+    )
+    
+    if settings.ATTENDANCE_WRITE_BUFFER:
+        buffer_values = {
+            (("field", field),): value
+            for field, value in attendance_write_buffer.metrics().items()
+        }
+        lines += render_gauges("hrms_write_buffer", "Attendance write buffer queue depth and flushes", buffer_values)
+    
+    return PlainTextResponse(
+        "\n".join(lines) + "\n",
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+app = create_app()
@@ -0,0 +1,209 @@
+"""
+Per-request query accounting and Prometheus-style metrics
+
+SQLAlchemy cursor events (registered in database.py) add every statement
+to the RequestStats of the request that issued it. The request timing
+middleware creates those stats, emits Server-Timing headers and records
+per-route histograms rendered by the /metrics endpoint.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised when a request issues more queries than its budget allows"""
+
+
+class RequestStats:
+    """Database work attributed to one request (or one count_queries block)"""
+
+    def __init__(self, budget: int = 0, mode: str = "warn"):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.budget = budget
+        self.mode = mode
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.queries += 1
+            self.db_seconds += seconds
+            queries = self.queries
+        if self.budget and queries == self.budget + 1 and self.mode == "error":
+            raise QueryBudgetExceeded(f"Query budget of {self.budget} exceeded")
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget) and self.queries > self.budget
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def count_queries(budget: int = 0) -> Iterator[RequestStats]:
+    """
+    Count queries issued in this block (and threads it hands work to)
+
+    With a budget, exceeding it raises QueryBudgetExceeded, which makes
+    N+1 regressions fail loudly in tests:
+
+        with count_queries(budget=2):
+            get_attendance_stats(db)
+    """
+    stats = RequestStats(budget=budget, mode="error")
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(time.perf_counter() - started)
+
+
+class RouteMetrics:
+    """Latency histograms and query totals per (method, route, status)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts: Dict[tuple, List[int]] = defaultdict(lambda: [0] * len(self.buckets))
+        self._sums: Dict[tuple, float] = defaultdict(float)
+        self._totals: Dict[tuple, int] = defaultdict(int)
+        self._queries: Dict[tuple, int] = defaultdict(int)
+        self._db_seconds: Dict[tuple, float] = defaultdict(float)
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route, str(status))
+        with self._lock:
+            counts = self._counts[key]
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[index] += 1
+            self._sums[key] += seconds
+            self._totals[key] += 1
+            self._queries[key] += stats.queries
+            self._db_seconds[key] += stats.db_seconds
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP http_request_duration_seconds Request wall time by route",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            keys = sorted(self._totals)
+            for key in keys:
+                labels = _labels(method=key[0], route=key[1], status=key[2])
+                for bound, count in zip(self.buckets, self._counts[key]):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {self._totals[key]}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {self._sums[key]:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {self._totals[key]}")
+            lines += [
+                "# HELP http_request_db_queries_total SQL statements issued by route",
+                "# TYPE http_request_db_queries_total counter",
+            ]
+            for key in keys:
+                labels = _labels(method=key[0], route=key[1], status=key[2])
+                lines.append(f"http_request_db_queries_total{{{labels}}} {self._queries[key]}")
+            lines += [
+                "# HELP http_request_db_seconds_total Time spent in SQL statements by route",
+                "# TYPE http_request_db_seconds_total counter",
+            ]
+            for key in keys:
+                labels = _labels(method=key[0], route=key[1], status=key[2])
+                lines.append(f"http_request_db_seconds_total{{{labels}}} {self._db_seconds[key]:.6f}")
+        return lines
+
+
+def _labels(**labels) -> str:
+    return ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in labels.items()
+    )
+
+
+def render_gauges(name: str, help_text: str, values: Dict[Tuple[Tuple[str, str], ...], float]) -> List[str]:
+    """Render a gauge family; values maps label pairs to numbers"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for labels, value in sorted(values.items()):
+        lines.append(f"{name}{{{_labels(**dict(labels))}}} {value}")
+    return lines
+
+
+route_metrics = RouteMetrics()
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware timing each request and its database work
+
+    Adds a Server-Timing header (total and db time) when SERVER_TIMING is
+    enabled, records per-route metrics, and applies QUERY_BUDGET: in "warn"
+    mode over-budget requests are logged, in "error" mode the query that
+    exceeds the budget raises QueryBudgetExceeded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(budget=settings.QUERY_BUDGET, mode=settings.QUERY_BUDGET_MODE)
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    timing = (
+                        f"app;dur={elapsed_ms:.1f}, "
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                    )
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            route_metrics.observe(scope["method"], route_path, status_code, time.perf_counter() - started, stats)
+            if stats.over_budget:
+                logger.warning(
+                    "%s %s issued %s queries (budget %s)",
+                    scope["method"], route_path, stats.queries, stats.budget,
+                )
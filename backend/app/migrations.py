@@ -0,0 +1,343 @@
+"""
+Versioned schema migrations
+
+MIGRATIONS is an ordered list of numbered steps; schema_version records
+the ones applied to a database. Every step is also idempotent, so a
+database created before versioning (or a step interrupted halfway)
+simply runs them again. The API never migrates: at startup it only
+compares the recorded version with SCHEMA_VERSION (one indexed query)
+and refuses to start when the database is behind.
+
+Run before starting the server, once per deploy:
+    python -m app.migrations            # apply pending migrations
+    python -m app.migrations --check    # exit 1 if migrations are pending
+"""
+import argparse
+import logging
+import sys
+from typing import Callable, List, NamedTuple, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# Kept out of the models' metadata so create_all and drop_all leave it alone
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+# Arbitrary constant identifying the migration advisory lock
+_ADVISORY_LOCK_ID = 7_301_003
+
+# (name, columns, unique, PostgreSQL INCLUDE columns); mirrors Attendance.__table_args__
+ATTENDANCE_INDEXES = [
+    ("uq_attendance_employee_date", "employee_id, date", True, "status"),
+    ("ix_attendance_date", "date", False, None),
+    ("ix_attendance_status_date", "status, date", False, None),
+]
+
+# Trigram GIN indexes backing employee search on PostgreSQL
+EMPLOYEE_SEARCH_COLUMNS = ["full_name", "email", "employee_id"]
+
+# FTS5 index backing employee search on SQLite, kept in sync by triggers
+EMPLOYEE_FTS_TABLE = "employees_fts"
+EMPLOYEE_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {EMPLOYEE_FTS_TABLE} USING fts5(
+        full_name, email, employee_id,
+        content='employees', content_rowid='id', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employees_fts_insert AFTER INSERT ON employees BEGIN
+        INSERT INTO {EMPLOYEE_FTS_TABLE}(rowid, full_name, email, employee_id)
+        VALUES (new.id, new.full_name, new.email, new.employee_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employees_fts_delete AFTER DELETE ON employees BEGIN
+        INSERT INTO {EMPLOYEE_FTS_TABLE}({EMPLOYEE_FTS_TABLE}, rowid, full_name, email, employee_id)
+        VALUES ('delete', old.id, old.full_name, old.email, old.employee_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employees_fts_update AFTER UPDATE ON employees BEGIN
+        INSERT INTO {EMPLOYEE_FTS_TABLE}({EMPLOYEE_FTS_TABLE}, rowid, full_name, email, employee_id)
+        VALUES ('delete', old.id, old.full_name, old.email, old.employee_id);
+        INSERT INTO {EMPLOYEE_FTS_TABLE}(rowid, full_name, email, employee_id)
+        VALUES (new.id, new.full_name, new.email, new.employee_id);
+    END
+    """,
+]
+
+DEDUPLICATE_ATTENDANCE = """
+    DELETE FROM attendance
+    WHERE id NOT IN (
+        SELECT MAX(id) FROM attendance GROUP BY employee_id, date
+    )
+"""
+
+
+DELETE_ORPHANED_ATTENDANCE = """
+    DELETE FROM attendance
+    WHERE NOT EXISTS (
+        SELECT 1 FROM employees WHERE employees.employee_id = attendance.employee_id
+    )
+"""
+
+
+def _drop_invalid_postgres_indexes(conn):
+    """Drop indexes left INVALID by an interrupted CREATE INDEX CONCURRENTLY"""
+    invalid = conn.execute(text("""
+        SELECT c.relname FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = 'attendance'::regclass AND NOT i.indisvalid
+    """)).scalars().all()
+    for name in invalid:
+        logger.warning("Dropping invalid index %s", name)
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+def _create_index(conn, dialect: str, name: str, columns: str, unique: bool, include):
+    statement = "CREATE UNIQUE INDEX" if unique else "CREATE INDEX"
+    if dialect == "postgresql":
+        # CONCURRENTLY builds the index without blocking writes
+        statement += " CONCURRENTLY"
+    statement += f" IF NOT EXISTS {name} ON attendance ({columns})"
+    if include and dialect == "postgresql":
+        statement += f" INCLUDE ({include})"
+    conn.execute(text(statement))
+
+
+def upgrade_attendance_indexes(engine: Engine, attempts: int = 3):
+    """
+    Add the attendance indexes and unique key to an existing table
+
+    Duplicate (employee_id, date) rows are removed first, keeping the most
+    recent mark. On PostgreSQL the indexes are built concurrently; if a
+    duplicate sneaks in while the unique index builds, the invalid index is
+    dropped and the deduplicate/build cycle is retried.
+    """
+    existing = {index["name"] for index in inspect(engine).get_indexes("attendance")}
+    missing = [index for index in ATTENDANCE_INDEXES if index[0] not in existing]
+    if not missing:
+        return
+
+    dialect = engine.dialect.name
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, columns, unique, include in missing:
+            for attempt in range(1, attempts + 1):
+                if dialect == "postgresql":
+                    _drop_invalid_postgres_indexes(conn)
+                if unique:
+                    removed = conn.execute(text(DEDUPLICATE_ATTENDANCE)).rowcount
+                    if removed:
+                        logger.info("Removed %s duplicate attendance rows", removed)
+                try:
+                    _create_index(conn, dialect, name, columns, unique, include)
+                    logger.info("Created index %s", name)
+                    break
+                except Exception:
+                    if attempt == attempts:
+                        raise
+                    logger.warning("Creating index %s failed, retrying", name, exc_info=True)
+
+
+def upgrade_attendance_foreign_key(engine: Engine):
+    """
+    Add the attendance -> employees foreign key with ON DELETE CASCADE
+
+    Attendance left behind by earlier deletes is removed first. On
+    PostgreSQL the constraint is added NOT VALID and validated separately,
+    which only takes a share lock while existing rows are checked. SQLite
+    cannot add constraints to an existing table, so older SQLite databases
+    keep relying on the explicit attendance deletes in the API.
+    """
+    foreign_keys = inspect(engine).get_foreign_keys("attendance")
+    if any(fk["referred_table"] == "employees" for fk in foreign_keys):
+        return
+
+    if engine.dialect.name != "postgresql":
+        logger.warning("attendance has no foreign key to employees; recreate the database to add it")
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        removed = conn.execute(text(DELETE_ORPHANED_ATTENDANCE)).rowcount
+        if removed:
+            logger.info("Removed %s attendance rows of deleted employees", removed)
+        conn.execute(text("""
+            ALTER TABLE attendance ADD CONSTRAINT fk_attendance_employee
+            FOREIGN KEY (employee_id) REFERENCES employees (employee_id)
+            ON DELETE CASCADE NOT VALID
+        """))
+        # Rows inserted before the constraint existed would fail validation
+        conn.execute(text(DELETE_ORPHANED_ATTENDANCE))
+        conn.execute(text("ALTER TABLE attendance VALIDATE CONSTRAINT fk_attendance_employee"))
+        logger.info("Added foreign key fk_attendance_employee")
+
+
+def sqlite_has_fts5(conn) -> bool:
+    """Whether this SQLite build was compiled with FTS5"""
+    options = conn.execute(text("PRAGMA compile_options")).scalars().all()
+    return "ENABLE_FTS5" in options
+
+
+def upgrade_employee_search(engine: Engine):
+    """
+    Create the indexes behind employee search
+
+    PostgreSQL gets pg_trgm GIN indexes on the searchable columns. SQLite
+    gets an external-content FTS5 table plus triggers that mirror every
+    insert, update and delete on employees. When the triggers are missing
+    (new table, or employees was dropped and recreated) the FTS table is
+    rebuilt from scratch. Other databases fall back to LIKE scans.
+    """
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for column in EMPLOYEE_SEARCH_COLUMNS:
+                conn.execute(text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_employees_{column}_trgm "
+                    f"ON employees USING gin ({column} gin_trgm_ops)"
+                ))
+    elif dialect == "sqlite":
+        with engine.begin() as conn:
+            if not sqlite_has_fts5(conn):
+                logger.warning("SQLite was built without FTS5; employee search will scan the table")
+                return
+            triggers = conn.execute(text(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'employees_fts_%'"
+            )).scalar()
+            if triggers == 3:
+                return
+            conn.execute(text(f"DROP TABLE IF EXISTS {EMPLOYEE_FTS_TABLE}"))
+            for statement in EMPLOYEE_FTS_DDL:
+                conn.execute(text(statement))
+            conn.execute(text(f"INSERT INTO {EMPLOYEE_FTS_TABLE}({EMPLOYEE_FTS_TABLE}) VALUES ('rebuild')"))
+            logger.info("Built employee search index")
+
+
+def upgrade_archive_date_index(engine: Engine):
+    """Index attendance_archive by date for the rollup and bitset reads over archived years"""
+    concurrently = " CONCURRENTLY" if engine.dialect.name == "postgresql" else ""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            f"CREATE INDEX{concurrently} IF NOT EXISTS ix_attendance_archive_date ON attendance_archive (date)"
+        ))
+
+
+def create_tables(engine: Engine):
+    """Create every table the models define that does not exist yet"""
+    from .database import Base
+    from .models import employee, attendance, rollup, table_version  # noqa: F401
+    Base.metadata.create_all(bind=engine)
+
+
+def seed_table_versions(engine: Engine):
+    from .services.versions import seed_versions
+    seed_versions(engine)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Engine], None]
+
+
+# Append new steps at the end; never renumber or edit applied ones
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create tables", create_tables),
+    Migration(2, "attendance indexes and unique key", upgrade_attendance_indexes),
+    Migration(3, "attendance foreign key", upgrade_attendance_foreign_key),
+    Migration(4, "employee search index", upgrade_employee_search),
+    Migration(5, "table version counters", seed_table_versions),
+    Migration(6, "attendance archive date index", upgrade_archive_date_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(engine: Engine) -> int:
+    """Highest applied migration, 0 for a database never migrated"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except DBAPIError:
+        # schema_version does not exist yet
+        return 0
+
+
+def schema_status(engine: Engine) -> Tuple[int, int]:
+    """(applied, expected) schema versions"""
+    return current_version(engine), SCHEMA_VERSION
+
+
+def migrate(engine: Engine) -> List[int]:
+    """
+    Apply pending migrations in order; returns the versions applied
+
+    On PostgreSQL an advisory lock serializes concurrent runs, and the
+    later ones find nothing left to do. Partition maintenance runs on
+    every call because it depends on the date, not the schema.
+    """
+    applied = []
+    with engine.connect() as lock_conn:
+        if engine.dialect.name == "postgresql":
+            lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+            lock_conn.commit()
+        try:
+            schema_version.create(bind=engine, checkfirst=True)
+            current = current_version(engine)
+            for migration in MIGRATIONS:
+                if migration.version <= current:
+                    continue
+                logger.info("Applying migration %s: %s", migration.version, migration.description)
+                migration.apply(engine)
+                with engine.begin() as conn:
+                    conn.execute(schema_version.insert().values(
+                        version=migration.version, description=migration.description
+                    ))
+                applied.append(migration.version)
+        finally:
+            if engine.dialect.name == "postgresql":
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _ADVISORY_LOCK_ID})
+                lock_conn.commit()
+
+    from .services.partitions import ensure_partitions
+    ensure_partitions(engine)
+    return applied
+
+
+def reset(engine: Engine):
+    """Drop every table, including the migration history (benchmarks and scratch databases only)"""
+    from .database import Base
+    from .models import employee, attendance, rollup, table_version  # noqa: F401
+    Base.metadata.drop_all(bind=engine)
+    schema_version.drop(bind=engine, checkfirst=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--check", action="store_true", help="Only report whether migrations are pending")
+    args = parser.parse_args()
+
+    from .database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    current, expected = schema_status(engine)
+    if args.check:
+        print(f"schema version {current}, code expects {expected}")
+        sys.exit(1 if current < expected else 0)
+    applied = migrate(engine)
+    print(f"applied {', '.join(map(str, applied))}" if applied else f"schema is up to date (version {expected})")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,23 @@
 Database models
 """
 from .employee import Employee
-from .attendance import Attendance, AttendanceStatus
+from .attendance import Attendance, AttendanceArchive, AttendanceStatus
+from .rollup import (
+    AttendanceDailyRollup,
+    AttendanceMonthlyRollup,
+    AttendanceRollupChange,
+    RollupState,
+)
+from .table_version import TableVersion
 
-__all__ = ["Employee", "Attendance", "AttendanceStatus"]
+__all__ = [
+    "Employee",
+    "Attendance",
+    "AttendanceArchive",
+    "AttendanceStatus",
+    "AttendanceDailyRollup",
+    "AttendanceMonthlyRollup",
+    "AttendanceRollupChange",
+    "RollupState",
+    "TableVersion",
+]
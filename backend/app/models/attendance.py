@@ -2,9 +2,15 @@
 Attendance database model
 """
 import enum
-from sqlalchemy import Column, String, Integer, Date, Enum
+from sqlalchemy import Column, String, Integer, Date, DateTime, Enum, ForeignKey, Index, func
+from ..config import settings
 from ..database import Base
 
+# Monthly range partitions on PostgreSQL (see app.services.partitions). The
+# partition key has to be part of the primary key, so date joins id there.
+PARTITIONED = settings.ATTENDANCE_PARTITIONING and \
+    settings.DATABASE_URL.startswith(("postgres://", "postgresql"))
+
 
 class AttendanceStatus(str, enum.Enum):
     """Attendance status enum"""
@@ -16,11 +22,55 @@ class Attendance(Base):
     """Attendance database model"""
     
     __tablename__ = "attendance"
+    __table_args__ = (
+        # One mark per employee per day; also serves employee_id lookups and,
+        # on PostgreSQL, index-only status counts per employee
+        Index(
+            "uq_attendance_employee_date",
+            "employee_id",
+            "date",
+            unique=True,
+            postgresql_include=["status"],
+        ),
+        # Date range filters
+        Index("ix_attendance_date", "date"),
+        # Present/absent counts, optionally bounded by date
+        Index("ix_attendance_status_date", "status", "date"),
+        {"postgresql_partition_by": "RANGE (date)"} if PARTITIONED else {},
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    employee_id = Column(
+        String,
+        ForeignKey("employees.employee_id", ondelete="CASCADE", name="fk_attendance_employee"),
+        nullable=False,
+    )
+    date = Column(Date, primary_key=PARTITIONED, nullable=False)
+    status = Column(Enum(AttendanceStatus), nullable=False)
     
-    id = Column(Integer, primary_key=True, index=True)
+    def __repr__(self):
+        return f"<Attendance(id={self.id}, employee_id={self.employee_id}, date={self.date}, status={self.status})>"
+
+
+class AttendanceArchive(Base):
+    """
+    Attendance moved out of the live table, e.g. for offboarded employees
+
+    Rows keep their original employee_id without a foreign key so they
+    outlive the employee record.
+    """
+    
+    __tablename__ = "attendance_archive"
+    __table_args__ = (
+        Index("ix_attendance_archive_employee_date", "employee_id", "date"),
+        Index("ix_attendance_archive_date", "date"),
+    )
+    
+    id = Column(Integer, primary_key=True)
     employee_id = Column(String, nullable=False)
     date = Column(Date, nullable=False)
     status = Column(Enum(AttendanceStatus), nullable=False)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
     
     def __repr__(self):
-        return f"<Attendance(id={self.id}, employee_id={self.employee_id}, date={self.date}, status={self.status})>"
+        return f"<AttendanceArchive(id={self.id}, employee_id={self.employee_id}, date={self.date}, status={self.status})>"
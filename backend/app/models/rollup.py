@@ -0,0 +1,60 @@
+"""
+Attendance rollup database models
+
+Pre-aggregated attendance counts maintained by the background refresher
+in services/rollups.py. Report endpoints read these instead of scanning
+raw attendance rows.
+"""
+from sqlalchemy import Column, String, Integer, Date, DateTime
+from ..database import Base
+
+
+class AttendanceDailyRollup(Base):
+    """Present/absent counts per day and department"""
+    
+    __tablename__ = "attendance_daily_rollup"
+    
+    date = Column(Date, primary_key=True)
+    department = Column(String, primary_key=True)
+    total_present = Column(Integer, nullable=False, default=0)
+    total_absent = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<AttendanceDailyRollup(date={self.date}, department={self.department})>"
+
+
+class AttendanceMonthlyRollup(Base):
+    """Present/absent counts per employee and month (month is its first day)"""
+    
+    __tablename__ = "attendance_monthly_rollup"
+    
+    employee_id = Column(String, primary_key=True)
+    month = Column(Date, primary_key=True, index=True)
+    total_present = Column(Integer, nullable=False, default=0)
+    total_absent = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<AttendanceMonthlyRollup(employee_id={self.employee_id}, month={self.month})>"
+
+
+class AttendanceRollupChange(Base):
+    """
+    Log of attendance dates changed since the last rollup refresh
+    
+    Append-only: rows are inserted by write transactions and deleted by the
+    refresher once the dates have been re-aggregated.
+    """
+    
+    __tablename__ = "attendance_rollup_changes"
+    
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False)
+
+
+class RollupState(Base):
+    """Bookkeeping for the rollup refresher"""
+    
+    __tablename__ = "rollup_state"
+    
+    name = Column(String, primary_key=True)
+    refreshed_at = Column(DateTime, nullable=False)
@@ -0,0 +1,23 @@
+"""
+Table version database model
+
+One row per tracked table, bumped with every transaction that writes to
+it (services/versions.py). Read endpoints build their ETags from
+these counters.
+"""
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class TableVersion(Base):
+    """Monotonic change counter for one table"""
+    
+    __tablename__ = "table_versions"
+    
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<TableVersion(name={self.name}, version={self.version})>"
@@ -3,5 +3,6 @@ API routers
 """
 from .employees import router as employee_router
 from .attendance import router as attendance_router
+from .batch import router as batch_router
 
-__all__ = ["employee_router", "attendance_router"]
+__all__ = ["employee_router", "attendance_router", "batch_router"]
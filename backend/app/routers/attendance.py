@@ -1,16 +1,48 @@
 """
 Attendance API endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional, Dict
-from datetime import datetime
+from sqlalchemy import and_, or_, select
+from typing import List, Literal, Optional, Dict
+from datetime import date, timedelta
 
-from ..database import get_db
-from ..models.employee import Employee
+from ..config import settings
+from ..database import get_db, get_read_db
 from ..models.attendance import Attendance
-from ..schemas.attendance import AttendanceCreate, AttendanceResponse
+from ..schemas.attendance import (
+    AttendanceAccepted,
+    AttendanceBulkResponse,
+    AttendanceCreate,
+    AttendanceResponse,
+)
+from ..services import changes, rollups
+from ..services.bitmaps import employee_calendar
+from ..services.directory import employee_directory
+from ..services.attendance_bulk import upsert_attendance_batch
+from ..services.export import EXPORT_COLUMNS, EXPORT_MEDIA_TYPES, parquet_available, stream_export
+from ..services.fastjson import rows_response
+from ..services.ingest import BULK_BODY_CONTENT, format_validation_error, iter_records
+from ..services.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    parse_fields,
+    projected_columns,
+)
+from ..services.upsert import upsert_rows
+from ..services.single_flight import single_flight
+from ..services.stats import get_attendance_stats, get_employee_stats
+from ..services.versions import conditional_get
+from ..services.write_buffer import attendance_write_buffer
+
+ATTENDANCE_FIELDS = tuple(AttendanceResponse.model_fields)
 
 router = APIRouter(
     prefix="/api/attendance",
@@ -18,54 +50,65 @@ router = APIRouter(
 )
 
 
-@router.post("", response_model=AttendanceResponse, status_code=status.HTTP_201_CREATED)
-async def create_attendance(
-    attendance: AttendanceCreate,
-    db: Session = Depends(get_db)
-):
+def _filter_attendance(query, employee_id, start_date, end_date):
     """
-    Mark attendance for an employee
+    Apply the employee and date-range filters shared by list and export
     
-    If attendance already exists for the given date, it will be updated.
-    
-    - **employee_id**: Employee identifier
-    - **date**: Attendance date (YYYY-MM-DD)
-    - **status**: Present or Absent
+    Dates arrive parsed, so the bounds bind as DATE parameters that
+    PostgreSQL can use to prune attendance partitions.
     """
+    if employee_id:
+        query = query.filter(Attendance.employee_id == employee_id)
+    
+    if start_date:
+        query = query.filter(Attendance.date >= start_date)
+    
+    if end_date:
+        query = query.filter(Attendance.date <= end_date)
+    
+    return query
+
+
+def _mark_attendance(attendance: AttendanceCreate, db: Session) -> Attendance:
+    """Upsert one mark and commit it in its own transaction"""
     try:
-        # Check if employee exists
-        employee = db.query(Employee).filter(
-            Employee.employee_id == attendance.employee_id
-        ).first()
-        
-        if not employee:
+        if not employee_directory.exists(db, attendance.employee_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Employee with ID '{attendance.employee_id}' not found"
             )
         
-        # Check if attendance already exists for this date
-        existing_attendance = db.query(Attendance).filter(
+        # Insert or update in one statement so concurrent marks for the
+        # same day cannot create duplicate rows
+        upsert_rows(
+            db,
+            Attendance,
+            [attendance.dict()],
+            conflict_columns=("employee_id", "date"),
+            update_columns=("status",),
+        )
+        changes.attendance_changed(
+            db,
+            [attendance.date],
+            marks=[(attendance.employee_id, attendance.date, attendance.status)],
+        )
+        db.commit()
+        
+        return db.query(Attendance).filter(
             Attendance.employee_id == attendance.employee_id,
             Attendance.date == attendance.date
-        ).first()
-        
-        if existing_attendance:
-            # Update existing attendance
-            existing_attendance.status = attendance.status
-            db.commit()
-            db.refresh(existing_attendance)
-            return existing_attendance
-        
-        # Create new attendance record
-        db_attendance = Attendance(**attendance.dict())
-        db.add(db_attendance)
-        db.commit()
-        db.refresh(db_attendance)
-        return db_attendance
+        ).one()
     
     except HTTPException:
         raise
+    except IntegrityError:
+        # The directory still listed an employee another worker deleted
+        db.rollback()
+        employee_directory.clear()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with ID '{attendance.employee_id}' not found"
+        )
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -74,146 +117,475 @@ async def create_attendance(
         )
 
 
-@router.get("", response_model=List[AttendanceResponse])
-async def get_all_attendance(
-    employee_id: Optional[str] = Query(None, description="Filter by employee ID"),
-    start_date: Optional[str] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
-    end_date: Optional[str] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+@router.post(
+    "",
+    response_model=AttendanceResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": AttendanceAccepted, "description": "Queued, not yet committed"}},
+)
+async def create_attendance(
+    attendance: AttendanceCreate,
+    wait: bool = Query(True, description="With the write buffer on, wait for the mark to be committed"),
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve all attendance records
+    Mark attendance for an employee
     
-    Optionally filter by employee_id, start_date, and end_date using query parameters
+    If attendance already exists for the given date, it will be updated.
+    With `ATTENDANCE_WRITE_BUFFER` on, marks are committed in groups by a
+    background task; `wait=false` returns 202 once the mark is queued
+    instead of waiting for its group to commit. A full queue answers 503.
+    
+    - **employee_id**: Employee identifier
+    - **date**: Attendance date (YYYY-MM-DD)
+    - **status**: Present or Absent
+    - **wait** (optional): Wait for the buffered mark to be committed (default true)
+    """
+    if not settings.ATTENDANCE_WRITE_BUFFER:
+        return await run_in_threadpool(_mark_attendance, attendance, db)
+    
+    if not wait:
+        # Unknown employees are still rejected up front rather than dropped later
+        if not await run_in_threadpool(employee_directory.exists, db, attendance.employee_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Employee with ID '{attendance.employee_id}' not found"
+            )
+        await attendance_write_buffer.submit(attendance)
+        return JSONResponse(
+            jsonable_encoder(AttendanceAccepted(**attendance.dict())),
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+    
+    result = await (await attendance_write_buffer.submit(attendance))
+    if result["result"] == "error":
+        raise HTTPException(status_code=result["status_code"], detail=result["detail"])
+    return result["record"]
+
+
+@router.post(
+    "/bulk",
+    response_model=AttendanceBulkResponse,
+    openapi_extra={"requestBody": {"required": True, "content": BULK_BODY_CONTENT}},
+)
+async def bulk_upsert_attendance(
+    request: Request,
+    chunk_size: Optional[int] = Query(None, ge=1, le=10000, description="Rows committed per transaction"),
+    db: Session = Depends(get_db)
+):
+    """
+    Mark attendance for many employees in one request
+    
+    Accepts a JSON array, NDJSON (`application/x-ndjson`) or CSV (`text/csv`)
+    body with `employee_id`, `date` and `status` fields. NDJSON and CSV bodies
+    are streamed and upserted in chunks, each committed in its own transaction.
+    Existing records for the same employee and date are updated. Database
+    work runs in the threadpool so parsing the upload never blocks the event loop.
+    
+    - **chunk_size** (optional): Rows per transaction (defaults to `BULK_CHUNK_SIZE`)
+    """
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    results = []
+    batch = []
+    
+    def flush():
+        try:
+            batch_results = upsert_attendance_batch(db, batch)
+            written = [
+                mark for (_, mark), result in zip(batch, batch_results) if result["result"] != "error"
+            ]
+            changes.attendance_changed(
+                db,
+                {mark.date for mark in written},
+                marks=[(mark.employee_id, mark.date, mark.status) for mark in written],
+            )
+            db.commit()
+            results.extend(batch_results)
+        except Exception as e:
+            db.rollback()
+            results.extend(
+                {
+                    "row": row,
+                    "employee_id": mark.employee_id,
+                    "date": mark.date,
+                    "result": "error",
+                    "detail": f"Failed to save attendance: {str(e)}",
+                }
+                for row, mark in batch
+            )
+        batch.clear()
+    
+    async for row, record, error in iter_records(request):
+        if error is None:
+            try:
+                batch.append((row, AttendanceCreate(**record)))
+            except ValidationError as e:
+                error = format_validation_error(e)
+        if error is not None:
+            results.append({
+                "row": row,
+                "employee_id": (record or {}).get("employee_id"),
+                "result": "error",
+                "detail": error,
+            })
+        if len(batch) >= chunk_size:
+            await run_in_threadpool(flush)
+    await run_in_threadpool(flush)
+    
+    results.sort(key=lambda result: result["row"])
+    counts = {"created": 0, "updated": 0, "error": 0}
+    for result in results:
+        counts[result["result"]] += 1
+    
+    return {
+        "total": len(results),
+        "created": counts["created"],
+        "updated": counts["updated"],
+        "failed": counts["error"],
+        "results": results,
+    }
+
+
+@router.get(
+    "",
+    response_model=List[AttendanceResponse],
+    dependencies=[conditional_get(changes.ATTENDANCE)],
+)
+def get_all_attendance(
+    response: Response,
+    employee_id: Optional[str] = Query(None, description="Filter by employee ID"),
+    start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="Maximum records per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description=f"Comma-separated fields to return ({', '.join(ATTENDANCE_FIELDS)})"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve attendance records, newest first, one page at a time
+    
+    Optionally filter by employee_id, start_date, and end_date using query parameters.
+    When more records exist, the `X-Next-Cursor` response header holds the cursor
+    for the next page.
     
     - **employee_id** (optional): Filter attendance by specific employee
     - **start_date** (optional): Filter attendance from this date onwards (YYYY-MM-DD)
     - **end_date** (optional): Filter attendance up to this date (YYYY-MM-DD)
+    - **limit** (optional): Maximum number of records per page
+    - **cursor** (optional): Continue after the last record of the previous page
+    - **fields** (optional): Only return these fields
     """
-    query = db.query(Attendance)
+    projection = parse_fields(fields, ATTENDANCE_FIELDS) or (list(ATTENDANCE_FIELDS) if settings.FAST_JSON else None)
+    if projection:
+        query = db.query(*projected_columns(Attendance, projection, ("date", "id")))
+    else:
+        query = db.query(Attendance)
     
-    if employee_id:
-        query = query.filter(Attendance.employee_id == employee_id)
+    query = _filter_attendance(query, employee_id, start_date, end_date)
     
-    if start_date:
-        query = query.filter(Attendance.date >= start_date)
+    if cursor:
+        after = decode_cursor(cursor, {"date": date.fromisoformat, "id": int})
+        query = query.filter(or_(
+            Attendance.date < after["date"],
+            and_(Attendance.date == after["date"], Attendance.id < after["id"]),
+        ))
     
-    if end_date:
-        query = query.filter(Attendance.date <= end_date)
+    query = query.order_by(Attendance.date.desc(), Attendance.id.desc())
+    attendance_records, has_more = fetch_page(query, limit)
     
-    attendance_records = query.order_by(Attendance.date.desc()).all()
+    headers = dict(response.headers)
+    if has_more:
+        last = attendance_records[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor({"date": last.date, "id": last.id})
+    
+    if projection:
+        return rows_response(attendance_records, projection, headers)
+    
+    response.headers.update(headers)
     return attendance_records
 
 
-@router.get("/{employee_id}", response_model=List[AttendanceResponse])
-async def get_employee_attendance(
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}},
+)
+async def export_attendance(
+    format: Literal["csv", "ndjson", "parquet"] = Query("csv", description="Export format"),
+    employee_id: Optional[str] = Query(None, description="Filter by employee ID"),
+    start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+):
+    """
+    Export attendance history as a streamed file
+    
+    Rows are streamed from a server-side cursor, so exports of any size use
+    constant memory. Parquet requires the optional `pyarrow` package.
+    
+    - **format** (optional): csv (default), ndjson or parquet
+    - **employee_id** (optional): Filter attendance by specific employee
+    - **start_date** (optional): Filter attendance from this date onwards (YYYY-MM-DD)
+    - **end_date** (optional): Filter attendance up to this date (YYYY-MM-DD)
+    """
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export requires the 'pyarrow' package"
+        )
+    
+    stmt = select(*(getattr(Attendance, column) for column in EXPORT_COLUMNS))
+    stmt = _filter_attendance(stmt, employee_id, start_date, end_date)
+    stmt = stmt.order_by(Attendance.date, Attendance.id)
+    
+    return StreamingResponse(
+        stream_export(stmt, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="attendance.{format}"'},
+    )
+
+
+@router.get(
+    "/analytics",
+    response_model=Dict,
+    dependencies=[conditional_get(changes.EMPLOYEES, changes.ATTENDANCE)],
+)
+def get_attendance_analytics(
+    start_date: Optional[date] = Query(None, description="First day to analyze (YYYY-MM-DD, defaults to 89 days before end_date)"),
+    end_date: Optional[date] = Query(None, description="Last day to analyze (YYYY-MM-DD, defaults to today)"),
+    department: Optional[str] = Query(None, description="Only analyze this department"),
+    window: int = Query(30, ge=1, le=365, description="Days in the rolling attendance rate"),
+    top: int = Query(10, ge=1, le=100, description="Employees listed for streaks and absenteeism"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get attendance trends and absenteeism for a date range
+    
+    Returns daily totals with a rolling attendance rate, the weekday pattern,
+    per-department totals with monthly rates, the longest consecutive
+    absences and the employees with the most absent days. Computed with
+    vectorized operations over the in-memory attendance bitsets.
+    
+    - **start_date** (optional): First day to analyze (YYYY-MM-DD)
+    - **end_date** (optional): Last day to analyze (YYYY-MM-DD)
+    - **department** (optional): Only analyze this department
+    - **window** (optional): Days in the rolling attendance rate
+    - **top** (optional): Employees listed for streaks and absenteeism
+    """
+    # Imported here so NumPy only loads once analytics are first requested
+    from ..services.analytics import MAX_DAYS as ANALYTICS_MAX_DAYS, attendance_analytics
+    
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=89)
+    if start_date > end_date or (end_date - start_date).days >= ANALYTICS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"start_date must be on or before end_date and within {ANALYTICS_MAX_DAYS} days of it"
+        )
+    
+    return attendance_analytics(
+        db,
+        start_date,
+        end_date,
+        department=department,
+        window=window,
+        top=top,
+    )
+
+
+@router.get(
+    "/{employee_id}",
+    response_model=List[AttendanceResponse],
+    dependencies=[conditional_get(changes.EMPLOYEES, changes.ATTENDANCE)],
+)
+def get_employee_attendance(
     employee_id: str,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_read_db)
 ):
     """
     Retrieve all attendance records for a specific employee
     
     - **employee_id**: The unique employee identifier
     """
-    # Check if employee exists
-    employee = db.query(Employee).filter(
-        Employee.employee_id == employee_id
-    ).first()
-    
-    if not employee:
+    if not employee_directory.exists(db, employee_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with ID '{employee_id}' not found"
         )
     
     # Get attendance records
-    attendance_records = db.query(Attendance).filter(
+    if settings.FAST_JSON:
+        query = db.query(*projected_columns(Attendance, ATTENDANCE_FIELDS, ()))
+    else:
+        query = db.query(Attendance)
+    attendance_records = query.filter(
         Attendance.employee_id == employee_id
     ).order_by(Attendance.date.desc()).all()
     
+    if settings.FAST_JSON:
+        return rows_response(attendance_records, ATTENDANCE_FIELDS, dict(response.headers))
     return attendance_records
 
 
-@router.get("/stats/by-employee", response_model=List[Dict])
-async def get_attendance_stats_by_employee(
-    db: Session = Depends(get_db)
+@router.get(
+    "/stats/by-employee",
+    response_model=List[Dict],
+    dependencies=[conditional_get(changes.EMPLOYEES, changes.ATTENDANCE)],
+)
+@single_flight()
+def get_attendance_stats_by_employee(
+    department: Optional[str] = Query(None, description="Filter by department"),
+    start_date: Optional[date] = Query(None, description="Count attendance from this date onwards (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Count attendance up to this date (YYYY-MM-DD)"),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get attendance statistics for all employees
     
-    Returns total present days and total absent days for each employee
+    Returns total present days and total absent days for each employee,
+    counted from the in-memory attendance bitsets (or a single grouped query
+    when `ATTENDANCE_BITMAPS` is off). Concurrent identical requests share
+    one computation.
+    
+    - **department** (optional): Only include employees from this department
+    - **start_date** (optional): Count attendance from this date onwards (YYYY-MM-DD)
+    - **end_date** (optional): Count attendance up to this date (YYYY-MM-DD)
     """
-    employees = db.query(Employee).all()
-    stats = []
+    return get_attendance_stats(
+        db,
+        department=department,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+@router.get(
+    "/stats/daily",
+    response_model=List[Dict],
+    dependencies=[conditional_get(changes.ROLLUPS)],
+)
+def get_daily_attendance_stats(
+    start_date: Optional[date] = Query(None, description="From this date onwards (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Up to this date (YYYY-MM-DD)"),
+    department: Optional[str] = Query(None, description="Filter by department"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get attendance totals per day
     
-    for employee in employees:
-        present_count = db.query(Attendance).filter(
-            Attendance.employee_id == employee.employee_id,
-            Attendance.status == "Present"
-        ).count()
-        
-        absent_count = db.query(Attendance).filter(
-            Attendance.employee_id == employee.employee_id,
-            Attendance.status == "Absent"
-        ).count()
-        
-        total_days = present_count + absent_count
-        attendance_rate = (present_count / total_days * 100) if total_days > 0 else 0
-        
-        stats.append({
-            "employee_id": employee.employee_id,
-            "full_name": employee.full_name,
-            "department": employee.department,
-            "total_present": present_count,
-            "total_absent": absent_count,
-            "total_days": total_days,
-            "attendance_rate": round(attendance_rate, 2)
-        })
+    Served from the daily rollup table, which is refreshed in the background
+    every `ROLLUP_REFRESH_SECONDS`.
     
-    return stats
+    - **start_date** (optional): From this date onwards (YYYY-MM-DD)
+    - **end_date** (optional): Up to this date (YYYY-MM-DD)
+    - **department** (optional): Only count this department
+    """
+    return rollups.daily_stats(db, start_date=start_date, end_date=end_date, department=department)
 
 
-@router.get("/stats/{employee_id}", response_model=Dict)
-async def get_employee_attendance_stats(
+@router.get(
+    "/stats/department",
+    response_model=List[Dict],
+    dependencies=[conditional_get(changes.ROLLUPS)],
+)
+def get_department_attendance_stats(
+    start_date: Optional[date] = Query(None, description="From this date onwards (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Up to this date (YYYY-MM-DD)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get attendance totals per department
+    
+    Served from the daily rollup table, which is refreshed in the background
+    every `ROLLUP_REFRESH_SECONDS`.
+    
+    - **start_date** (optional): From this date onwards (YYYY-MM-DD)
+    - **end_date** (optional): Up to this date (YYYY-MM-DD)
+    """
+    return rollups.department_stats(db, start_date=start_date, end_date=end_date)
+
+
+@router.get(
+    "/stats/monthly",
+    response_model=List[Dict],
+    dependencies=[conditional_get(changes.ROLLUPS)],
+)
+def get_monthly_attendance_stats(
+    employee_id: Optional[str] = Query(None, description="Filter by employee ID"),
+    start_date: Optional[date] = Query(None, description="Months overlapping this date onwards (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Months up to this date (YYYY-MM-DD)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get attendance totals per employee and month
+    
+    Served from the monthly rollup table, which is refreshed in the background
+    every `ROLLUP_REFRESH_SECONDS`.
+    
+    - **employee_id** (optional): Only this employee
+    - **start_date** (optional): Months overlapping this date onwards (YYYY-MM-DD)
+    - **end_date** (optional): Months up to this date (YYYY-MM-DD)
+    """
+    return rollups.monthly_stats(db, employee_id=employee_id, start_date=start_date, end_date=end_date)
+
+
+@router.get(
+    "/stats/{employee_id}",
+    response_model=Dict,
+    dependencies=[conditional_get(changes.EMPLOYEES, changes.ATTENDANCE)],
+)
+def get_employee_attendance_stats(
     employee_id: str,
-    db: Session = Depends(get_db)
+    start_date: Optional[date] = Query(None, description="Count attendance from this date onwards (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Count attendance up to this date (YYYY-MM-DD)"),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get attendance statistics for a specific employee
     
     - **employee_id**: The unique employee identifier
+    - **start_date** (optional): Count attendance from this date onwards (YYYY-MM-DD)
+    - **end_date** (optional): Count attendance up to this date (YYYY-MM-DD)
     """
-    # Check if employee exists
-    employee = db.query(Employee).filter(
-        Employee.employee_id == employee_id
-    ).first()
+    stats = get_employee_stats(
+        db,
+        employee_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
     
-    if not employee:
+    if stats is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with ID '{employee_id}' not found"
         )
     
-    present_count = db.query(Attendance).filter(
-        Attendance.employee_id == employee_id,
-        Attendance.status == "Present"
-    ).count()
+    return stats
+
+
+@router.get(
+    "/{employee_id}/calendar",
+    response_model=Dict,
+    dependencies=[conditional_get(changes.EMPLOYEES, changes.ATTENDANCE)],
+)
+def get_employee_calendar(
+    employee_id: str,
+    year: Optional[int] = Query(None, ge=1900, le=9999, description="Calendar year (defaults to the current year)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get one employee's attendance for a year, grouped by month
     
-    absent_count = db.query(Attendance).filter(
-        Attendance.employee_id == employee_id,
-        Attendance.status == "Absent"
-    ).count()
+    Each month lists the days of the month marked present and absent,
+    read from the in-memory attendance bitsets.
     
-    total_days = present_count + absent_count
-    attendance_rate = (present_count / total_days * 100) if total_days > 0 else 0
+    - **employee_id**: The unique employee identifier
+    - **year** (optional): Calendar year (defaults to the current year)
+    """
+    if not employee_directory.exists(db, employee_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with ID '{employee_id}' not found"
+        )
     
-    return {
-        "employee_id": employee.employee_id,
-        "full_name": employee.full_name,
-        "department": employee.department,
-        "email": employee.email,
-        "total_present": present_count,
-        "total_absent": absent_count,
-        "total_days": total_days,
-        "attendance_rate": round(attendance_rate, 2)
-    }
+    return employee_calendar(db, employee_id, year or date.today().year)
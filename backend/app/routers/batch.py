@@ -0,0 +1,42 @@
+"""
+Batch API endpoint
+"""
+from fastapi import APIRouter, HTTPException, Request, status
+
+from ..config import settings
+from ..schemas.batch import BatchRequest, BatchResponse
+from ..services.batch import run_batch
+
+router = APIRouter(
+    prefix="/api/batch",
+    tags=["batch"]
+)
+
+
+@router.post("", response_model=BatchResponse)
+async def batch(payload: BatchRequest, request: Request):
+    """
+    Make several API calls in one request
+    
+    Each call is answered as if it had been sent on its own, with its
+    status, headers and body, in the order given. Calls that only read
+    run concurrently; if any call writes, all run one after another.
+    
+    - **requests**: Calls with `method` (default GET), `path` relative to
+      `/api` (e.g. `/employees/E001/profile`), and optional `params`,
+      `headers` (such as `If-None-Match`), `body` and `id` (echoed back)
+    """
+    calls = payload.requests
+    if len(calls) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may hold at most {settings.BATCH_MAX_REQUESTS} requests"
+        )
+    nested = [call.path for call in calls if call.path.rstrip("/") == "/batch"]
+    if nested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batches cannot contain batches"
+        )
+    
+    return {"responses": await run_batch(request, calls)}
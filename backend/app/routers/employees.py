@@ -1,15 +1,42 @@
 """
 Employee API endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status, Query
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Dict
+from typing import List, Dict, Literal, Optional
+from datetime import date
 
-from ..database import get_db
+from ..config import settings
+from ..database import get_db, get_read_db
 from ..models.employee import Employee
-from ..models.attendance import Attendance
-from ..schemas.employee import EmployeeCreate, EmployeeResponse
+from ..schemas.employee import (
+    EmployeeCreate,
+    EmployeeResponse,
+    EmployeeBulkResponse,
+    EmployeeBulkDelete,
+    EmployeeBulkDeleteResponse,
+    EmployeeProfile,
+)
+from ..services import changes, summary
+from ..services.employee_bulk import delete_employee_batch, insert_employee_batch
+from ..services.fastjson import rows_response
+from ..services.ingest import BULK_BODY_CONTENT, format_validation_error, iter_records
+from ..services.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    parse_fields,
+    projected_columns,
+)
+from ..services.profile import employee_profile
+from ..services.search import search_query
+from ..services.single_flight import single_flight
+from ..services.versions import conditional_get
+
+EMPLOYEE_FIELDS = tuple(EmployeeResponse.model_fields)
 
 router = APIRouter(
     prefix="/api/employees",
@@ -18,7 +45,7 @@ router = APIRouter(
 
 
 @router.post("", response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
-async def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)):
+def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)):
     """
     Create a new employee
     
@@ -51,6 +78,7 @@ async def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db
         # Create new employee
         db_employee = Employee(**employee.dict())
         db.add(db_employee)
+        changes.employees_changed(db)
         db.commit()
         db.refresh(db_employee)
         return db_employee
@@ -65,19 +93,244 @@ async def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db
         )
 
 
-@router.get("", response_model=List[EmployeeResponse])
-async def get_employees(db: Session = Depends(get_db)):
+@router.post(
+    "/bulk",
+    response_model=EmployeeBulkResponse,
+    openapi_extra={"requestBody": {"required": True, "content": BULK_BODY_CONTENT}},
+)
+async def bulk_import_employees(
+    request: Request,
+    mode: Literal["report", "atomic"] = Query("report", description="`report` keeps valid rows, `atomic` imports all rows or none"),
+    chunk_size: Optional[int] = Query(None, ge=1, le=10000, description="Rows validated and inserted per batch"),
+    db: Session = Depends(get_db)
+):
+    """
+    Import many employees in one request
+    
+    Accepts a JSON array, NDJSON (`application/x-ndjson`) or CSV (`text/csv`)
+    body with `employee_id`, `full_name`, `email` and `department` fields.
+    Rows are validated and inserted in chunks; duplicate employee IDs or emails,
+    whether repeated inside the upload or already stored, are reported per row.
+    
+    - **mode** (optional): `report` commits each chunk and skips failing rows;
+      `atomic` imports everything in one transaction and rolls back if any row fails
+    - **chunk_size** (optional): Rows per batch (defaults to `BULK_CHUNK_SIZE`)
+    """
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    atomic = mode == "atomic"
+    results = []
+    batch = []
+    seen_ids: Dict[str, int] = {}
+    seen_emails: Dict[str, int] = {}
+    
+    def fail(rows, detail):
+        results.extend(
+            {
+                "row": row,
+                "employee_id": employee.employee_id,
+                "email": employee.email,
+                "result": "error",
+                "detail": detail,
+            }
+            for row, employee in rows
+        )
+    
+    def flush():
+        try:
+            batch_results = insert_employee_batch(db, batch, seen_ids, seen_emails)
+            if not atomic:
+                changes.employees_changed(db)
+                db.commit()
+            results.extend(batch_results)
+        except Exception as e:
+            db.rollback()
+            if atomic:
+                # Everything inserted so far went with the rollback
+                for result in results:
+                    if result["result"] == "created":
+                        result.update(result="rolled_back", detail="Rolled back: import failed")
+            else:
+                # Nothing of this chunk was saved, so later rows may reuse its IDs and emails
+                rows = {row for row, _ in batch}
+                for seen in (seen_ids, seen_emails):
+                    for key in [key for key, row in seen.items() if row in rows]:
+                        del seen[key]
+            fail(batch, f"Failed to save employee: {str(e)}")
+        batch.clear()
+    
+    async for row, record, error in iter_records(request):
+        if error is None:
+            try:
+                batch.append((row, EmployeeCreate(**record)))
+            except ValidationError as e:
+                error = format_validation_error(e)
+        if error is not None:
+            record = record or {}
+            results.append({
+                "row": row,
+                "employee_id": record.get("employee_id"),
+                "email": record.get("email"),
+                "result": "error",
+                "detail": error,
+            })
+        if len(batch) >= chunk_size:
+            await run_in_threadpool(flush)
+    await run_in_threadpool(flush)
+    
+    failed = sum(1 for result in results if result["result"] == "error")
+    committed = True
+    if atomic:
+        def finish():
+            if failed:
+                db.rollback()
+                return f"Not imported: {failed} row(s) failed"
+            try:
+                changes.employees_changed(db)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                return f"Failed to save employees: {str(e)}"
+            return None
+        detail = await run_in_threadpool(finish)
+        if detail:
+            committed = False
+            for result in results:
+                if result["result"] == "created":
+                    result.update(result="rolled_back", detail=detail)
+    
+    results.sort(key=lambda result: result["row"])
+    return {
+        "total": len(results),
+        "created": sum(1 for result in results if result["result"] == "created"),
+        "failed": failed,
+        "committed": committed,
+        "results": results,
+    }
+
+
+@router.post("/bulk-delete", response_model=EmployeeBulkDeleteResponse)
+def bulk_delete_employees(payload: EmployeeBulkDelete, db: Session = Depends(get_db)):
+    """
+    Delete many employees and their attendance in one transaction
+    
+    Unknown IDs are skipped and listed in `not_found`.
+    
+    - **employee_ids**: Employee identifiers to delete (up to 1000)
+    - **archive** (optional): Move their attendance to the archive table instead of discarding it
+    """
+    try:
+        result = delete_employee_batch(db, payload.employee_ids, archive=payload.archive)
+        db.commit()
+        return result
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete employees: {str(e)}"
+        )
+
+
+@router.get(
+    "",
+    response_model=List[EmployeeResponse],
+    dependencies=[conditional_get(changes.EMPLOYEES)],
+)
+def get_employees(
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="Maximum employees per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description=f"Comma-separated fields to return ({', '.join(EMPLOYEE_FIELDS)})"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve employees one page at a time
+    
+    When more employees exist, the `X-Next-Cursor` response header holds the
+    cursor for the next page.
+    
+    - **limit** (optional): Maximum number of employees per page
+    - **cursor** (optional): Continue after the last employee of the previous page
+    - **fields** (optional): Only return these fields
+    """
+    projection = parse_fields(fields, EMPLOYEE_FIELDS) or (list(EMPLOYEE_FIELDS) if settings.FAST_JSON else None)
+    if projection:
+        query = db.query(*projected_columns(Employee, projection, ("id",)))
+    else:
+        query = db.query(Employee)
+    
+    if cursor:
+        after = decode_cursor(cursor, {"id": int})
+        query = query.filter(Employee.id > after["id"])
+    
+    employees, has_more = fetch_page(query.order_by(Employee.id), limit)
+    
+    headers = dict(response.headers)
+    if has_more:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": employees[-1].id})
+    
+    if projection:
+        return rows_response(employees, projection, headers)
+    
+    response.headers.update(headers)
+    return employees
+
+
+@router.get(
+    "/search",
+    response_model=List[EmployeeResponse],
+    dependencies=[conditional_get(changes.EMPLOYEES)],
+)
+def search_employees(
+    response: Response,
+    q: Optional[str] = Query(None, max_length=100, description="Text to match against name, email and employee ID"),
+    department: Optional[str] = Query(None, description="Only return employees in this department"),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="Maximum employees per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: Session = Depends(get_read_db)
+):
     """
-    Retrieve all employees
+    Search employees by name, email or employee ID
+    
+    Matching runs against the database's text index: trigram indexes with
+    fuzzy name matching on PostgreSQL, words and a trailing prefix via FTS5
+    on SQLite. Results are ordered like `GET /api/employees`; when more
+    matches exist, the `X-Next-Cursor` response header holds the cursor for
+    the next page.
     
-    Returns a list of all employees in the system
+    - **q** (optional): Search text
+    - **department** (optional): Filter by department
+    - **limit** (optional): Maximum number of employees per page
+    - **cursor** (optional): Continue after the last employee of the previous page
     """
-    employees = db.query(Employee).all()
+    if q and q.strip():
+        query, key = search_query(db, q)
+    else:
+        query, key = db.query(Employee), Employee.id
+    if department:
+        query = query.filter(Employee.department == department)
+    
+    if cursor:
+        after = decode_cursor(cursor, {"id": int})
+        query = query.filter(key > after["id"])
+    
+    if settings.FAST_JSON:
+        query = query.with_entities(*projected_columns(Employee, EMPLOYEE_FIELDS, ("id",)))
+    
+    employees, has_more = fetch_page(query.order_by(key), limit)
+    
+    if has_more:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": employees[-1].id})
+    if settings.FAST_JSON:
+        return rows_response(employees, EMPLOYEE_FIELDS, dict(response.headers))
     return employees
 
 
-@router.get("/{employee_id}", response_model=EmployeeResponse)
-async def get_employee(employee_id: str, db: Session = Depends(get_db)):
+@router.get(
+    "/{employee_id}",
+    response_model=EmployeeResponse,
+    dependencies=[conditional_get(changes.EMPLOYEES)],
+)
+def get_employee(employee_id: str, db: Session = Depends(get_read_db)):
     """
     Retrieve a specific employee by ID
     
@@ -96,31 +349,70 @@ async def get_employee(employee_id: str, db: Session = Depends(get_db)):
     return employee
 
 
+@router.get(
+    "/{employee_id}/profile",
+    response_model=EmployeeProfile,
+    dependencies=[conditional_get(changes.EMPLOYEES, changes.ATTENDANCE)],
+)
+def get_employee_profile(
+    employee_id: str,
+    limit: int = Query(30, ge=1, le=settings.PAGE_SIZE_MAX, description="Attendance records in the window"),
+    cursor: Optional[str] = Query(None, description="next_cursor of an earlier profile, for older attendance"),
+    start_date: Optional[date] = Query(None, description="Attendance and stats from this date onwards (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Attendance and stats up to this date (YYYY-MM-DD)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve an employee with their most recent attendance and stats
+    
+    Combines the employee, attendance and stats endpoints in one request.
+    Attendance is newest first; when more records exist, `next_cursor`
+    continues the window here or in `/api/attendance?employee_id=...`.
+    
+    - **employee_id**: The unique employee identifier
+    - **limit** (optional): Attendance records to return (default 30)
+    - **cursor** (optional): Continue after the last record of an earlier window
+    - **start_date** (optional): Only count and list attendance from this date onwards
+    - **end_date** (optional): Only count and list attendance up to this date
+    """
+    profile = employee_profile(
+        db,
+        employee_id,
+        limit=limit,
+        cursor=cursor,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with ID '{employee_id}' not found"
+        )
+    
+    return profile
+
+
 @router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_employee(employee_id: str, db: Session = Depends(get_db)):
+def delete_employee(
+    employee_id: str,
+    archive: bool = Query(False, description="Move the employee's attendance to the archive instead of discarding it"),
+    db: Session = Depends(get_db)
+):
     """
     Delete an employee and all associated attendance records
     
     - **employee_id**: The unique employee identifier
+    - **archive** (optional): Keep the attendance in the archive table
     """
     try:
-        employee = db.query(Employee).filter(
-            Employee.employee_id == employee_id
-        ).first()
-        
-        if not employee:
+        result = delete_employee_batch(db, [employee_id], archive=archive)
+        if not result["deleted"]:
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Employee with ID '{employee_id}' not found"
             )
-        
-        # Delete associated attendance records (cascading delete)
-        db.query(Attendance).filter(
-            Attendance.employee_id == employee_id
-        ).delete()
-        
-        # Delete employee
-        db.delete(employee)
         db.commit()
     
     except HTTPException:
@@ -133,38 +425,20 @@ async def delete_employee(employee_id: str, db: Session = Depends(get_db)):
         )
 
 
-@router.get("/dashboard/summary", response_model=Dict)
-async def get_dashboard_summary(db: Session = Depends(get_db)):
+@router.get(
+    "/dashboard/summary",
+    response_model=Dict,
+    dependencies=[conditional_get(*summary.SOURCES)],
+)
+@single_flight()
+def get_dashboard_summary(db: Session = Depends(get_read_db)):
     """
     Get dashboard summary statistics
     
-    Returns total counts and department-wise breakdown
+    Returns total counts and department-wise breakdown. Attendance totals
+    come from the daily rollups, so they trail attendance writes by up to
+    `ROLLUP_REFRESH_SECONDS`. The result is cached and invalidated when
+    employees change or the rollups are refreshed; concurrent requests
+    after an invalidation share one recomputation.
     """
-    # Total counts
-    total_employees = db.query(Employee).count()
-    total_attendance_records = db.query(Attendance).count()
-    total_present = db.query(Attendance).filter(Attendance.status == "Present").count()
-    total_absent = db.query(Attendance).filter(Attendance.status == "Absent").count()
-    
-    # Department-wise employee count
-    dept_counts = db.query(
-        Employee.department,
-        func.count(Employee.id).label('count')
-    ).group_by(Employee.department).all()
-    
-    department_breakdown = [
-        {"department": dept, "count": count}
-        for dept, count in dept_counts
-    ]
-    
-    # Calculate overall attendance rate
-    overall_attendance_rate = (total_present / total_attendance_records * 100) if total_attendance_records > 0 else 0
-    
-    return {
-        "total_employees": total_employees,
-        "total_attendance_records": total_attendance_records,
-        "total_present": total_present,
-        "total_absent": total_absent,
-        "overall_attendance_rate": round(overall_attendance_rate, 2),
-        "department_breakdown": department_breakdown
-    }
+    return summary.get_dashboard_summary(db)
@@ -1,12 +1,44 @@
 """
 Pydantic schemas for request/response validation
 """
-from .employee import EmployeeCreate, EmployeeResponse
-from .attendance import AttendanceCreate, AttendanceResponse
+from .employee import (
+    EmployeeCreate,
+    EmployeeResponse,
+    EmployeeBulkResult,
+    EmployeeBulkResponse,
+    EmployeeBulkDelete,
+    EmployeeBulkDeleteResponse,
+    EmployeeProfile,
+)
+from .attendance import (
+    AttendanceCreate,
+    AttendanceResponse,
+    AttendanceAccepted,
+    AttendanceBulkResult,
+    AttendanceBulkResponse,
+)
+from .batch import (
+    BatchSubRequest,
+    BatchRequest,
+    BatchSubResponse,
+    BatchResponse,
+)
 
 __all__ = [
     "EmployeeCreate",
     "EmployeeResponse",
+    "EmployeeBulkResult",
+    "EmployeeBulkResponse",
+    "EmployeeBulkDelete",
+    "EmployeeBulkDeleteResponse",
+    "EmployeeProfile",
     "AttendanceCreate",
     "AttendanceResponse",
+    "AttendanceAccepted",
+    "AttendanceBulkResult",
+    "AttendanceBulkResponse",
+    "BatchSubRequest",
+    "BatchRequest",
+    "BatchSubResponse",
+    "BatchResponse",
 ]
@@ -2,6 +2,8 @@
 Attendance schemas for request/response validation
 """
 from datetime import date
+from datetime import date as date_type
+from typing import List, Optional
 from pydantic import BaseModel, validator
 from ..models.attendance import AttendanceStatus
 
@@ -30,3 +32,31 @@ class AttendanceResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class AttendanceAccepted(BaseModel):
+    """Schema for a mark queued by the write buffer but not yet committed"""
+    
+    employee_id: str
+    date: date
+    status: AttendanceStatus
+
+
+class AttendanceBulkResult(BaseModel):
+    """Outcome of a single row in a bulk attendance upload"""
+    
+    row: int
+    employee_id: Optional[str] = None
+    date: Optional[date_type] = None
+    result: str
+    detail: Optional[str] = None
+
+
+class AttendanceBulkResponse(BaseModel):
+    """Schema for bulk attendance upload response"""
+    
+    total: int
+    created: int
+    updated: int
+    failed: int
+    results: List[AttendanceBulkResult]
@@ -0,0 +1,45 @@
+"""
+Batch request schemas
+"""
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, validator
+
+
+class BatchSubRequest(BaseModel):
+    """One API call inside a batch"""
+    
+    id: Optional[str] = None
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    params: Dict[str, Any] = {}
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+    
+    @validator('path')
+    def validate_path(cls, v):
+        if not v.startswith('/') or v.startswith('//'):
+            raise ValueError('Path must be relative to the API root, e.g. /employees/E001')
+        if '?' in v:
+            raise ValueError('Pass query parameters in params')
+        return v
+
+
+class BatchRequest(BaseModel):
+    """Schema for a batch of API calls"""
+    
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+
+class BatchSubResponse(BaseModel):
+    """Outcome of one call inside a batch"""
+    
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    """Schema for batch response, in request order"""
+    
+    responses: List[BatchSubResponse]
@@ -1,7 +1,9 @@
 """
 Employee schemas for request/response validation
 """
-from pydantic import BaseModel, EmailStr, validator
+from typing import Dict, List, Optional
+from pydantic import BaseModel, EmailStr, Field, validator
+from .attendance import AttendanceResponse
 
 
 class EmployeeCreate(BaseModel):
@@ -42,3 +44,49 @@ class EmployeeResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class EmployeeBulkResult(BaseModel):
+    """Outcome of a single row in a bulk employee import"""
+    
+    row: int
+    employee_id: Optional[str] = None
+    email: Optional[str] = None
+    result: str
+    detail: Optional[str] = None
+
+
+class EmployeeBulkResponse(BaseModel):
+    """Schema for bulk employee import response"""
+    
+    total: int
+    created: int
+    failed: int
+    committed: bool
+    results: List[EmployeeBulkResult]
+
+
+class EmployeeBulkDelete(BaseModel):
+    """Schema for deleting many employees at once"""
+    
+    employee_ids: List[str] = Field(..., min_length=1, max_length=1000)
+    archive: bool = False
+
+
+class EmployeeBulkDeleteResponse(BaseModel):
+    """Schema for bulk employee delete response"""
+    
+    requested: int
+    deleted: int
+    attendance_deleted: int
+    attendance_archived: int
+    not_found: List[str]
+
+
+class EmployeeProfile(BaseModel):
+    """Schema for an employee with a page of recent attendance and stats"""
+    
+    employee: EmployeeResponse
+    attendance: List[AttendanceResponse]
+    next_cursor: Optional[str] = None
+    stats: Dict
@@ -0,0 +1,215 @@
+"""
+Vectorized attendance analytics
+
+Attendance for the requested employees and dates is unpacked from the
+in-memory bitsets (services.bitmaps) into two dense boolean matrices,
+present and absent, with one row per employee and one column per day.
+Rolling rates, weekday patterns, department trends and absence streaks
+are then whole-array NumPy operations, so the cost grows with the matrix
+size rather than with Python-level work per attendance mark.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models.employee import Employee
+from .bitmaps import attendance_bitmaps, day_index
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Longest date range one request may analyze
+MAX_DAYS = 3660
+
+# Bytes per yearly bitset; 366 days fit in 46 bytes, rounded up to a multiple of 8
+_YEAR_BYTES = 48
+
+
+def _rate(present, marked):
+    """Attendance percentage, elementwise; 0 where nothing was marked"""
+    present = np.asarray(present, dtype=np.float64)
+    marked = np.asarray(marked, dtype=np.float64)
+    rates = np.divide(present * 100, marked, out=np.zeros_like(present), where=marked > 0)
+    return np.round(rates, 2)
+
+
+def _unpack(bitsets: List[int], first: int, last: int) -> np.ndarray:
+    """Columns first..last (day indexes) of the given yearly bitsets as a bool matrix"""
+    raw = b"".join(bits.to_bytes(_YEAR_BYTES, "little") for bits in bitsets)
+    matrix = np.frombuffer(raw, dtype=np.uint8).reshape(len(bitsets), _YEAR_BYTES)
+    return np.unpackbits(matrix, axis=1, bitorder="little")[:, first:last + 1].astype(bool)
+
+
+def load_matrices(
+    db: Session,
+    employee_ids: List[str],
+    start_date: date,
+    end_date: date,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """present and absent matrices of shape (employees, days in range)"""
+    present_parts, absent_parts = [], []
+    for year in range(start_date.year, end_date.year + 1):
+        first = day_index(start_date) if year == start_date.year else 0
+        last = day_index(end_date) if year == end_date.year else day_index(date(year, 12, 31))
+        bits = attendance_bitmaps.year(db, year)
+        empty = (0, 0)
+        pairs = [bits.get(employee_id, empty) for employee_id in employee_ids]
+        present_parts.append(_unpack([pair[0] for pair in pairs], first, last))
+        absent_parts.append(_unpack([pair[1] for pair in pairs], first, last))
+    return np.concatenate(present_parts, axis=1), np.concatenate(absent_parts, axis=1)
+
+
+def longest_runs(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Length and start column of the longest run of True in each row"""
+    rows, days = matrix.shape
+    # A False column on both sides makes every run start and end inside its row
+    padded = np.zeros((rows, days + 2), dtype=np.int8)
+    padded[:, 1:-1] = matrix
+    edges = np.diff(padded, axis=1)
+    start_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    lengths = ends - starts
+
+    best_length = np.zeros(rows, dtype=np.int64)
+    best_start = np.zeros(rows, dtype=np.int64)
+    if lengths.size:
+        # Longest run first within each row, earliest start on ties
+        order = np.lexsort((starts, -lengths, start_rows))
+        first = np.concatenate(([True], start_rows[order][1:] != start_rows[order][:-1]))
+        chosen = order[first]
+        best_length[start_rows[chosen]] = lengths[chosen]
+        best_start[start_rows[chosen]] = starts[chosen]
+    return best_length, best_start
+
+
+def attendance_analytics(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    department: Optional[str] = None,
+    window: int = 30,
+    top: int = 10,
+) -> Dict:
+    """Trends, weekday pattern, department breakdown, streaks and absenteeism"""
+    query = db.query(Employee.employee_id, Employee.department)
+    if department:
+        query = query.filter(Employee.department == department)
+    employees = query.order_by(Employee.id).all()
+    employee_ids = [employee.employee_id for employee in employees]
+    departments = np.array([employee.department for employee in employees], dtype=object)
+    days = np.array([start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)])
+
+    if employee_ids:
+        present, absent = load_matrices(db, employee_ids, start_date, end_date)
+    else:
+        present = absent = np.zeros((0, len(days)), dtype=bool)
+
+    # Per-day totals and a trailing window rate from cumulative sums
+    daily_present = present.sum(axis=0)
+    daily_absent = absent.sum(axis=0)
+    cumulative_present = np.concatenate(([0], np.cumsum(daily_present)))
+    cumulative_marked = np.concatenate(([0], np.cumsum(daily_present + daily_absent)))
+    window_start = np.maximum(np.arange(1, len(days) + 1) - window, 0)
+    window_present = cumulative_present[1:] - cumulative_present[window_start]
+    window_marked = cumulative_marked[1:] - cumulative_marked[window_start]
+    rolling = _rate(window_present, window_marked)
+
+    # Weekday pattern
+    weekday = np.array([day.weekday() for day in days], dtype=np.int64)
+    weekday_present = np.bincount(weekday, weights=daily_present, minlength=7)
+    weekday_absent = np.bincount(weekday, weights=daily_absent, minlength=7)
+    weekday_rate = _rate(weekday_present, weekday_present + weekday_absent)
+
+    # Per-employee totals, then grouped by department and month
+    employee_present = present.sum(axis=1)
+    employee_absent = absent.sum(axis=1)
+    department_names, department_codes = np.unique(departments, return_inverse=True) \
+        if len(departments) else (np.array([], dtype=object), np.array([], dtype=np.int64))
+    department_present = np.bincount(department_codes, weights=employee_present, minlength=len(department_names))
+    department_absent = np.bincount(department_codes, weights=employee_absent, minlength=len(department_names))
+    department_size = np.bincount(department_codes, minlength=len(department_names))
+
+    # Days are consecutive, so each month is a contiguous block of columns
+    month_keys = np.array([day.year * 12 + day.month - 1 for day in days], dtype=np.int64)
+    month_starts = np.flatnonzero(np.concatenate(([True], month_keys[1:] != month_keys[:-1])))
+    month_values = month_keys[month_starts]
+    department_month_present = np.zeros((len(department_names), len(month_values)), dtype=np.int64)
+    department_month_absent = np.zeros_like(department_month_present)
+    if employee_ids:
+        np.add.at(department_month_present, department_codes, np.add.reduceat(present, month_starts, axis=1, dtype=np.int64))
+        np.add.at(department_month_absent, department_codes, np.add.reduceat(absent, month_starts, axis=1, dtype=np.int64))
+    department_month_rate = _rate(department_month_present, department_month_present + department_month_absent)
+    month_labels = [f"{key // 12}-{key % 12 + 1:02d}" for key in month_values]
+
+    # Longest consecutive absence per employee
+    streak_length, streak_start = longest_runs(absent)
+    streak_order = np.argsort(-streak_length, kind="stable")[:top]
+    absentee_order = np.argsort(-employee_absent, kind="stable")[:top]
+    absence_rate = _rate(employee_absent, employee_present + employee_absent)
+
+    total_present = int(employee_present.sum())
+    total_absent = int(employee_absent.sum())
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "employees": len(employee_ids),
+        "window": window,
+        "summary": {
+            "total_present": total_present,
+            "total_absent": total_absent,
+            "total_days": total_present + total_absent,
+            "attendance_rate": float(_rate(total_present, total_present + total_absent)),
+        },
+        "daily": [
+            {
+                "date": day,
+                "present": int(daily_present[i]),
+                "absent": int(daily_absent[i]),
+                "rolling_rate": float(rolling[i]) if window_marked[i] else None,
+            }
+            for i, day in enumerate(days)
+        ],
+        "day_of_week": [
+            {
+                "weekday": WEEKDAYS[i],
+                "present": int(weekday_present[i]),
+                "absent": int(weekday_absent[i]),
+                "attendance_rate": float(weekday_rate[i]),
+            }
+            for i in range(7)
+        ],
+        "departments": [
+            {
+                "department": name,
+                "employees": int(department_size[i]),
+                "total_present": int(department_present[i]),
+                "total_absent": int(department_absent[i]),
+                "attendance_rate": float(_rate(department_present[i], department_present[i] + department_absent[i])),
+                "monthly": [
+                    {"month": label, "attendance_rate": float(department_month_rate[i, j])}
+                    for j, label in enumerate(month_labels)
+                ],
+            }
+            for i, name in enumerate(department_names)
+        ],
+        "longest_absence_streaks": [
+            {
+                "employee_id": employee_ids[i],
+                "department": departments[i],
+                "days": int(streak_length[i]),
+                "start_date": days[streak_start[i]],
+                "end_date": days[streak_start[i] + streak_length[i] - 1],
+            }
+            for i in streak_order if streak_length[i] > 0
+        ],
+        "top_absentees": [
+            {
+                "employee_id": employee_ids[i],
+                "department": departments[i],
+                "total_absent": int(employee_absent[i]),
+                "absence_rate": float(absence_rate[i]),
+            }
+            for i in absentee_order if employee_absent[i] > 0
+        ],
+    }
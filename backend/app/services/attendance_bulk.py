@@ -0,0 +1,95 @@
+"""
+Set-based attendance upsert shared by the bulk endpoints
+"""
+from datetime import date
+from typing import Collection, Dict, List, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from ..models.attendance import Attendance
+from ..models.employee import Employee
+from ..schemas.attendance import AttendanceCreate
+from .upsert import upsert_rows
+
+# Keys per lookup statement; each distinct employee adds an OR term, and
+# SQLite caps expression depth at 1000
+_KEYS_PER_STATEMENT = 500
+
+
+def attendance_for_keys(db: Session, columns, keys: Collection[Tuple[str, date]]) -> List:
+    """
+    Rows of columns for exactly the given (employee_id, date) keys
+
+    Keys are grouped per employee into `employee_id = ? AND date IN (...)`
+    terms, which both SQLite and PostgreSQL answer with seeks on the
+    unique (employee_id, date) index, so a chunk spanning a long date
+    range reads only its own rows.
+    """
+    keys = sorted(keys)
+    rows = []
+    for i in range(0, len(keys), _KEYS_PER_STATEMENT):
+        dates_by_employee: Dict[str, List[date]] = {}
+        for employee_id, day in keys[i:i + _KEYS_PER_STATEMENT]:
+            dates_by_employee.setdefault(employee_id, []).append(day)
+        rows.extend(db.query(*columns).filter(or_(*[
+            and_(Attendance.employee_id == employee_id, Attendance.date.in_(dates))
+            for employee_id, dates in dates_by_employee.items()
+        ])))
+    return rows
+
+
+def upsert_attendance_batch(
+    db: Session,
+    batch: List[Tuple[int, AttendanceCreate]],
+) -> List[Dict]:
+    """
+    Upsert a batch of validated attendance marks without committing
+
+    Employee IDs are checked with one set query and the batch's own
+    (employee_id, date) keys are looked up with another, so the batch
+    costs three statements per 500 marks. Returns one result per
+    input row.
+    """
+    if not batch:
+        return []
+
+    employee_ids = {mark.employee_id for _, mark in batch}
+    known_employees = {
+        employee_id for (employee_id,) in db.query(Employee.employee_id).filter(
+            Employee.employee_id.in_(employee_ids)
+        )
+    }
+
+    keys = {(mark.employee_id, mark.date) for _, mark in batch if mark.employee_id in known_employees}
+    existing_keys = {
+        tuple(key) for key in attendance_for_keys(db, (Attendance.employee_id, Attendance.date), keys)
+    }
+
+    results = []
+    rows: Dict[tuple, Dict] = {}
+    for row, mark in batch:
+        result = {"row": row, "employee_id": mark.employee_id, "date": mark.date}
+        if mark.employee_id not in known_employees:
+            result.update(
+                result="error",
+                detail=f"Employee with ID '{mark.employee_id}' not found",
+            )
+            results.append(result)
+            continue
+
+        key = (mark.employee_id, mark.date)
+        result["result"] = "updated" if key in existing_keys or key in rows else "created"
+        # Later marks for the same employee and date win, as with repeated POSTs
+        rows[key] = {"employee_id": mark.employee_id, "date": mark.date, "status": mark.status}
+        results.append(result)
+
+    upsert_rows(
+        db,
+        Attendance,
+        list(rows.values()),
+        conflict_columns=("employee_id", "date"),
+        update_columns=("status",),
+        existing_keys=existing_keys,
+    )
+    return results
@@ -0,0 +1,203 @@
+"""
+In-memory attendance bitsets for calendar and rate queries
+
+For every employee and year the store keeps two bitsets, present and
+absent, with bit n standing for day n of the year (January 1st is bit 0).
+Python ints serve as arbitrary-length bit arrays, so counting the days in
+a date range is a mask and an int.bit_count() instead of a scan over
+attendance rows.
+
+A year is loaded lazily for all employees with one range query over live
+and archived attendance, so archived years keep their calendars and
+counts. Marks written by this process are applied in place after commit;
+other changes (deletes, archiving) drop the loaded years, and entries
+expire after ATTENDANCE_BITMAP_TTL_SECONDS to pick up writes from other
+processes.
+"""
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, Integer, case, cast, extract, func, literal, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.attendance import AttendanceStatus
+from . import changes
+from .history import attendance_history, history_bounds
+
+PRESENT, ABSENT = 0, 1
+
+
+def day_index(day: date) -> int:
+    """Bit position of day within its year"""
+    return day.timetuple().tm_yday - 1
+
+
+def range_mask(year: int, start_date: Optional[date], end_date: Optional[date]) -> int:
+    """Bits of year that fall within [start_date, end_date] (open ends are unbounded)"""
+    first = day_index(start_date) if start_date and start_date.year == year else 0
+    last = day_index(end_date) if end_date and end_date.year == year else 365
+    if last < first:
+        return 0
+    return ((1 << (last + 1)) - 1) ^ ((1 << first) - 1)
+
+
+def iter_days(year: int, bits: int) -> Iterable[date]:
+    """Dates of the set bits, in order"""
+    january_first = date(year, 1, 1)
+    while bits:
+        lowest = bits & -bits
+        yield january_first + timedelta(days=lowest.bit_length() - 1)
+        bits ^= lowest
+
+
+class AttendanceBitmaps:
+    """Per-year {employee_id: [present_bits, absent_bits]} with lazy loading"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._years: Dict[int, Tuple[float, Dict[str, List[int]]]] = {}
+        # Bumped on every change so a load racing with a write is not kept
+        self._generation = 0
+
+    def _load(self, db: Session, year: int) -> Dict[str, List[int]]:
+        """
+        Build a year's bitsets for all employees
+
+        The database folds each employee's month into two day-of-month
+        masks (marks are unique per day, so SUM(1 << day) is a bitwise OR),
+        which cuts the rows shipped to Python by up to 31x.
+        """
+        rows = attendance_history(start_date=date(year, 1, 1), end_before=date(year + 1, 1, 1))
+        dialect = db.get_bind().dialect.name
+        bits: Dict[str, List[int]] = {}
+
+        if dialect not in ("sqlite", "postgresql"):
+            for employee_id, day, status in db.execute(select(rows.c.employee_id, rows.c.date, rows.c.status)):
+                entry = bits.setdefault(employee_id, [0, 0])
+                entry[PRESENT if status == AttendanceStatus.PRESENT else ABSENT] |= 1 << day_index(day)
+            return bits
+
+        if dialect == "sqlite":
+            month = cast(func.strftime("%m", rows.c.date), Integer)
+            day_bit = cast(literal(1), BigInteger).op("<<")(cast(func.strftime("%d", rows.c.date), Integer) - 1)
+        else:
+            month = cast(extract("month", rows.c.date), Integer)
+            day_bit = cast(literal(1), BigInteger).op("<<")(cast(extract("day", rows.c.date), Integer) - 1)
+
+        def mask(status: AttendanceStatus):
+            return func.sum(case((rows.c.status == status, day_bit), else_=0))
+
+        months = db.execute(
+            select(rows.c.employee_id, month, mask(AttendanceStatus.PRESENT), mask(AttendanceStatus.ABSENT))
+            .group_by(rows.c.employee_id, month)
+        )
+        month_offsets = [0] + [day_index(date(year, number, 1)) for number in range(1, 13)]
+        for employee_id, month_number, present, absent in months:
+            offset = month_offsets[month_number]
+            entry = bits.setdefault(employee_id, [0, 0])
+            entry[PRESENT] |= int(present) << offset
+            entry[ABSENT] |= int(absent) << offset
+        return bits
+
+    def year(self, db: Session, year: int) -> Dict[str, List[int]]:
+        """Bitsets of every employee with attendance in year"""
+        with self._lock:
+            cached = self._years.get(year)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+            generation = self._generation
+        bits = self._load(db, year)
+        with self._lock:
+            if self._generation == generation:
+                self._years[year] = (time.monotonic(), bits)
+        return bits
+
+    def years(self, db: Session, start_date: Optional[date], end_date: Optional[date]) -> List[int]:
+        """Years to consult for a date range, bounded by the attendance on record"""
+        first, last = history_bounds(db)
+        if first is None:
+            return []
+        start = max(first.year, start_date.year) if start_date else first.year
+        end = min(last.year, end_date.year) if end_date else last.year
+        return list(range(start, end + 1))
+
+    def counts(
+        self,
+        db: Session,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        employee_ids: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Tuple[int, int]]:
+        """(present, absent) day counts per employee within the date range"""
+        wanted = set(employee_ids) if employee_ids is not None else None
+        totals: Dict[str, Tuple[int, int]] = {}
+        for year in self.years(db, start_date, end_date):
+            mask = range_mask(year, start_date, end_date)
+            bits = self.year(db, year)
+            entries = list(bits.items()) if wanted is None else \
+                [(employee_id, bits[employee_id]) for employee_id in wanted.intersection(bits)]
+            for employee_id, (present, absent) in entries:
+                previous = totals.get(employee_id, (0, 0))
+                totals[employee_id] = (
+                    previous[0] + (present & mask).bit_count(),
+                    previous[1] + (absent & mask).bit_count(),
+                )
+        return totals
+
+    def employee_year(self, db: Session, employee_id: str, year: int) -> Tuple[int, int]:
+        """(present_bits, absent_bits) for one employee and year"""
+        present, absent = self.year(db, year).get(employee_id, (0, 0))
+        return present, absent
+
+    def apply(self, marks: Optional[List[changes.Mark]]):
+        """Fold committed marks into the loaded years, or drop them all when marks is None"""
+        with self._lock:
+            self._generation += 1
+            if marks is None:
+                self._years.clear()
+                return
+            for employee_id, day, status in marks:
+                cached = self._years.get(day.year)
+                if cached is None:
+                    continue
+                bit = 1 << day_index(day)
+                present, absent = cached[1].get(employee_id, (0, 0))
+                if status == AttendanceStatus.PRESENT:
+                    present, absent = present | bit, absent & ~bit
+                else:
+                    present, absent = present & ~bit, absent | bit
+                # Replace rather than mutate so concurrent readers see a consistent pair
+                cached[1][employee_id] = [present, absent]
+
+    def clear(self):
+        self.apply(None)
+
+
+attendance_bitmaps = AttendanceBitmaps(ttl=settings.ATTENDANCE_BITMAP_TTL_SECONDS)
+
+changes.subscribe_marks(attendance_bitmaps.apply)
+
+
+def employee_calendar(db: Session, employee_id: str, year: int) -> Dict:
+    """Present and absent days of one employee's year, grouped by month"""
+    present, absent = attendance_bitmaps.employee_year(db, employee_id, year)
+    months = [{"month": month, "present": [], "absent": []} for month in range(1, 13)]
+    for key, bits in (("present", present), ("absent", absent)):
+        for day in iter_days(year, bits):
+            months[day.month - 1][key].append(day.day)
+
+    total_present, total_absent = present.bit_count(), absent.bit_count()
+    total_days = total_present + total_absent
+    return {
+        "employee_id": employee_id,
+        "year": year,
+        "total_present": total_present,
+        "total_absent": total_absent,
+        "total_days": total_days,
+        "attendance_rate": round(total_present / total_days * 100, 2) if total_days > 0 else 0,
+        "months": months,
+    }
@@ -0,0 +1,160 @@
+"""
+Pluggable result caches with hit/miss metrics
+
+The default backend is an in-process LRU with per-entry TTL. Multi-worker
+deployments can point CACHE_BACKEND at any class implementing
+CacheBackend (e.g. one backed by a shared store) as "module.path:ClassName".
+Cached values are JSON-compatible so shared backends can serialize them.
+"""
+import importlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..config import settings
+
+MISSING = object()
+
+
+class CacheBackend(ABC):
+    """Storage interface for caches"""
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Return the cached value, or MISSING"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float):
+        """Store value for ttl seconds"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove key if present"""
+
+    @abstractmethod
+    def clear(self):
+        """Remove every key"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Thread-safe in-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def load_backend(spec: str, namespace: str) -> CacheBackend:
+    """
+    Create the backend named by CACHE_BACKEND ("memory" or "module:Class")
+
+    Custom backends are constructed with the cache name as their only
+    argument so clear() can be limited to that namespace.
+    """
+    if spec == "memory":
+        return MemoryCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+    module_name, _, class_name = spec.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(namespace)
+
+
+class Cache:
+    """
+    Named cache with metrics over a CacheBackend
+
+    Invalidation bumps a generation counter so a value computed before an
+    invalidation is never stored after it.
+    """
+
+    def __init__(self, name: str, ttl: float, backend: Optional[CacheBackend] = None):
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend or load_backend(settings.CACHE_BACKEND, name)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._generation = 0
+        CACHES[name] = self
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], cache_none: bool = True) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss
+
+        With cache_none off, a computed None is returned but not stored.
+        """
+        value = self.backend.get(self._key(key))
+        if value is not MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        generation = self._generation
+        value = compute()
+        if generation == self._generation and (cache_none or value is not None):
+            self.backend.set(self._key(key), value, self.ttl)
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store value for key ahead of any lookup (e.g. when warming)"""
+        self.backend.set(self._key(key), value, self.ttl)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one key, or every key when key is None"""
+        self._generation += 1
+        self.invalidations += 1
+        if key is None:
+            self.backend.clear()
+        else:
+            self.backend.delete(self._key(key))
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+CACHES: Dict[str, Cache] = {}
+
+
+def cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every cache created in this process"""
+    return {name: cache.metrics() for name, cache in CACHES.items()}
@@ -0,0 +1,131 @@
+"""
+Change notifications for derived data
+
+Write paths call the *_changed helpers before committing. Subscribers
+(cache invalidation and the like) run only after the transaction
+commits, so readers never rebuild derived data from uncommitted state;
+a rollback discards the pending notifications. Hooks registered with
+on_attendance_dates or on_commit run inside the committing transaction
+instead, for bookkeeping that must be atomic with the write. Subscribers registered
+with subscribe_marks also learn which marks were written, so in-memory
+views can update in place rather than start over.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+EMPLOYEES = "employees"
+ATTENDANCE = "attendance"
+ROLLUPS = "rollups"
+
+_subscribers: Dict[str, List[Callable[[], None]]] = defaultdict(list)
+
+_date_hooks: List[Callable[[Session, Set[date]], None]] = []
+
+_commit_hooks: List[Callable[[Session, Set[str]], None]] = []
+
+# (employee_id, date, status) of an upserted attendance mark
+Mark = Tuple[str, date, object]
+
+_mark_subscribers: List[Callable[[Optional[List[Mark]]], None]] = []
+
+_PENDING_KEY = "pending_changes"
+_DATES_KEY = "pending_attendance_dates"
+_MARKS_KEY = "pending_attendance_marks"
+
+
+def subscribe(table: str, callback: Callable[[], None]):
+    """Call callback after every committed change to table"""
+    _subscribers[table].append(callback)
+
+
+def on_attendance_dates(hook: Callable[[Session, Set[date]], None]):
+    """Call hook(db, dates) before commit of any transaction that changed attendance dates"""
+    _date_hooks.append(hook)
+
+
+def on_commit(hook: Callable[[Session, Set[str]], None]):
+    """Call hook(db, tables) before commit of any transaction that changed tables"""
+    _commit_hooks.append(hook)
+
+
+def subscribe_marks(callback: Callable[[Optional[List[Mark]]], None]):
+    """
+    Call callback(marks) after every committed attendance change
+
+    marks lists the upserted marks in write order, or is None when the
+    transaction also changed attendance in ways not described mark by
+    mark (deletes, archiving).
+    """
+    _mark_subscribers.append(callback)
+
+
+def _mark(db: Session, table: str):
+    db.info.setdefault(_PENDING_KEY, set()).add(table)
+
+
+def employees_changed(db: Session):
+    """Record that the current transaction modifies employees"""
+    _mark(db, EMPLOYEES)
+
+
+def rollups_changed(db: Session):
+    """Record that the current transaction rewrites the attendance rollups"""
+    _mark(db, ROLLUPS)
+
+
+def attendance_changed(db: Session, dates: Iterable[date] = (), marks: Optional[Iterable[Mark]] = None):
+    """
+    Record that the current transaction modifies attendance on dates
+
+    Pass marks when the change consists exactly of these upserts.
+    """
+    _mark(db, ATTENDANCE)
+    db.info.setdefault(_DATES_KEY, set()).update(dates)
+    pending = db.info.get(_MARKS_KEY, [])
+    # Once any change in the transaction is not described by marks, none are passed on
+    db.info[_MARKS_KEY] = None if marks is None or pending is None else pending + list(marks)
+
+
+def notify(table: str, marks: Optional[List[Mark]] = None):
+    """
+    Run the subscribers of table now
+
+    Used directly when a change made elsewhere (another worker) is
+    detected, in which case no marks are known.
+    """
+    for callback in _subscribers[table]:
+        callback()
+    if table == ATTENDANCE:
+        for callback in _mark_subscribers:
+            callback(marks)
+
+
+@event.listens_for(Session, "before_commit")
+def _run_date_hooks(db: Session):
+    dates = db.info.pop(_DATES_KEY, None)
+    if dates:
+        for hook in _date_hooks:
+            hook(db, dates)
+    tables = db.info.get(_PENDING_KEY)
+    if tables:
+        for hook in _commit_hooks:
+            hook(db, tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_subscribers(db: Session):
+    tables = db.info.pop(_PENDING_KEY, ())
+    marks = db.info.pop(_MARKS_KEY, None)
+    for table in tables:
+        notify(table, marks)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(db: Session):
+    db.info.pop(_PENDING_KEY, None)
+    db.info.pop(_DATES_KEY, None)
+    db.info.pop(_MARKS_KEY, None)
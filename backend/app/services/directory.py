@@ -0,0 +1,96 @@
+"""
+In-process employee directory for existence checks on hot paths
+
+Maps employee_id to the employee's id, name, email and department in a
+bounded LRU, so marking attendance and the per-employee reads skip the
+lookup query on a hit. Misses are not cached: an ID unknown here may
+have just been created by another worker, so it is always looked up. The directory is
+warmed with the first EMPLOYEE_DIRECTORY_MAX_ENTRIES employees at
+startup and cleared after every committed employee write in this
+process.
+
+Writes handled by other workers are picked up through the table version
+counters (services/versions.py): at most every
+EMPLOYEE_DIRECTORY_SYNC_SECONDS a lookup reads the employees version,
+and a version this process has not seen clears the directory. With
+syncing off, EMPLOYEE_DIRECTORY_TTL_SECONDS bounds that staleness.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.employee import Employee
+from . import changes
+from .cache import Cache, MemoryCacheBackend
+from .versions import current_versions
+
+_COLUMNS = (Employee.id, Employee.employee_id, Employee.full_name, Employee.email, Employee.department)
+
+
+def _lookup(db: Session, employee_id: str) -> Optional[Dict]:
+    row = db.execute(select(*_COLUMNS).where(Employee.employee_id == employee_id)).first()
+    return dict(row._mapping) if row else None
+
+
+class EmployeeDirectory:
+    """employee_id -> employee entry, cached with hit/miss metrics"""
+
+    def __init__(self):
+        self.cache = Cache(
+            "employee_directory",
+            ttl=settings.EMPLOYEE_DIRECTORY_TTL_SECONDS,
+            backend=MemoryCacheBackend(max_entries=settings.EMPLOYEE_DIRECTORY_MAX_ENTRIES),
+        )
+        self._synced_at = 0.0
+        self._sync_lock = threading.Lock()
+
+    def _sync(self, db: Session):
+        """Check the employees version when the last check is older than the sync interval"""
+        interval = settings.EMPLOYEE_DIRECTORY_SYNC_SECONDS
+        if not interval:
+            return
+        now = time.monotonic()
+        with self._sync_lock:
+            if now - self._synced_at < interval:
+                return
+            self._synced_at = now
+        # Clears the directory (via changes.notify) when another worker wrote
+        current_versions(db, [changes.EMPLOYEES])
+
+    def get(self, db: Session, employee_id: str) -> Optional[Dict]:
+        """The employee's entry, or None when no such employee exists"""
+        if not settings.EMPLOYEE_DIRECTORY:
+            return _lookup(db, employee_id)
+        self._sync(db)
+        return self.cache.get_or_set(employee_id, lambda: _lookup(db, employee_id), cache_none=False)
+
+    def exists(self, db: Session, employee_id: str) -> bool:
+        return self.get(db, employee_id) is not None
+
+    def warm(self, engine: Engine):
+        """Load the first EMPLOYEE_DIRECTORY_MAX_ENTRIES employees"""
+        if not settings.EMPLOYEE_DIRECTORY:
+            return
+        with Session(engine) as db:
+            # Record the version first so the first sync does not throw the warm entries away
+            current_versions(db, [changes.EMPLOYEES])
+            self._synced_at = time.monotonic()
+            rows = db.execute(
+                select(*_COLUMNS).order_by(Employee.id).limit(settings.EMPLOYEE_DIRECTORY_MAX_ENTRIES)
+            ).all()
+        for row in rows:
+            self.cache.set(row.employee_id, dict(row._mapping))
+
+    def clear(self):
+        self.cache.invalidate()
+
+
+employee_directory = EmployeeDirectory()
+
+# Deletes and updates make cached entries stale
+changes.subscribe(changes.EMPLOYEES, employee_directory.clear)
@@ -0,0 +1,118 @@
+"""
+Set-based employee import and delete shared by the employee endpoints
+"""
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.attendance import Attendance, AttendanceArchive
+from ..models.employee import Employee
+from ..schemas.employee import EmployeeCreate
+from . import changes
+
+
+def insert_employee_batch(
+    db: Session,
+    batch: List[Tuple[int, EmployeeCreate]],
+    seen_ids: Dict[str, int],
+    seen_emails: Dict[str, int],
+) -> List[Dict]:
+    """
+    Insert a batch of validated employees without committing
+
+    Duplicates are detected against earlier rows of the same upload
+    (seen_ids/seen_emails map values to the row that claimed them and are
+    updated in place) and against the database with one set query per
+    column. Clean rows are inserted with a single executemany. Returns one
+    result per input row.
+    """
+    if not batch:
+        return []
+
+    employee_ids = {employee.employee_id for _, employee in batch}
+    emails = {employee.email for _, employee in batch}
+    existing_ids = {
+        value for (value,) in db.query(Employee.employee_id).filter(Employee.employee_id.in_(employee_ids))
+    }
+    existing_emails = {
+        value for (value,) in db.query(Employee.email).filter(Employee.email.in_(emails))
+    }
+
+    results = []
+    rows = []
+    for row, employee in batch:
+        result = {"row": row, "employee_id": employee.employee_id, "email": employee.email}
+        if employee.employee_id in seen_ids:
+            detail = f"Duplicate employee ID '{employee.employee_id}' (first seen in row {seen_ids[employee.employee_id]})"
+        elif employee.email in seen_emails:
+            detail = f"Duplicate email '{employee.email}' (first seen in row {seen_emails[employee.email]})"
+        elif employee.employee_id in existing_ids:
+            detail = f"Employee with ID '{employee.employee_id}' already exists"
+        elif employee.email in existing_emails:
+            detail = f"Employee with email '{employee.email}' already exists"
+        else:
+            detail = None
+
+        seen_ids.setdefault(employee.employee_id, row)
+        seen_emails.setdefault(employee.email, row)
+
+        if detail:
+            result.update(result="error", detail=detail)
+        else:
+            result["result"] = "created"
+            rows.append(employee.dict())
+        results.append(result)
+
+    if rows:
+        db.execute(insert(Employee), rows)
+    return results
+
+
+def delete_employee_batch(db: Session, employee_ids: Iterable[str], archive: bool = False) -> Dict:
+    """
+    Delete employees and their attendance without loading ORM objects
+
+    Attendance and employees go with one DELETE each (the foreign key
+    cascade covers any attendance written concurrently). With archive,
+    the attendance is first copied into attendance_archive by a single
+    INSERT ... SELECT. Records the change for caches and rollups but does
+    not commit.
+    """
+    requested = list(dict.fromkeys(employee_ids))
+    found = {
+        value for (value,) in db.query(Employee.employee_id).filter(Employee.employee_id.in_(requested))
+    }
+    result = {
+        "requested": len(requested),
+        "deleted": 0,
+        "attendance_deleted": 0,
+        "attendance_archived": 0,
+        "not_found": [value for value in requested if value not in found],
+    }
+    if not found:
+        return result
+
+    # Dates whose rollups change once this attendance is gone
+    attendance_dates = [
+        day for (day,) in db.query(Attendance.date).filter(Attendance.employee_id.in_(found)).distinct()
+    ]
+
+    if archive:
+        result["attendance_archived"] = db.execute(
+            insert(AttendanceArchive).from_select(
+                ["employee_id", "date", "status"],
+                select(Attendance.employee_id, Attendance.date, Attendance.status)
+                .where(Attendance.employee_id.in_(found)),
+            )
+        ).rowcount
+    result["attendance_deleted"] = db.execute(
+        delete(Attendance).where(Attendance.employee_id.in_(found))
+    ).rowcount
+    result["deleted"] = db.execute(
+        delete(Employee).where(Employee.employee_id.in_(found))
+    ).rowcount
+
+    changes.employees_changed(db)
+    changes.attendance_changed(db, attendance_dates)
+    return result
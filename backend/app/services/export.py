@@ -0,0 +1,141 @@
+"""
+Streaming attendance export
+
+Rows are read from a server-side cursor in fixed-size batches and encoded
+batch by batch, so memory use stays flat however many rows are exported.
+"""
+import csv
+import io
+import json
+from typing import Iterator, List
+
+from sqlalchemy import Select
+
+from ..config import settings
+from ..database import ReadSessionLocal
+
+EXPORT_COLUMNS = ("id", "employee_id", "date", "status")
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    """Parquet export needs the optional pyarrow package"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _iter_batches(stmt: Select) -> Iterator[List]:
+    """
+    Yield result rows in batches of EXPORT_BATCH_SIZE
+
+    Uses its own session because the response body is produced after the
+    request's database dependency has been closed.
+    """
+    db = ReadSessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        for batch in result.partitions():
+            yield batch
+    finally:
+        db.close()
+
+
+def _plain(row) -> dict:
+    return {
+        "id": row.id,
+        "employee_id": row.employee_id,
+        "date": row.date.isoformat(),
+        "status": row.status.value,
+    }
+
+
+def _csv_stream(stmt: Select) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in _iter_batches(stmt):
+        writer.writerows(
+            (row.id, row.employee_id, row.date.isoformat(), row.status.value)
+            for row in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _ndjson_stream(stmt: Select) -> Iterator[bytes]:
+    for batch in _iter_batches(stmt):
+        yield "".join(
+            json.dumps(_plain(row), separators=(",", ":")) + "\n"
+            for row in batch
+        ).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the generator"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _parquet_stream(stmt: Select) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("employee_id", pa.string()),
+        ("date", pa.date32()),
+        ("status", pa.string()),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        # One row group per batch keeps only a single batch in memory
+        for batch in _iter_batches(stmt):
+            writer.write_table(pa.Table.from_pydict({
+                "id": [row.id for row in batch],
+                "employee_id": [row.employee_id for row in batch],
+                "date": [row.date for row in batch],
+                "status": [row.status.value for row in batch],
+            }, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(stmt: Select, export_format: str) -> Iterator[bytes]:
+    """Encode the rows selected by stmt in the requested format"""
+    if export_format == "csv":
+        return _csv_stream(stmt)
+    if export_format == "ndjson":
+        return _ndjson_stream(stmt)
+    return _parquet_stream(stmt)
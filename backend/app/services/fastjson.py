@@ -0,0 +1,58 @@
+"""
+Direct JSON encoding of selected rows for list endpoints
+
+With FAST_JSON on (and for any ?fields= projection), list routes select
+plain column tuples and encode them here instead of returning ORM
+objects that FastAPI validates one by one into their response model.
+The output matches what the response model would produce for these
+columns, so the documented schema stays the same. orjson is used when
+installed; otherwise the standard library encoder.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict, Iterable, Optional, Sequence
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+def _default(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        # Pydantic writes UTC as Z
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """Encode content as compact JSON"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def rows_response(
+    rows: Iterable[Sequence],
+    fields: Sequence[str],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """JSON array of objects built from rows whose leading columns are fields"""
+    # zip stops at the last field, dropping trailing keyset-only columns
+    return Response(
+        content=dumps([dict(zip(fields, row)) for row in rows]),
+        media_type="application/json",
+        headers=headers,
+    )
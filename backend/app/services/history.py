@@ -0,0 +1,59 @@
+"""
+Attendance history across the live table and the archive
+
+archive_closed_years moves closed years into attendance_archive; the
+aggregate reads (rollups and the attendance bitsets) still cover them by
+reading this union instead of the live table. Archived rows of deleted
+employees are left out, as their live rows would have been.
+"""
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import func, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery
+
+from ..models.attendance import Attendance, AttendanceArchive
+from ..models.employee import Employee
+
+
+def attendance_history(
+    dates: Optional[Iterable[date]] = None,
+    start_date: Optional[date] = None,
+    end_before: Optional[date] = None,
+) -> Subquery:
+    """
+    (employee_id, date, status) of live and archived attendance
+
+    The filters are applied to each side of the union so both use their
+    date index: dates limits to those days, start_date and end_before to
+    [start_date, end_before).
+    """
+    selects = []
+    for table in (Attendance, AttendanceArchive):
+        query = select(table.employee_id, table.date, table.status)
+        if dates is not None:
+            query = query.where(table.date.in_(list(dates)))
+        if start_date is not None:
+            query = query.where(table.date >= start_date)
+        if end_before is not None:
+            query = query.where(table.date < end_before)
+        if table is AttendanceArchive:
+            query = query.where(table.employee_id.in_(select(Employee.employee_id)))
+        selects.append(query)
+    return union_all(*selects).subquery("attendance_history")
+
+
+def history_bounds(db: Session) -> Tuple[Optional[date], Optional[date]]:
+    """First and last attendance date, live or archived"""
+    # Separate subqueries so each bound is one date index probe; SQLite
+    # scans the table for min() and max() in the same SELECT
+    bounds = db.execute(select(
+        select(func.min(Attendance.date)).scalar_subquery(),
+        select(func.max(Attendance.date)).scalar_subquery(),
+        select(func.min(AttendanceArchive.date)).scalar_subquery(),
+        select(func.max(AttendanceArchive.date)).scalar_subquery(),
+    )).one()
+    firsts = [day for day in bounds[::2] if day is not None]
+    lasts = [day for day in bounds[1::2] if day is not None]
+    return (min(firsts) if firsts else None, max(lasts) if lasts else None)
@@ -0,0 +1,160 @@
+"""
+Streaming request body parsers for bulk endpoints
+
+Records are yielded as they arrive so large NDJSON/CSV uploads are never
+held in memory as a whole.
+"""
+import codecs
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+JSON_CONTENT_TYPES = {"application/json"}
+
+# Request body documentation shared by bulk endpoints (used as openapi_extra)
+BULK_BODY_CONTENT = {
+    "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+    "application/x-ndjson": {"schema": {"type": "string", "description": "One JSON object per line"}},
+    "text/csv": {"schema": {"type": "string", "description": "CSV with a header row"}},
+}
+
+# (row number, record, error message)
+ParsedRecord = Tuple[int, Optional[Dict], Optional[str]]
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    """Decode the request stream incrementally and yield complete lines"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _iter_ndjson(request: Request) -> AsyncIterator[ParsedRecord]:
+    row = 0
+    async for line in _iter_lines(request):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Each line must be a JSON object"
+            continue
+        yield row, record, None
+
+
+class _LineFeed:
+    """Iterator handing buffered lines to a csv.reader"""
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        return self.lines.popleft()
+
+
+async def _iter_csv(request: Request) -> AsyncIterator[ParsedRecord]:
+    """
+    Parse CSV records as their lines arrive
+
+    A quoted field may contain newlines (RFC 4180), so lines are buffered
+    until their quotes balance and only complete records are handed to
+    the reader.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header: Optional[List[str]] = None
+    record_lines: List[str] = []
+    quotes = 0
+    row = 0
+    async for line in _iter_lines(request):
+        if not record_lines and not line.strip():
+            continue
+        record_lines.append(line + "\n")
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        feed.lines.extend(record_lines)
+        record_lines.clear()
+        quotes = 0
+        values = next(reader)
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row, {name: value.strip() for name, value in zip(header, values)}, None
+    if record_lines:
+        yield row + 1, None, "Unterminated quoted field"
+
+
+async def _iter_json(request: Request) -> AsyncIterator[ParsedRecord]:
+    try:
+        payload = json.loads(await request.body())
+    except json.JSONDecodeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid JSON body: {e.msg}"
+        )
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="JSON body must be an array of objects"
+        )
+    for row, record in enumerate(payload, start=1):
+        if not isinstance(record, dict):
+            yield row, None, "Each item must be a JSON object"
+            continue
+        yield row, record, None
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Flatten a pydantic ValidationError into a one-line message for row reports"""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+def iter_records(request: Request) -> AsyncIterator[ParsedRecord]:
+    """
+    Yield (row, record, error) tuples from a JSON, NDJSON or CSV body
+
+    JSON arrays are parsed in one piece; use NDJSON or CSV for uploads that
+    should be streamed.
+    """
+    content_type = request.headers.get("content-type", "application/json")
+    content_type = content_type.split(";")[0].strip().lower()
+
+    if content_type in NDJSON_CONTENT_TYPES:
+        return _iter_ndjson(request)
+    if content_type in CSV_CONTENT_TYPES:
+        return _iter_csv(request)
+    if content_type in JSON_CONTENT_TYPES:
+        return _iter_json(request)
+
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=f"Unsupported content type '{content_type}'. Use application/json, application/x-ndjson or text/csv"
+    )
@@ -0,0 +1,65 @@
+"""
+Keyset pagination and column projection helpers for list endpoints
+
+Cursors are opaque URL-safe tokens holding the sort key of the last row
+on the previous page, so every page is an index range scan regardless
+of how deep the client has paged.
+"""
+import base64
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode sort key values into an opaque cursor token"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, keys: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+    """
+    Decode a cursor token into sort key values
+
+    keys maps each expected key to a converter (e.g. int, date.fromisoformat);
+    malformed or foreign tokens are rejected with 400.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, dict) or set(values) != set(keys):
+            raise ValueError
+        return {key: convert(values[key]) for key, convert in keys.items()}
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """Parse a comma-separated fields parameter into a validated column list"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown) or fields}. Allowed: {', '.join(allowed)}"
+        )
+    return list(dict.fromkeys(requested))
+
+
+def projected_columns(model, fields: List[str], keys: Sequence[str]) -> List:
+    """Columns to select for a projection, including the keyset columns"""
+    return [getattr(model, name) for name in dict.fromkeys([*fields, *keys])]
+
+
+def fetch_page(query, limit: int) -> Tuple[List, bool]:
+    """Fetch one page plus a look-ahead row to know whether more rows exist"""
+    rows = query.limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
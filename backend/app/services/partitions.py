@@ -0,0 +1,264 @@
+"""
+Attendance partition maintenance and the hot/cold archive
+
+With ATTENDANCE_PARTITIONING on PostgreSQL, attendance is range-partitioned
+by month (attendance_YYYY_MM) plus a default partition that catches dates
+no monthly partition covers yet. ensure_partitions keeps partitions ready
+for PARTITION_MONTHS_AHEAD months and moves rows out of the default
+partition into proper monthly ones. Date-range filters on attendance then
+only touch the months they cover.
+
+archive_closed_years moves whole years older than ATTENDANCE_HOT_YEARS
+into attendance_archive on any database; on a partitioned table the old
+monthly partitions are dropped instead of deleted row by row.
+
+Run manually with (from the backend directory):
+    python -m app.services.partitions convert   # partition an existing table
+    python -m app.services.partitions ensure
+    python -m app.services.partitions archive --keep-years 2
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from ..config import settings
+from ..database import SessionLocal, engine as default_engine
+from ..models.attendance import PARTITIONED, Attendance, AttendanceArchive
+# rollups and versions register the commit hooks attendance writes rely on
+from . import changes, rollups, versions  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITION = "attendance_default"
+
+# Arbitrary constant identifying the partition maintenance advisory lock
+_ADVISORY_LOCK_ID = 7_301_002
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"attendance_{month:%Y_%m}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('attendance')"
+    )).first() is not None
+
+
+def _partitions(conn: Connection) -> List[str]:
+    return conn.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'attendance'::regclass
+    """)).scalars().all()
+
+
+def _create_partition(conn: Connection, month: date):
+    """
+    Create the partition for month, moving any of its rows out of the
+    default partition first (attaching would fail while they are there)
+    """
+    name = partition_name(month)
+    bounds = {"start": month, "end": _add_months(month, 1)}
+    conn.execute(text(f"CREATE TABLE {name} (LIKE attendance INCLUDING DEFAULTS)"))
+    conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), bounds)
+    conn.execute(text(
+        f"ALTER TABLE attendance ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    ))
+
+
+def ensure_partitions(engine: Engine = default_engine, months_ahead: Optional[int] = None) -> List[str]:
+    """
+    Create missing monthly partitions; returns the names created
+
+    Covers last month through months_ahead months from now, plus any month
+    with rows sitting in the default partition. No-op unless attendance is
+    partitioned.
+    """
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    if engine.dialect.name != "postgresql":
+        return []
+
+    created = []
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            if PARTITIONED:
+                logger.warning("attendance is not partitioned yet; run `python -m app.services.partitions convert`")
+            return []
+        # Concurrent workers wait here and then find nothing left to do
+        conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF attendance DEFAULT"))
+
+        existing = set(_partitions(conn))
+        this_month = date.today().replace(day=1)
+        months = {_add_months(this_month, offset) for offset in range(-1, months_ahead + 1)}
+        months.update(conn.execute(text(
+            f"SELECT DISTINCT date_trunc('month', date)::date FROM {DEFAULT_PARTITION}"
+        )).scalars())
+
+        for month in sorted(months):
+            if partition_name(month) not in existing:
+                _create_partition(conn, month)
+                created.append(partition_name(month))
+    if created:
+        logger.info("Created attendance partitions %s", ", ".join(created))
+    return created
+
+
+def convert_to_partitioned(engine: Engine = default_engine) -> bool:
+    """
+    Rebuild an existing plain attendance table as a partitioned one
+
+    Runs in a single transaction holding an exclusive lock on attendance,
+    so plan a maintenance window on large tables. Returns False if the
+    table is already partitioned.
+    """
+    if engine.dialect.name != "postgresql" or not PARTITIONED:
+        raise RuntimeError("Partitioning needs PostgreSQL and ATTENDANCE_PARTITIONING=true")
+
+    legacy = "attendance_unpartitioned"
+    with engine.begin() as conn:
+        if is_partitioned(conn):
+            return False
+        conn.execute(text("LOCK TABLE attendance IN ACCESS EXCLUSIVE MODE"))
+        conn.execute(text(f"ALTER TABLE attendance RENAME TO {legacy}"))
+        # Free the index, constraint and sequence names for the new table
+        for (index,) in conn.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = :table"
+        ), {"table": legacy}).all():
+            conn.execute(text(f"ALTER INDEX {index} RENAME TO {index}_old"))
+        conn.execute(text(f"ALTER TABLE {legacy} DROP CONSTRAINT IF EXISTS fk_attendance_employee"))
+        conn.execute(text(f"ALTER SEQUENCE IF EXISTS attendance_id_seq RENAME TO {legacy}_id_seq"))
+
+        Attendance.__table__.create(bind=conn)
+        conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF attendance DEFAULT"))
+        months = conn.execute(text(
+            f"SELECT DISTINCT date_trunc('month', date)::date FROM {legacy}"
+        )).scalars().all()
+        for month in sorted(months):
+            conn.execute(text(
+                f"CREATE TABLE {partition_name(month)} PARTITION OF attendance "
+                f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+            ))
+
+        copied = conn.execute(text(f"""
+            INSERT INTO attendance (id, employee_id, date, status)
+            SELECT id, employee_id, date, status FROM {legacy}
+        """)).rowcount
+        conn.execute(text(
+            "SELECT setval(pg_get_serial_sequence('attendance', 'id'), COALESCE(MAX(id), 0) + 1, false) "
+            "FROM attendance"
+        ))
+        conn.execute(text(f"DROP TABLE {legacy}"))
+    logger.info("Moved %s attendance rows onto %s monthly partitions", copied, len(months))
+    ensure_partitions(engine)
+    return True
+
+
+def archive_closed_years(keep_years: Optional[int] = None) -> int:
+    """
+    Move attendance older than the last keep_years calendar years to the archive
+
+    keep_years counts the current year, so 1 archives everything before
+    January 1st. The rows are copied with one INSERT ... SELECT; the live
+    copies go with whole partitions where attendance is partitioned and a
+    single DELETE otherwise. The move is recorded as an attendance change
+    without logging its dates for the rollups: their rows already count
+    the archived marks, which rollups and bitsets keep reading from the
+    archive. Returns the rows archived.
+    """
+    keep_years = keep_years or settings.ATTENDANCE_HOT_YEARS
+    if keep_years < 1:
+        raise ValueError("keep_years must be at least 1")
+    cutoff = date(date.today().year - keep_years + 1, 1, 1)
+
+    db = SessionLocal()
+    try:
+        conn = db.connection()
+        if db.query(Attendance.id).filter(Attendance.date < cutoff).first() is None:
+            return 0
+
+        archived = db.execute(
+            insert(AttendanceArchive).from_select(
+                ["employee_id", "date", "status"],
+                select(Attendance.employee_id, Attendance.date, Attendance.status)
+                .where(Attendance.date < cutoff),
+            )
+        ).rowcount
+
+        if is_partitioned(conn):
+            cutoff_name = partition_name(cutoff)
+            for name in _partitions(conn):
+                # attendance_YYYY_MM sorts chronologically; the default partition is skipped
+                if name != DEFAULT_PARTITION and name < cutoff_name:
+                    db.execute(text(f"DROP TABLE {name}"))
+        db.execute(delete(Attendance).where(Attendance.date < cutoff))
+
+        changes.attendance_changed(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    logger.info("Archived %s attendance rows dated before %s", archived, cutoff)
+    return archived
+
+
+def _maintain_once():
+    try:
+        ensure_partitions()
+        if settings.ATTENDANCE_HOT_YEARS:
+            archive_closed_years()
+    except Exception:
+        logger.exception("Attendance partition maintenance failed")
+
+
+async def run_maintenance(stop: asyncio.Event):
+    """Create partitions and archive closed years every PARTITION_MAINTENANCE_SECONDS until stop is set"""
+    while not stop.is_set():
+        await run_in_threadpool(_maintain_once)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.PARTITION_MAINTENANCE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Attendance partition and archive maintenance")
+    parser.add_argument("command", choices=["convert", "ensure", "archive"])
+    parser.add_argument("--keep-years", type=int, default=None,
+                        help="Calendar years to keep in the live table (archive)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "convert":
+        print("converted" if convert_to_partitioned() else "already partitioned")
+    elif args.command == "ensure":
+        print(ensure_partitions() or "nothing to create")
+    else:
+        print(f"archived {archive_closed_years(args.keep_years)} rows")
+
+
+if __name__ == "__main__":
+    main()
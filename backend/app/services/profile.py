@@ -0,0 +1,65 @@
+"""
+Employee profile: the employee, recent attendance and stats in one read
+
+Replaces the three requests a client used to make to show an employee
+(details, attendance, stats), each of which looked the employee up
+again. Here the employee comes from the employee directory, the
+attendance window is one keyset-paginated query whose cursor the
+attendance list endpoint also accepts, and the counts come from the
+attendance bitsets (or one grouped query when ATTENDANCE_BITMAPS is
+off), so a warm profile costs two or three statements.
+"""
+from datetime import date
+from typing import Dict, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from ..models.attendance import Attendance
+from .directory import employee_directory
+from .pagination import decode_cursor, encode_cursor, fetch_page
+from .stats import get_employee_stats
+
+STATS_FIELDS = ("total_present", "total_absent", "total_days", "attendance_rate")
+
+
+def employee_profile(
+    db: Session,
+    employee_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Optional[Dict]:
+    """
+    Profile of employee_id, or None when the employee does not exist
+
+    start_date and end_date bound both the attendance window and the
+    stats; cursor continues the window after an earlier page.
+    """
+    employee = employee_directory.get(db, employee_id)
+    if employee is None:
+        return None
+
+    query = db.query(Attendance.id, Attendance.employee_id, Attendance.date, Attendance.status).filter(
+        Attendance.employee_id == employee_id
+    )
+    if start_date:
+        query = query.filter(Attendance.date >= start_date)
+    if end_date:
+        query = query.filter(Attendance.date <= end_date)
+    if cursor:
+        after = decode_cursor(cursor, {"date": date.fromisoformat, "id": int})
+        query = query.filter(or_(
+            Attendance.date < after["date"],
+            and_(Attendance.date == after["date"], Attendance.id < after["id"]),
+        ))
+    records, has_more = fetch_page(query.order_by(Attendance.date.desc(), Attendance.id.desc()), limit)
+
+    stats = get_employee_stats(db, employee_id, start_date=start_date, end_date=end_date) or {}
+    return {
+        "employee": employee,
+        "attendance": [record._asdict() for record in records],
+        "next_cursor": encode_cursor({"date": records[-1].date, "id": records[-1].id}) if has_more else None,
+        "stats": {field: stats.get(field, 0) for field in STATS_FIELDS},
+    }
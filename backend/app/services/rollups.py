@@ -0,0 +1,269 @@
+"""
+Attendance rollup maintenance and queries
+
+Write transactions log the attendance dates they touch; a background task
+started in the application lifespan re-aggregates only those dates (and
+their months) into the rollup tables. Report endpoints read the rollups,
+so their cost depends on the report range, not on the size of history.
+Aggregation reads live and archived attendance alike, so years moved to
+the archive stay in the reports.
+"""
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, delete, func, insert, literal, select, text
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.attendance import AttendanceStatus
+from ..models.employee import Employee
+from ..models.rollup import (
+    AttendanceDailyRollup,
+    AttendanceMonthlyRollup,
+    AttendanceRollupChange,
+    RollupState,
+)
+from . import changes
+from .history import attendance_history, history_bounds
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "attendance"
+
+# Arbitrary constant identifying the refresher's PostgreSQL advisory lock
+_ADVISORY_LOCK_ID = 7_301_001
+
+# Bound IN lists when re-aggregating many dates or clearing many change rows at once
+_DATES_PER_STATEMENT = 500
+
+
+def _log_changed_dates(db: Session, dates: Set[date]):
+    db.execute(insert(AttendanceRollupChange), [{"date": day} for day in dates])
+
+
+changes.on_attendance_dates(_log_changed_dates)
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _present(status):
+    return func.sum(case((status == AttendanceStatus.PRESENT, 1), else_=0))
+
+
+def _absent(status):
+    return func.sum(case((status == AttendanceStatus.ABSENT, 1), else_=0))
+
+
+def _rebuild_daily(db: Session, dates: Optional[List[date]]):
+    """Re-aggregate daily × department rows for dates (all dates when None)"""
+    batches = [None] if dates is None else [
+        dates[i:i + _DATES_PER_STATEMENT] for i in range(0, len(dates), _DATES_PER_STATEMENT)
+    ]
+    for batch in batches:
+        rows = attendance_history(dates=batch)
+        source = select(
+            rows.c.date, Employee.department, _present(rows.c.status), _absent(rows.c.status)
+        ).join(Employee, Employee.employee_id == rows.c.employee_id)
+        purge = delete(AttendanceDailyRollup)
+        if batch is not None:
+            purge = purge.where(AttendanceDailyRollup.date.in_(batch))
+        db.execute(purge)
+        db.execute(insert(AttendanceDailyRollup).from_select(
+            ["date", "department", "total_present", "total_absent"],
+            source.group_by(rows.c.date, Employee.department),
+        ))
+
+
+def _rebuild_monthly(db: Session, months: Iterable[date]):
+    """Re-aggregate employee × month rows for the given months"""
+    for month in sorted(months):
+        rows = attendance_history(start_date=month, end_before=_next_month(month))
+        db.execute(delete(AttendanceMonthlyRollup).where(AttendanceMonthlyRollup.month == month))
+        db.execute(insert(AttendanceMonthlyRollup).from_select(
+            ["employee_id", "month", "total_present", "total_absent"],
+            select(
+                rows.c.employee_id,
+                literal(month, AttendanceMonthlyRollup.month.type),
+                _present(rows.c.status),
+                _absent(rows.c.status),
+            ).group_by(rows.c.employee_id),
+        ))
+
+
+def _all_months(db: Session) -> Set[date]:
+    first, last = history_bounds(db)
+    months = set()
+    if first is None:
+        return months
+    month = _month_start(first)
+    while month <= last:
+        months.add(month)
+        month = _next_month(month)
+    return months
+
+
+def refresh_rollups(db: Session, full: bool = False) -> int:
+    """
+    Bring the rollup tables up to date and commit
+
+    Rebuilds everything on the first run (or when full is set), otherwise
+    only the dates logged since the last refresh. Returns the number of
+    dates re-aggregated (-1 for a full rebuild).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Only one worker refreshes at a time; the others skip this round
+        if not db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": _ADVISORY_LOCK_ID}).scalar():
+            db.rollback()
+            return 0
+
+    state = db.get(RollupState, STATE_NAME)
+    # Only the change rows read here are deleted below. Deleting by id range
+    # instead could drop rows committed later under a lower id (ids are
+    # handed out before commit), whose dates this refresh never saw.
+    logged = db.query(AttendanceRollupChange.id, AttendanceRollupChange.date).all()
+
+    if full or state is None:
+        db.query(AttendanceMonthlyRollup).delete()
+        _rebuild_daily(db, None)
+        _rebuild_monthly(db, _all_months(db))
+        refreshed = -1
+    elif not logged:
+        db.rollback()
+        return 0
+    else:
+        dates = sorted({day for _, day in logged})
+        _rebuild_daily(db, dates)
+        _rebuild_monthly(db, {_month_start(day) for day in dates})
+        refreshed = len(dates)
+
+    ids = [change_id for change_id, _ in logged]
+    for i in range(0, len(ids), _DATES_PER_STATEMENT):
+        db.execute(delete(AttendanceRollupChange).where(
+            AttendanceRollupChange.id.in_(ids[i:i + _DATES_PER_STATEMENT])
+        ))
+    if state is None:
+        db.add(RollupState(name=STATE_NAME, refreshed_at=datetime.utcnow()))
+    else:
+        state.refreshed_at = datetime.utcnow()
+    changes.rollups_changed(db)
+    db.commit()
+    return refreshed
+
+
+def _refresh_once():
+    db = SessionLocal()
+    try:
+        refreshed = refresh_rollups(db)
+        if refreshed:
+            logger.info("Refreshed attendance rollups (%s dates)", "all" if refreshed < 0 else refreshed)
+    except Exception:
+        db.rollback()
+        logger.exception("Attendance rollup refresh failed")
+    finally:
+        db.close()
+
+
+async def run_refresher(stop: asyncio.Event):
+    """Refresh rollups every ROLLUP_REFRESH_SECONDS until stop is set"""
+    while not stop.is_set():
+        await run_in_threadpool(_refresh_once)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.ROLLUP_REFRESH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def refreshed_at(db: Session) -> Optional[datetime]:
+    state = db.get(RollupState, STATE_NAME)
+    return state.refreshed_at if state else None
+
+
+def _rate(present: int, absent: int) -> float:
+    total = present + absent
+    return round(present / total * 100, 2) if total > 0 else 0
+
+
+def _counts(present, absent) -> Dict:
+    present, absent = int(present or 0), int(absent or 0)
+    return {
+        "total_present": present,
+        "total_absent": absent,
+        "total_days": present + absent,
+        "attendance_rate": _rate(present, absent),
+    }
+
+
+def daily_stats(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    department: Optional[str] = None,
+) -> List[Dict]:
+    """Per-day attendance (summed over departments unless one is given)"""
+    query = db.query(
+        AttendanceDailyRollup.date,
+        func.sum(AttendanceDailyRollup.total_present),
+        func.sum(AttendanceDailyRollup.total_absent),
+    )
+    if start_date:
+        query = query.filter(AttendanceDailyRollup.date >= start_date)
+    if end_date:
+        query = query.filter(AttendanceDailyRollup.date <= end_date)
+    if department:
+        query = query.filter(AttendanceDailyRollup.department == department)
+    rows = query.group_by(AttendanceDailyRollup.date).order_by(AttendanceDailyRollup.date).all()
+    return [{"date": day, **_counts(present, absent)} for day, present, absent in rows]
+
+
+def department_stats(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> List[Dict]:
+    """Attendance per department over a date range"""
+    query = db.query(
+        AttendanceDailyRollup.department,
+        func.sum(AttendanceDailyRollup.total_present),
+        func.sum(AttendanceDailyRollup.total_absent),
+    )
+    if start_date:
+        query = query.filter(AttendanceDailyRollup.date >= start_date)
+    if end_date:
+        query = query.filter(AttendanceDailyRollup.date <= end_date)
+    rows = query.group_by(AttendanceDailyRollup.department).order_by(AttendanceDailyRollup.department).all()
+    return [{"department": department, **_counts(present, absent)} for department, present, absent in rows]
+
+
+def monthly_stats(
+    db: Session,
+    employee_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> List[Dict]:
+    """Attendance per employee and month for months overlapping the range"""
+    query = db.query(AttendanceMonthlyRollup)
+    if employee_id:
+        query = query.filter(AttendanceMonthlyRollup.employee_id == employee_id)
+    if start_date:
+        query = query.filter(AttendanceMonthlyRollup.month >= _month_start(start_date))
+    if end_date:
+        query = query.filter(AttendanceMonthlyRollup.month <= end_date)
+    rows = query.order_by(AttendanceMonthlyRollup.month, AttendanceMonthlyRollup.employee_id).all()
+    return [
+        {
+            "employee_id": row.employee_id,
+            "month": row.month.strftime("%Y-%m"),
+            **_counts(row.total_present, row.total_absent),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,87 @@
+"""
+Employee search backed by the database's text index
+
+PostgreSQL matches with pg_trgm (substring ILIKE plus word similarity on
+names for typos); SQLite matches words and a trailing prefix through the
+FTS5 table maintained by migrations.upgrade_employee_search. Anything
+else, or a SQLite build without FTS5, falls back to a LIKE scan.
+"""
+import re
+from typing import Dict, Tuple
+
+from sqlalchemy import column, false, func, or_, table, text
+from sqlalchemy.orm import Query, Session
+
+from ..migrations import EMPLOYEE_FTS_TABLE
+from ..models.employee import Employee
+
+SEARCH_COLUMNS = (Employee.full_name, Employee.email, Employee.employee_id)
+
+employees_fts = table(EMPLOYEE_FTS_TABLE, column("rowid"))
+
+# Whether the FTS table exists, per SQLite engine
+_fts_available: Dict[int, bool] = {}
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _has_fts(db: Session) -> bool:
+    key = id(db.get_bind())
+    if key not in _fts_available:
+        _fts_available[key] = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": EMPLOYEE_FTS_TABLE},
+        ).first() is not None
+    return _fts_available[key]
+
+
+def fts_match_expression(q: str) -> str:
+    """
+    Turn typed text into an FTS5 query
+
+    Every complete word must match and the last, possibly half-typed, word
+    matches as a prefix. Expanding only one prefix keeps the lookup cheap
+    even when many distinct terms share the leading words.
+    """
+    tokens = re.findall(r"\w+", q)
+    if not tokens:
+        return ""
+    return " ".join([*(f'"{token}"' for token in tokens[:-1]), f'"{tokens[-1]}"*'])
+
+
+def search_query(db: Session, q: str) -> Tuple[Query, object]:
+    """
+    Employees matching q by name, email or employee ID
+
+    Returns the query and the column to order and paginate by, which is
+    equivalent to Employee.id. On SQLite it is the FTS rowid so matches
+    stream from the index in order and a page stops after limit rows.
+    """
+    q = q.strip()
+    query = db.query(Employee)
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        pattern = _like_pattern(q)
+        return query.filter(or_(
+            *(col.ilike(pattern, escape="\\") for col in SEARCH_COLUMNS),
+            # q <% full_name: q is similar to some word of the name
+            Employee.full_name.op("%>")(q),
+        )), Employee.id
+
+    if dialect == "sqlite" and _has_fts(db):
+        match = fts_match_expression(q)
+        if not match:
+            return query.filter(false()), Employee.id
+        query = query.join(employees_fts, employees_fts.c.rowid == Employee.id).filter(
+            text(f"{EMPLOYEE_FTS_TABLE} MATCH :match").bindparams(match=match)
+        )
+        return query, employees_fts.c.rowid
+
+    pattern = _like_pattern(q.lower())
+    return query.filter(or_(
+        *(func.lower(col).like(pattern, escape="\\") for col in SEARCH_COLUMNS)
+    )), Employee.id
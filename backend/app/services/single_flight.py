@@ -0,0 +1,154 @@
+"""
+Single-flight coalescing for expensive read endpoints
+
+Decorating a route handler with single_flight() makes concurrent
+identical requests share one computation: the first runs the handler
+(in the threadpool when it is synchronous) and the rest await its
+result. Requests are identical when they hit the same handler with the
+same parsed parameters (so parameter order and spelling, e.g. of dates,
+do not matter) and were given the same ETag by conditional_get, which
+means they saw the same table versions; a request that saw a newer
+version starts a computation of its own. The shared computation gets a
+Session of its own (from ReadSessionLocal) in place of the handler's
+Session parameters: the first caller's Session is closed by its
+dependency teardown when that caller goes away, while the computation
+carries on for the others. Callers close their own Session (used by
+conditional_get) before waiting, so a burst does not hold one pooled
+connection per waiting request.
+
+With a stale window (SINGLE_FLIGHT_STALE_SECONDS, or stale_seconds per
+route), requests arriving while a computation is in flight are answered
+at once with the previous result if it finished within the window,
+rather than waiting for the new one. Such a response carries no ETag
+when the previous result was computed for other table versions, so
+clients never cache it as current.
+
+    @router.get("/stats", dependencies=[conditional_get(changes.ATTENDANCE)])
+    @single_flight()
+    def get_stats(department: Optional[str] = None, db: Session = Depends(get_read_db)):
+        ...
+"""
+import asyncio
+import functools
+import inspect
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import ReadSessionLocal
+
+# Name of the Response parameter added to handlers that do not take one
+_RESPONSE_PARAM = "single_flight_response"
+
+# Parameter sets whose latest result is kept per handler for the stale window
+_MAX_LATEST = 256
+
+
+class Flights:
+    """In-flight computations and latest results of one handler, with counters"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.running: Dict[Tuple, asyncio.Task] = {}
+        # Latest completed result per parameter set: (finished_at, etag, value)
+        self.latest: Dict[str, Tuple[float, Optional[str], Any]] = {}
+        self.computed = 0
+        self.shared = 0
+        self.stale = 0
+        FLIGHTS[name] = self
+
+    def metrics(self) -> Dict[str, int]:
+        return {"computed": self.computed, "shared": self.shared, "stale": self.stale}
+
+
+FLIGHTS: Dict[str, Flights] = {}
+
+
+def single_flight_metrics() -> Dict[str, Dict[str, int]]:
+    """Counters for every coalesced handler in this process"""
+    return {name: flights.metrics() for name, flights in FLIGHTS.items()}
+
+
+def single_flight(stale_seconds: Optional[float] = None) -> Callable:
+    """
+    Decorator coalescing concurrent identical calls of a route handler
+
+    Apply it below the route decorator. stale_seconds overrides
+    SINGLE_FLIGHT_STALE_SECONDS for this handler.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        parameters = list(signature.parameters.values())
+        # Injected objects are not part of what makes two requests identical
+        injected = {p.name for p in parameters if p.annotation in (Session, Request, Response)}
+        sessions = [p.name for p in parameters if p.annotation is Session]
+        response_param = next((p.name for p in parameters if p.annotation is Response), None)
+        if response_param is None:
+            response_param = _RESPONSE_PARAM
+            parameters.append(inspect.Parameter(
+                _RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response,
+            ))
+        flights = Flights(f"{func.__module__}.{func.__qualname__}")
+        is_async = asyncio.iscoroutinefunction(func)
+
+        def compute_sync(kwargs: Dict[str, Any]) -> Any:
+            with ReadSessionLocal() as db:
+                return func(**kwargs, **{name: db for name in sessions})
+
+        async def compute_async(kwargs: Dict[str, Any]) -> Any:
+            with ReadSessionLocal() as db:
+                return await func(**kwargs, **{name: db for name in sessions})
+
+        def finish(params: str, key: Tuple, etag: Optional[str], task: asyncio.Task):
+            flights.running.pop(key, None)
+            if not task.cancelled() and task.exception() is None:
+                flights.latest.pop(params, None)
+                flights.latest[params] = (time.monotonic(), etag, task.result())
+                if len(flights.latest) > _MAX_LATEST:
+                    del flights.latest[next(iter(flights.latest))]
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            response: Response = kwargs[response_param]
+            if response_param == _RESPONSE_PARAM:
+                del kwargs[_RESPONSE_PARAM]
+            if not settings.SINGLE_FLIGHT:
+                return await func(**kwargs) if is_async else await run_in_threadpool(func, **kwargs)
+
+            # The computation uses a Session of its own, so hand the caller's
+            # connection back now rather than hold it while waiting; inline, as
+            # a threadpool hop could queue behind computations needing it
+            for name in sessions:
+                kwargs[name].close()
+            params = repr(sorted((name, value) for name, value in kwargs.items() if name not in injected))
+            etag = response.headers.get("etag")
+            key = (params, etag)
+            task = flights.running.get(key)
+            if task is None:
+                flights.computed += 1
+                shared = {name: value for name, value in kwargs.items() if name not in sessions}
+                task = asyncio.ensure_future(
+                    compute_async(shared) if is_async else run_in_threadpool(compute_sync, shared)
+                )
+                flights.running[key] = task
+                task.add_done_callback(functools.partial(finish, params, key, etag))
+            else:
+                window = settings.SINGLE_FLIGHT_STALE_SECONDS if stale_seconds is None else stale_seconds
+                latest = flights.latest.get(params)
+                if window and latest and time.monotonic() - latest[0] <= window:
+                    flights.stale += 1
+                    if etag is not None and latest[1] != etag:
+                        del response.headers["etag"]
+                    return latest[2]
+                flights.shared += 1
+            # Shielded so one caller disconnecting does not cancel the others' result
+            return await asyncio.shield(task)
+
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+
+    return decorator
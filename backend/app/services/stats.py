@@ -0,0 +1,183 @@
+"""
+Attendance statistics engine
+
+Computes present/absent/total counts and the attendance rate for many
+employees with a single grouped query instead of one COUNT per employee,
+or, with ATTENDANCE_BITMAPS, from the in-memory attendance bitsets.
+"""
+from datetime import date
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.attendance import Attendance, AttendanceStatus
+from ..models.employee import Employee
+from .bitmaps import attendance_bitmaps
+from .directory import employee_directory
+
+
+def _status_count(value: AttendanceStatus):
+    """Conditional aggregate counting attendance rows with the given status"""
+    return func.coalesce(
+        func.sum(case((Attendance.status == value, 1), else_=0)),
+        0,
+    )
+
+
+def attendance_stats_query(
+    db: Session,
+    employee_id: Optional[str] = None,
+    department: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    Build the grouped stats query joined to Employee
+
+    Date filters are part of the join condition so employees without
+    attendance in the range are still returned with zero counts.
+    """
+    join_condition = [Attendance.employee_id == Employee.employee_id]
+    if start_date:
+        join_condition.append(Attendance.date >= start_date)
+    if end_date:
+        join_condition.append(Attendance.date <= end_date)
+
+    query = db.query(
+        Employee.employee_id,
+        Employee.full_name,
+        Employee.department,
+        Employee.email,
+        _status_count(AttendanceStatus.PRESENT).label("total_present"),
+        _status_count(AttendanceStatus.ABSENT).label("total_absent"),
+    ).outerjoin(Attendance, and_(*join_condition))
+
+    if employee_id:
+        query = query.filter(Employee.employee_id == employee_id)
+    if department:
+        query = query.filter(Employee.department == department)
+
+    return query.group_by(
+        Employee.id,
+        Employee.employee_id,
+        Employee.full_name,
+        Employee.department,
+        Employee.email,
+    ).order_by(Employee.id)
+
+
+def _query_rows(db: Session, **filters) -> List:
+    return attendance_stats_query(db, **filters).all()
+
+
+def bitmap_stats_rows(
+    db: Session,
+    employee_id: Optional[str] = None,
+    department: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> List[SimpleNamespace]:
+    """Rows shaped like attendance_stats_query's, counted with bitset popcounts"""
+    if employee_id and not department:
+        # A single employee comes from the directory, usually without a query
+        entry = employee_directory.get(db, employee_id)
+        employees = [SimpleNamespace(**entry)] if entry else []
+    else:
+        query = db.query(
+            Employee.employee_id,
+            Employee.full_name,
+            Employee.department,
+            Employee.email,
+        )
+        if employee_id:
+            query = query.filter(Employee.employee_id == employee_id)
+        if department:
+            query = query.filter(Employee.department == department)
+        employees = query.order_by(Employee.id).all()
+    if not employees:
+        return []
+
+    counts = attendance_bitmaps.counts(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        employee_ids=[employee.employee_id for employee in employees] if employee_id or department else None,
+    )
+    rows = []
+    for employee in employees:
+        present, absent = counts.get(employee.employee_id, (0, 0))
+        rows.append(SimpleNamespace(
+            employee_id=employee.employee_id,
+            full_name=employee.full_name,
+            department=employee.department,
+            email=employee.email,
+            total_present=present,
+            total_absent=absent,
+        ))
+    return rows
+
+
+def format_stats(row, include_email: bool = False) -> Dict:
+    """Convert a stats row into the API response dictionary"""
+    total_present = int(row.total_present)
+    total_absent = int(row.total_absent)
+    total_days = total_present + total_absent
+    attendance_rate = (total_present / total_days * 100) if total_days > 0 else 0
+
+    stats = {
+        "employee_id": row.employee_id,
+        "full_name": row.full_name,
+        "department": row.department,
+    }
+    if include_email:
+        stats["email"] = row.email
+    stats.update({
+        "total_present": total_present,
+        "total_absent": total_absent,
+        "total_days": total_days,
+        "attendance_rate": round(attendance_rate, 2),
+    })
+    return stats
+
+
+def get_attendance_stats(
+    db: Session,
+    department: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> List[Dict]:
+    """Attendance statistics for all employees, optionally filtered"""
+    stats_rows = bitmap_stats_rows if settings.ATTENDANCE_BITMAPS else _query_rows
+    rows = stats_rows(
+        db,
+        department=department,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return [format_stats(row) for row in rows]
+
+
+def get_employee_stats(
+    db: Session,
+    employee_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Optional[Dict]:
+    """
+    Attendance statistics for a single employee
+
+    Returns None when the employee does not exist.
+    """
+    stats_rows = bitmap_stats_rows if settings.ATTENDANCE_BITMAPS else _query_rows
+    rows = stats_rows(
+        db,
+        employee_id=employee_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    if not rows:
+        return None
+    return format_stats(rows[0], include_email=True)
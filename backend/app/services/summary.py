@@ -0,0 +1,67 @@
+"""
+Dashboard summary over the attendance rollups, with a cache
+
+The attendance totals are sums over the daily rollup table rather than
+counts over attendance, so they follow the rollup refresher (every
+ROLLUP_REFRESH_SECONDS) like the other rollup reports, archived years
+included. Attendance writes therefore do not invalidate the cached
+summary; a rollup refresh or an employee write does. During a burst of
+clock-ins the summary is recomputed at most once per refresh instead of
+after every mark.
+"""
+from typing import Dict
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.employee import Employee
+from ..models.rollup import AttendanceDailyRollup
+from . import changes
+from .cache import Cache
+
+# Tables the summary is derived from, for its ETag
+SOURCES = (changes.EMPLOYEES, changes.ROLLUPS)
+
+summary_cache = Cache("dashboard_summary", ttl=settings.SUMMARY_CACHE_TTL_SECONDS)
+
+for _table in SOURCES:
+    changes.subscribe(_table, summary_cache.invalidate)
+
+
+def compute_dashboard_summary(db: Session) -> Dict:
+    """Employee counts from the employees table, attendance totals from the daily rollups"""
+    total_employees = db.query(Employee).count()
+    total_present, total_absent = db.query(
+        func.coalesce(func.sum(AttendanceDailyRollup.total_present), 0),
+        func.coalesce(func.sum(AttendanceDailyRollup.total_absent), 0),
+    ).one()
+    total_attendance_records = total_present + total_absent
+
+    # Department-wise employee count
+    dept_counts = db.query(
+        Employee.department,
+        func.count(Employee.id).label('count')
+    ).group_by(Employee.department).all()
+
+    department_breakdown = [
+        {"department": dept, "count": count}
+        for dept, count in dept_counts
+    ]
+
+    # Calculate overall attendance rate
+    overall_attendance_rate = (total_present / total_attendance_records * 100) if total_attendance_records > 0 else 0
+
+    return {
+        "total_employees": total_employees,
+        "total_attendance_records": total_attendance_records,
+        "total_present": total_present,
+        "total_absent": total_absent,
+        "overall_attendance_rate": round(overall_attendance_rate, 2),
+        "department_breakdown": department_breakdown
+    }
+
+
+def get_dashboard_summary(db: Session) -> Dict:
+    """Dashboard summary, served from cache until the next employee write, rollup refresh or TTL expiry"""
+    return summary_cache.get_or_set("summary", lambda: compute_dashboard_summary(db))
@@ -0,0 +1,83 @@
+"""
+Dialect-aware set-based upsert
+
+Uses native INSERT ... ON CONFLICT on PostgreSQL and SQLite, and falls
+back to an UPDATE/INSERT pair for other databases.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, bindparam, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+
+def _dialect_insert(dialect_name: str):
+    """Return the dialect-specific insert() that supports ON CONFLICT"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert
+    return None
+
+
+def upsert_rows(
+    db: Session,
+    model,
+    rows: List[Dict],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+    existing_keys: Optional[Iterable[tuple]] = None,
+):
+    """
+    Insert rows, updating update_columns when conflict_columns already exist
+
+    Rows must not contain duplicate conflict keys. With an empty
+    update_columns, conflicting rows are skipped. existing_keys is only
+    used by the generic fallback, which cannot detect conflicts itself;
+    when omitted it is looked up with one query.
+    """
+    if not rows:
+        return
+
+    table = model.__table__
+    dialect_insert = _dialect_insert(db.get_bind().dialect.name)
+
+    if dialect_insert is not None:
+        stmt = dialect_insert(table)
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={column: stmt.excluded[column] for column in update_columns},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        db.execute(stmt, rows)
+        return
+
+    key_of = lambda row: tuple(row[column] for column in conflict_columns)  # noqa: E731
+    if existing_keys is None:
+        existing_keys = db.execute(
+            select(*[table.c[column] for column in conflict_columns]).where(or_(*[
+                and_(*[table.c[column] == value for column, value in zip(conflict_columns, key_of(row))])
+                for row in rows
+            ]))
+        ).all()
+    existing = {tuple(key) for key in existing_keys}
+    new_rows = [row for row in rows if key_of(row) not in existing]
+    changed_rows = [row for row in rows if key_of(row) in existing]
+
+    if new_rows:
+        db.execute(insert(table), new_rows)
+    if changed_rows and update_columns:
+        stmt = update(table).where(and_(*[
+            table.c[column] == bindparam(f"key_{column}")
+            for column in conflict_columns
+        ])).values({column: bindparam(f"new_{column}") for column in update_columns})
+        db.execute(stmt, [
+            {
+                **{f"key_{column}": row[column] for column in conflict_columns},
+                **{f"new_{column}": row[column] for column in update_columns},
+            }
+            for row in changed_rows
+        ])
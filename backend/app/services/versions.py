@@ -0,0 +1,203 @@
+"""
+Table version counters and conditional GET
+
+Every transaction that writes to a tracked table bumps its row in
+table_versions (see services/changes.py), so the counters move whenever
+committed data does, whichever worker wrote.
+
+On PostgreSQL the bump runs right after the write commits, in a short
+transaction of its own with synchronous_commit off, rather than inside
+the write (on the same connection, so no second one is checked out): a
+bump inside would hold the counter row's lock until the write's commit
+was flushed to disk, queueing every writer of the table in every worker
+behind one another. The counter row is locked only for the UPDATE
+itself. A version can therefore trail its data by the
+moment between the two commits, which is harmless for ETags (they are
+only ever older than the data they go out with). If the process dies in
+that moment, the version moves with the next write to the table, and
+other workers' derived data expires with its TTL. Other databases bump
+inside the write transaction; SQLite serializes writers anyway, and a
+second commit would cost a second fsync. Either way there is one bump
+per transaction, so the bulk endpoints and the attendance write buffer
+pay for one per chunk or flush, not per mark.
+Read endpoints declare the tables they depend on with conditional_get;
+the ETag is a hash of those versions and the request URL, and a request
+whose If-None-Match already holds it is answered 304 before the handler
+runs any of its own queries.
+
+Reading the counters also tells a worker when another worker has
+written, in which case its in-process derived data (summary cache,
+attendance bitsets) is invalidated before the response is built, so a
+fresh ETag never goes out with stale content.
+"""
+import hashlib
+import logging
+import threading
+from datetime import date
+from typing import Dict, Iterable, Set
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import event, insert, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..database import get_read_db
+from ..models.table_version import TableVersion
+from . import changes
+from .upsert import upsert_rows
+
+logger = logging.getLogger(__name__)
+
+TRACKED_TABLES = (changes.EMPLOYEES, changes.ATTENDANCE, changes.ROLLUPS)
+
+_BUMPED_KEY = "bumped_versions"
+_DEFERRED_KEY = "deferred_version_bumps"
+
+# Latest version of each table this process's derived data reflects
+_seen: Dict[str, int] = {}
+_seen_lock = threading.Lock()
+
+
+def seed_versions(engine: Engine):
+    """Create the missing counter rows, so bumps are always plain UPDATEs"""
+    with Session(engine) as db:
+        upsert_rows(
+            db,
+            TableVersion,
+            [{"name": table, "version": 0} for table in TRACKED_TABLES],
+            conflict_columns=("name",),
+            update_columns=(),
+        )
+        db.commit()
+
+
+def _increment(conn, tables: Set[str]) -> Dict[str, int]:
+    """Increment the version of each table on conn; the new versions"""
+    bumped = {}
+    # A fixed order keeps concurrent writers from deadlocking on the rows
+    for table in sorted(tables):
+        version = conn.execute(
+            update(TableVersion)
+            .where(TableVersion.name == table)
+            .values(version=TableVersion.version + 1)
+            .returning(TableVersion.version)
+        ).scalar()
+        if version is None:
+            version = 1
+            conn.execute(insert(TableVersion).values(name=table, version=version))
+        bumped[table] = version
+    return bumped
+
+
+def _bump(db: Session, tables: Set[str]):
+    """Bump the changed tables in the committing transaction, or after it on PostgreSQL"""
+    if db.get_bind().dialect.name == "postgresql":
+        # The session's own connection, reused once the write has committed
+        db.info[_DEFERRED_KEY] = (db.connection(), set(tables))
+    else:
+        db.info[_BUMPED_KEY] = _increment(db, tables)
+
+
+def _bump_after_commit(conn: Connection, tables: Set[str]) -> Dict[str, int]:
+    """Bump tables in a transaction of their own on conn, whose write just committed"""
+    try:
+        # Only the counters are written here; losing them in a crash is covered above
+        conn.execute(text("SET LOCAL synchronous_commit TO OFF"))
+        bumped = _increment(conn, tables)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return bumped
+
+
+def _observe(table: str, version: int, own_write: bool):
+    """
+    Record that this process is at version of table
+
+    Skipping a version means another worker committed a change this
+    process never heard about, so local subscribers are run to drop
+    whatever they derived from the old data.
+    """
+    with _seen_lock:
+        seen = _seen.get(table, 0)
+        if version <= seen:
+            return
+        _seen[table] = version
+        stale = version > seen + 1 if own_write else True
+    if stale:
+        changes.notify(table)
+
+
+changes.on_commit(_bump)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(db: Session):
+    bumped = db.info.pop(_BUMPED_KEY, {})
+    deferred = db.info.pop(_DEFERRED_KEY, None)
+    if deferred:
+        conn, tables = deferred
+        try:
+            bumped = _bump_after_commit(conn, tables)
+        except Exception:
+            # The write itself is committed; the next write moves the version
+            logger.exception("Bumping table versions %s failed", sorted(tables))
+    for table, version in bumped.items():
+        _observe(table, version, own_write=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_bumped(db: Session):
+    db.info.pop(_BUMPED_KEY, None)
+    db.info.pop(_DEFERRED_KEY, None)
+
+
+def current_versions(db: Session, tables: Iterable[str]) -> Dict[str, int]:
+    """Committed version of each table (0 if never written), syncing local caches"""
+    tables = sorted(tables)
+    versions = dict.fromkeys(tables, 0)
+    versions.update(db.execute(
+        select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(tables))
+    ).all())
+    for table, version in versions.items():
+        _observe(table, version, own_write=False)
+    return versions
+
+
+def make_etag(request: Request, versions: Dict[str, int]) -> str:
+    """Strong ETag for this URL at these table versions"""
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    state = ",".join(f"{table}:{version}" for table, version in sorted(versions.items()))
+    # Today's date is part of the key because some defaults (e.g. end_date) follow it
+    key = f"{request.url.path}?{query}|{state}|{date.today()}"
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison as RFC 9110 prescribes for If-None-Match"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_get(*tables: str):
+    """
+    Route dependency adding an ETag to the response, or answering 304
+
+    The version lookup runs on the request's read session before the
+    handler's queries, so the ETag can only be older than the data it is
+    sent with, never newer.
+    """
+    def check(request: Request, response: Response, db: Session = Depends(get_read_db)):
+        etag = make_etag(request, current_versions(db, tables))
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return Depends(check)
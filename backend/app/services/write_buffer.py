@@ -0,0 +1,180 @@
+"""
+Group commit for single attendance marks
+
+With ATTENDANCE_WRITE_BUFFER on, POST /api/attendance enqueues validated
+marks instead of committing each one. A background task collects up to
+WRITE_BUFFER_MAX_BATCH marks, or whatever arrived within
+WRITE_BUFFER_FLUSH_MS of the first one, and writes them with the bulk
+upsert in a single transaction, so one commit (one fsync) covers the
+whole group. Callers either wait for their mark's batch to commit or
+get 202 Accepted straight away.
+
+The queue is bounded: when it is full, submit waits up to
+WRITE_BUFFER_ENQUEUE_TIMEOUT_SECONDS for room and then fails with 503,
+pushing back on clients instead of growing memory. On shutdown the
+task stops accepting marks and writes everything still queued.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.attendance import Attendance
+from ..schemas.attendance import AttendanceCreate
+from . import changes
+from .attendance_bulk import attendance_for_keys, upsert_attendance_batch
+
+logger = logging.getLogger(__name__)
+
+# A queued mark and the future its caller may await
+Item = Tuple[AttendanceCreate, asyncio.Future]
+
+# How often an idle flusher checks for shutdown
+_IDLE_POLL_SECONDS = 0.5
+
+
+def write_batch(marks: List[AttendanceCreate]) -> List[Dict]:
+    """
+    Upsert marks in one transaction; one result per mark
+
+    Successful results carry the saved record. Failed ones carry the
+    HTTP status the caller should see: 404 for unknown employees, 500
+    when the transaction failed.
+    """
+    db = SessionLocal()
+    try:
+        results = upsert_attendance_batch(db, list(enumerate(marks)))
+        written = [mark for mark, result in zip(marks, results) if result["result"] != "error"]
+        changes.attendance_changed(
+            db,
+            {mark.date for mark in written},
+            marks=[(mark.employee_id, mark.date, mark.status) for mark in written],
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        db.close()
+        logger.exception("Attendance write buffer flush of %s marks failed", len(marks))
+        return [
+            {"result": "error", "status_code": 500, "detail": f"Failed to save attendance: {str(e)}"}
+            for _ in marks
+        ]
+
+    try:
+        saved = {
+            (record.employee_id, record.date): record
+            for record in attendance_for_keys(
+                db,
+                (Attendance.id, Attendance.employee_id, Attendance.date, Attendance.status),
+                {(mark.employee_id, mark.date) for mark in written},
+            )
+        }
+        for mark, result in zip(marks, results):
+            if result["result"] == "error":
+                result["status_code"] = 404
+            else:
+                record = saved[(mark.employee_id, mark.date)]
+                result["record"] = {
+                    "id": record.id,
+                    "employee_id": record.employee_id,
+                    "date": record.date,
+                    "status": record.status,
+                }
+        return results
+    finally:
+        db.close()
+
+
+class AttendanceWriteBuffer:
+    """Bounded queue of marks flushed in groups by run()"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._accepting = False
+        # submit() calls waiting for queue space; drained like queued marks
+        self._submitting = 0
+        self.batches = 0
+        self.marks = 0
+
+    async def submit(self, mark: AttendanceCreate) -> asyncio.Future:
+        """Queue mark; the returned future resolves to its write_batch result"""
+        if not self._accepting:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Attendance writes are not being accepted right now",
+                headers={"Retry-After": "1"},
+            )
+        future = asyncio.get_running_loop().create_future()
+        self._submitting += 1
+        try:
+            await asyncio.wait_for(
+                self._queue.put((mark, future)),
+                timeout=settings.WRITE_BUFFER_ENQUEUE_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many attendance writes queued, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        finally:
+            self._submitting -= 1
+        return future
+
+    async def _collect(self, first: Item) -> List[Item]:
+        """first plus whatever else arrives within the flush window, up to the batch size"""
+        items = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.WRITE_BUFFER_FLUSH_MS / 1000
+        while len(items) < settings.WRITE_BUFFER_MAX_BATCH:
+            try:
+                items.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _flush(self, items: List[Item]):
+        results = await run_in_threadpool(write_batch, [mark for mark, _ in items])
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+        self.batches += 1
+        self.marks += len(items)
+
+    async def run(self, stop: asyncio.Event):
+        """Flush queued marks until stop is set, then drain the queue"""
+        self._queue = asyncio.Queue(maxsize=settings.WRITE_BUFFER_MAX_QUEUE)
+        self._accepting = True
+        while not stop.is_set() or self._submitting or not self._queue.empty():
+            if stop.is_set():
+                self._accepting = False
+            try:
+                first = await asyncio.wait_for(self._queue.get(), timeout=_IDLE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                continue
+            await self._flush(await self._collect(first))
+        self._accepting = False
+        logger.info("Attendance write buffer drained (%s marks in %s batches)", self.marks, self.batches)
+
+    def metrics(self) -> Dict:
+        return {
+            "accepting": int(self._accepting),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "batches": self.batches,
+            "marks": self.marks,
+        }
+
+
+attendance_write_buffer = AttendanceWriteBuffer()
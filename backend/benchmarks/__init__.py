@@ -0,0 +1,22 @@
+"""
+Benchmarks, load scenarios and synthetic data tooling
+
+Point DATABASE_URL at a scratch database before running anything here;
+most tools create a throwaway SQLite database when it is not set.
+"""
+import os
+import tempfile
+
+
+def use_scratch_database(name: str = "bench.db") -> str:
+    """
+    Point DATABASE_URL at the benchmark database before the app is imported
+
+    Uses BENCH_DATABASE_URL when set (e.g. a scratch PostgreSQL database),
+    otherwise a throwaway SQLite file. Benchmarks may drop and recreate
+    tables, so never aim this at real data.
+    """
+    url = os.environ.get("BENCH_DATABASE_URL") or \
+        f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hrms-bench-'), name)}"
+    os.environ["DATABASE_URL"] = url
+    return url
@@ -0,0 +1,139 @@
+"""
+Benchmark for the vectorized attendance analytics
+
+Seeds a scratch database with N employees and D days of attendance, then
+times the analytics endpoint's computation with cold bitsets (first load),
+warm bitsets, and a pure-Python baseline that fetches every mark and
+loops over it. Headline numbers of the two implementations are compared
+so a mismatch fails loudly.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_analytics --employees 40000 --days 250   # 10M marks
+"""
+import argparse
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from benchmarks import use_scratch_database
+
+use_scratch_database()
+
+from app.database import SessionLocal  # noqa: E402
+from app.models.attendance import Attendance, AttendanceStatus  # noqa: E402
+from app.models.employee import Employee  # noqa: E402
+from app.services.analytics import attendance_analytics  # noqa: E402
+from app.services.bitmaps import attendance_bitmaps  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+
+
+def python_analytics(db, start_date, end_date, window=30, top=10):
+    """Baseline: the same headline metrics computed row by row"""
+    departments = dict(db.query(Employee.employee_id, Employee.department))
+    rows = db.query(Attendance.employee_id, Attendance.date, Attendance.status).filter(
+        Attendance.date >= start_date, Attendance.date <= end_date
+    )
+    daily = defaultdict(lambda: [0, 0])
+    weekday = defaultdict(lambda: [0, 0])
+    department = defaultdict(lambda: [0, 0])
+    absences = defaultdict(list)
+    for employee_id, day, status in rows:
+        slot = 0 if status == AttendanceStatus.PRESENT else 1
+        daily[day][slot] += 1
+        weekday[day.weekday()][slot] += 1
+        department[departments[employee_id]][slot] += 1
+        if slot:
+            absences[employee_id].append(day)
+
+    days = [start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+    rolling = []
+    for i, day in enumerate(days):
+        span = days[max(0, i - window + 1):i + 1]
+        present = sum(daily[d][0] for d in span)
+        marked = present + sum(daily[d][1] for d in span)
+        rolling.append(round(present * 100 / marked, 2) if marked else None)
+
+    streaks = {}
+    for employee_id, marks in absences.items():
+        marks.sort()
+        best = run = 1
+        for previous, current in zip(marks, marks[1:]):
+            run = run + 1 if current - previous == timedelta(days=1) else 1
+            best = max(best, run)
+        streaks[employee_id] = best
+
+    total_present = sum(counts[0] for counts in daily.values())
+    total_absent = sum(counts[1] for counts in daily.values())
+    return {
+        "total_present": total_present,
+        "total_absent": total_absent,
+        "rolling": rolling,
+        "weekday": [tuple(weekday[i]) for i in range(7)],
+        "departments": {name: tuple(counts) for name, counts in department.items()},
+        "longest_streak": max(streaks.values(), default=0),
+    }
+
+
+def headline(result):
+    """The numpy result reduced to the baseline's shape"""
+    return {
+        "total_present": result["summary"]["total_present"],
+        "total_absent": result["summary"]["total_absent"],
+        "rolling": [day["rolling_rate"] for day in result["daily"]],
+        "weekday": [(day["present"], day["absent"]) for day in result["day_of_week"]],
+        "departments": {
+            row["department"]: (row["total_present"], row["total_absent"])
+            for row in result["departments"] if row["total_present"] or row["total_absent"]
+        },
+        "longest_streak": max((row["days"] for row in result["longest_absence_streaks"]), default=0),
+    }
+
+
+def timed(fn):
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = fn(db)
+        return result, time.perf_counter() - started
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=40000)
+    parser.add_argument("--departments", type=int, default=12)
+    parser.add_argument("--days", type=int, default=250)
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    end = date.today()
+    start = end - timedelta(days=args.days - 1)
+    print(generate(employees=args.employees, departments=args.departments, days=args.days, end=end, reset=True))
+
+    def vectorized(db):
+        return attendance_analytics(db, start, end)
+
+    attendance_bitmaps.clear()
+    result, cold = timed(vectorized)
+    _, warm = timed(vectorized)
+    print(f"{'impl':>10} {'marks':>10} {'seconds':>10}")
+    marks = result["summary"]["total_days"]
+    print(f"{'np-cold':>10} {marks:>10} {cold:>10.3f}")
+    print(f"{'np-warm':>10} {marks:>10} {warm:>10.3f}")
+
+    if not args.skip_baseline:
+        baseline, seconds = timed(lambda db: python_analytics(db, start, end))
+        print(f"{'python':>10} {marks:>10} {seconds:>10.3f}")
+        vectorized_headline = headline(result)
+        # np.round and round() may settle exact halves differently
+        rolling_close = all(
+            (a is None and b is None) or (a is not None and b is not None and abs(a - b) <= 0.011)
+            for a, b in zip(vectorized_headline.pop("rolling"), baseline.pop("rolling"))
+        )
+        if not rolling_close or baseline != vectorized_headline:
+            raise SystemExit("vectorized and baseline results differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark for response compression
+
+Seeds a scratch database, fetches typical payloads uncompressed through
+the app (a page of the attendance list, all per-employee stats, the
+dashboard summary and a streamed CSV export, kept in its original
+chunks) and compresses each with every available algorithm and level
+the way CompressionMiddleware does. Reports CPU time against bytes
+saved, so COMPRESSION_* can be chosen for the deployment's egress and
+CPU budget.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_compression --employees 2000 --days 60
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import use_scratch_database
+
+use_scratch_database()
+
+from app.compression import Encoder, brotli  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+
+PAYLOADS = [
+    ("attendance page", "/api/attendance?limit=1000"),
+    ("stats by-employee", "/api/attendance/stats/by-employee"),
+    ("dashboard", "/api/employees/dashboard/summary"),
+    ("export csv", "/api/attendance/export?format=csv"),
+]
+
+LEVELS = [("gzip", 1), ("gzip", 6), ("gzip", 9), ("br", 1), ("br", 4), ("br", 9)]
+
+
+async def get_chunks(path: str):
+    """Body chunks of GET path exactly as the app sends them"""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("bench", 0), "server": ("bench", 80),
+    }
+    chunks = []
+    requested = False
+    done = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses listen for a disconnect; it comes once the body is sent
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"GET {path} returned {message['status']}")
+        if message["type"] == "http.response.body":
+            if message.get("body"):
+                chunks.append(message["body"])
+            if not message.get("more_body"):
+                done.set()
+
+    await app(scope, receive, send)
+    return chunks
+
+
+async def fetch_chunks():
+    """Every payload, uncompressed"""
+    settings.COMPRESSION_ALGORITHMS = ""
+    return {name: await get_chunks(url) for name, url in PAYLOADS}
+
+
+def compress(chunks, algorithm, level):
+    encoder = Encoder(algorithm, gzip_level=level, brotli_quality=level)
+    if len(chunks) == 1:
+        return len(encoder.finish(chunks[0]))
+    return sum(len(encoder.compress(chunk)) for chunk in chunks) + len(encoder.finish())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(generate(employees=args.employees, departments=10, days=args.days, reset=True))
+    payloads = asyncio.run(fetch_chunks())
+    levels = [(algorithm, level) for algorithm, level in LEVELS if algorithm == "gzip" or brotli is not None]
+    if brotli is None:
+        print("brotli is not installed; reporting gzip only")
+
+    print(f"{'payload':>18} {'chunks':>6} {'KB':>8} {'codec':>7} {'KB out':>8} {'ratio':>6} "
+          f"{'CPU ms':>8} {'MB/s':>7} {'CPU ms/MB saved':>16}")
+    for name, chunks in payloads.items():
+        size = sum(len(chunk) for chunk in chunks)
+        for algorithm, level in levels:
+            cpu = []
+            for _ in range(args.repeat):
+                started = time.process_time()
+                compressed = compress(chunks, algorithm, level)
+                cpu.append(time.process_time() - started)
+            seconds = min(cpu)
+            saved_mb = (size - compressed) / 1e6
+            print(f"{name:>18} {len(chunks):>6} {size / 1e3:>8.1f} {f'{algorithm}-{level}':>7} "
+                  f"{compressed / 1e3:>8.1f} {size / max(compressed, 1):>6.1f} {seconds * 1000:>8.1f} "
+                  f"{size / 1e6 / max(seconds, 1e-9):>7.0f} {seconds * 1000 / max(saved_mb, 1e-9):>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Event-loop responsiveness benchmark
+
+Hammers the stats endpoint with concurrent clients through an in-process
+ASGI client while probing /health, and reports /health latency
+percentiles. A copy of the stats endpoint written the old way (an async
+handler calling the synchronous session) is mounted for comparison.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_concurrency --employees 2000 --days 20 --clients 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks import use_scratch_database
+
+use_scratch_database()
+
+import httpx  # noqa: E402
+
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.stats import get_attendance_stats  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+
+
+@app.get("/bench/blocking-stats", include_in_schema=False)
+async def blocking_stats():
+    """Old-style handler: synchronous queries inside async def"""
+    db = SessionLocal()
+    try:
+        return get_attendance_stats(db)
+    finally:
+        db.close()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(path: str, clients: int, duration: float):
+    """Load path with clients workers and probe /health; returns latencies (ms)"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = time.perf_counter() + duration
+        completed = 0
+
+        async def hammer():
+            nonlocal completed
+            while time.perf_counter() < stop:
+                await client.get(path)
+                completed += 1
+
+        async def probe():
+            # Latency is measured from the scheduled send time, so time spent
+            # waiting for a blocked event loop is included
+            samples = []
+            scheduled = time.perf_counter()
+            while scheduled < stop:
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                await client.get("/health")
+                samples.append((time.perf_counter() - scheduled) * 1000)
+                scheduled = max(scheduled + 0.01, time.perf_counter())
+            return samples
+
+        results = await asyncio.gather(probe(), *(hammer() for _ in range(clients)))
+        return results[0], completed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    generate(employees=args.employees, days=args.days, reset=True)
+    print(f"{'handler':>10} {'stats req':>10} {'health n':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, path in [("threadpool", "/api/attendance/stats/by-employee"),
+                       ("blocking", "/bench/blocking-stats")]:
+        samples, completed = asyncio.run(run(path, args.clients, args.duration))
+        print(f"{name:>10} {completed:>10} {len(samples):>9} {statistics.median(samples):>8.1f} "
+              f"{percentile(samples, 99):>8.1f} {max(samples):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
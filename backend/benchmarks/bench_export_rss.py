@@ -0,0 +1,96 @@
+"""
+Memory benchmark for the streaming attendance export
+
+Seeds a throwaway SQLite database with synthetic attendance rows, then
+runs the export generator in a fresh process and checks that peak RSS
+growth stays within a fixed budget.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_export_rss --rows 5000000 --budget-mb 150
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def _configure(db_path: str):
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+
+def seed(rows: int, employees: int):
+    """Bulk-load about rows attendance marks spread over employees"""
+    from benchmarks.datagen import generate
+
+    generate(employees=employees, days=-(-rows // employees), reset=True)
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def export(export_format: str, budget_mb: float) -> int:
+    """Drain the export generator and compare peak RSS growth to the budget"""
+    from sqlalchemy import select
+
+    from app.models.attendance import Attendance
+    from app.services.export import EXPORT_COLUMNS, stream_export
+
+    if export_format == "parquet":
+        import pyarrow.parquet  # noqa: F401  (import cost is not part of the export)
+
+    stmt = select(*(getattr(Attendance, column) for column in EXPORT_COLUMNS))
+    stmt = stmt.order_by(Attendance.date, Attendance.id)
+
+    baseline_kb = _rss_kb()
+    started = time.perf_counter()
+    total_bytes = 0
+    for chunk in stream_export(stmt, export_format):
+        total_bytes += len(chunk)
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    growth_mb = max(peak_kb - baseline_kb, 0) / 1024
+
+    print(f"format={export_format} bytes={total_bytes} seconds={elapsed:.1f} "
+          f"rss_growth_mb={growth_mb:.1f} budget_mb={budget_mb}")
+    return 0 if growth_mb <= budget_mb else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--format", dest="formats", nargs="+", default=["csv", "ndjson"])
+    parser.add_argument("--budget-mb", type=float, default=150)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.db:
+        _configure(args.db)
+        sys.exit(export(args.formats[0], args.budget_mb))
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="hrms-bench-"), "export.db")
+    _configure(db_path)
+    print(f"seeding {args.rows} rows ...")
+    seed(args.rows, args.employees)
+
+    failed = False
+    for export_format in args.formats:
+        # A fresh process so seeding does not inflate the measured peak
+        result = subprocess.run([
+            sys.executable, "-m", "benchmarks.bench_export_rss",
+            "--db", db_path, "--format", export_format, "--budget-mb", str(args.budget_mb),
+        ])
+        failed = failed or result.returncode != 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
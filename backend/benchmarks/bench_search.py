@@ -0,0 +1,68 @@
+"""
+Benchmark for employee search
+
+Seeds a scratch database with N employees and reports latency of the
+search endpoint's query for a few typical keystroke sequences, fetching
+one page each time like the directory UI does.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_search --employees 100000 --repeat 50
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import use_scratch_database
+
+use_scratch_database()
+
+from app.database import SessionLocal  # noqa: E402
+from app.models.employee import Employee  # noqa: E402
+from app.services.pagination import fetch_page  # noqa: E402
+from app.services.search import search_query  # noqa: E402
+from benchmarks.datagen import department_name, generate  # noqa: E402
+
+QUERIES = [
+    ("name prefix", "Employee 4242", None),
+    ("email prefix", "employee9", None),
+    ("employee id", "EMP0123", None),
+    ("short prefix", "em", None),
+    ("department", "Employee 12", department_name(1)),
+    ("no match", "zzzz", None),
+]
+
+
+def search(db, q, department, limit):
+    query, key = search_query(db, q)
+    if department:
+        query = query.filter(Employee.department == department)
+    return fetch_page(query.order_by(key), limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--departments", type=int, default=12)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(generate(employees=args.employees, departments=args.departments, days=1, reset=True))
+    db = SessionLocal()
+    try:
+        print(f"{'query':>14} {'rows':>6} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, q, department in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                rows, _ = search(db, q, department, args.limit)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{name:>14} {len(rows):>6} {statistics.median(timings):>8.2f} {p95:>8.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
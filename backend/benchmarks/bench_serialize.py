@@ -0,0 +1,101 @@
+"""
+Benchmark for list response serialization
+
+Seeds a scratch database, loads the same attendance rows both ways the
+list routes can and times turning them into a response body: ORM
+objects validated into AttendanceResponse by FastAPI's response model
+handling, versus plain tuples encoded by services.fastjson (orjson, and
+the standard library fallback). Checks the bodies decode to the same
+data.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_serialize --rows 100000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from benchmarks import use_scratch_database
+
+use_scratch_database()
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.attendance import Attendance  # noqa: E402
+from app.routers.attendance import ATTENDANCE_FIELDS  # noqa: E402
+from app.services import fastjson  # noqa: E402
+from app.services.pagination import projected_columns  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+
+
+def _list_route_field():
+    for route in app.routes:
+        if getattr(route, "path", None) == "/api/attendance" and "GET" in route.methods:
+            return route.secure_cloned_response_field
+    raise RuntimeError("GET /api/attendance not found")
+
+
+def model_path(db, field, limit):
+    """What the route does with FAST_JSON off"""
+    rows = db.query(Attendance).order_by(Attendance.date.desc(), Attendance.id.desc()).limit(limit).all()
+    content = asyncio.run(serialize_response(field=field, response_content=rows, is_coroutine=False))
+    return JSONResponse(content=content).body
+
+
+def fast_path(db, limit):
+    """What the route does with FAST_JSON on"""
+    rows = db.query(*projected_columns(Attendance, ATTENDANCE_FIELDS, ("date", "id"))) \
+        .order_by(Attendance.date.desc(), Attendance.id.desc()).limit(limit).all()
+    return fastjson.rows_response(rows, ATTENDANCE_FIELDS).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    employees = 1000
+    print(generate(employees=employees, departments=10, days=-(-args.rows // employees), reset=True))
+    field = _list_route_field()
+    encoder = fastjson.orjson
+
+    db = SessionLocal()
+    try:
+        paths = [
+            ("response model", lambda: model_path(db, field, args.rows)),
+            ("fast (stdlib)", lambda: fast_path(db, args.rows)),
+        ]
+        if encoder is not None:
+            paths.append(("fast (orjson)", lambda: fast_path(db, args.rows)))
+
+        bodies = {}
+        print(f"{'path':>16} {'rows':>8} {'median s':>9} {'best s':>8} {'MB':>6}")
+        for name, run in paths:
+            fastjson.orjson = encoder if name == "fast (orjson)" else None
+            timings = []
+            for _ in range(args.repeat):
+                db.expunge_all()
+                started = time.perf_counter()
+                body = run()
+                timings.append(time.perf_counter() - started)
+            bodies[name] = body
+            print(f"{name:>16} {len(json.loads(body)):>8} {statistics.median(timings):>9.3f} "
+                  f"{min(timings):>8.3f} {len(body) / 1e6:>6.1f}")
+        fastjson.orjson = encoder
+
+        expected = json.loads(bodies["response model"])
+        for name, body in bodies.items():
+            assert json.loads(body) == expected, f"{name} output differs from the response model"
+        print("all paths produce the same data")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
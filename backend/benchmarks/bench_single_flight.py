@@ -0,0 +1,84 @@
+"""
+Benchmark for single-flight request coalescing
+
+Sends bursts of identical concurrent requests, as when a whole office
+opens the dashboard at once, to the per-employee stats and the
+dashboard summary (with its cache cleared before every burst, as after
+a write) through an in-process ASGI client. Reports burst wall time,
+request latency and how many computations ran, with SINGLE_FLIGHT on
+and off.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_single_flight --employees 5000 --burst 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks import use_scratch_database
+
+use_scratch_database()
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.single_flight import FLIGHTS  # noqa: E402
+from app.services.summary import summary_cache  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+
+PATHS = [
+    ("stats by-employee", "/api/attendance/stats/by-employee", "get_attendance_stats_by_employee"),
+    ("dashboard", "/api/employees/dashboard/summary", "get_dashboard_summary"),
+]
+
+
+def computations(handler: str) -> int:
+    return sum(flights.computed for name, flights in FLIGHTS.items() if name.endswith(handler))
+
+
+async def run(path: str, bursts: int, burst: int):
+    """Wall time of each burst and latency of each request (ms)"""
+    transport = httpx.ASGITransport(app=app)
+    walls, latencies = [], []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)
+
+        async def request():
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        for _ in range(bursts):
+            summary_cache.invalidate()
+            started = time.perf_counter()
+            await asyncio.gather(*(request() for _ in range(burst)))
+            walls.append((time.perf_counter() - started) * 1000)
+    return walls, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--bursts", type=int, default=5)
+    args = parser.parse_args()
+
+    print(generate(employees=args.employees, departments=10, days=args.days, reset=True))
+    print(f"{'endpoint':>18} {'single flight':>13} {'burst ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'computed':>9}")
+    for label, path, handler in PATHS:
+        for enabled in (False, True):
+            settings.SINGLE_FLIGHT = enabled
+            before = computations(handler)
+            walls, latencies = asyncio.run(run(path, args.bursts, args.burst))
+            computed = computations(handler) - before if enabled else len(latencies)
+            ordered = sorted(latencies)
+            print(f"{label:>18} {'on' if enabled else 'off':>13} {statistics.median(walls):>9.1f} "
+                  f"{ordered[len(ordered) // 2]:>8.1f} {ordered[int(len(ordered) * 0.95)]:>8.1f} {computed:>9}")
+
+
+if __name__ == "__main__":
+    main()
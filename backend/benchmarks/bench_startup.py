@@ -0,0 +1,86 @@
+"""
+Benchmark for API cold start
+
+Starts fresh interpreters against an already-migrated scratch database
+and times import of app.main, the lifespan startup (schema version
+check) and the first response, the path every new worker takes. For
+comparison, "schema on boot" also runs every schema step (create_all,
+index, foreign key and search index checks, partition maintenance),
+which is what each worker did at import before migrations were
+versioned.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks import use_scratch_database
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+imported = time.perf_counter()
+if sys.argv[1] == "legacy":
+    from app.database import engine
+    from app.migrations import MIGRATIONS
+    from app.services.partitions import ensure_partitions
+    for migration in MIGRATIONS:
+        migration.apply(engine)
+    ensure_partitions(engine)
+schema = time.perf_counter()
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    client.get("/api/employees?limit=1").raise_for_status()
+    answered = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "schema": schema - imported,
+    "startup": ready - schema,
+    "first response": answered - ready,
+    "total": answered - started,
+}))
+"""
+
+PHASES = ["import", "schema", "startup", "first response", "total"]
+
+
+def run_child(mode: str, env) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, mode],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--employees", type=int, default=1000)
+    args = parser.parse_args()
+
+    use_scratch_database()
+    from benchmarks.datagen import generate
+    print(generate(employees=args.employees, days=30, reset=True))
+
+    env = {
+        **os.environ,
+        # Keep the background refresher from competing with the first request
+        "ROLLUP_REFRESH_ENABLED": "false",
+        "PYTHONPATH": os.getcwd(),
+    }
+    print(f"{'mode':>16} " + " ".join(f"{phase + ' ms':>18}" for phase in PHASES))
+    for mode, label in (("check", "version check"), ("legacy", "schema on boot")):
+        runs = [run_child(mode, env) for _ in range(args.runs)]
+        medians = {phase: statistics.median(run[phase] for run in runs) * 1000 for phase in PHASES}
+        print(f"{label:>16} " + " ".join(f"{medians[phase]:>18.1f}" for phase in PHASES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark for the attendance stats engine
+
+Seeds a scratch database with N employees and a few days of attendance,
+then reports query count and latency of the single grouped query and the
+attendance bitsets (cold: first load, warm: loaded) against the previous
+per-employee COUNT implementation.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_stats --sizes 1000 10000 50000 --days 10
+"""
+import argparse
+import time
+
+from benchmarks import use_scratch_database
+
+use_scratch_database()
+
+from app.database import SessionLocal  # noqa: E402
+from app.metrics import count_queries  # noqa: E402
+from app.models.attendance import Attendance  # noqa: E402
+from app.models.employee import Employee  # noqa: E402
+from app.services.bitmaps import attendance_bitmaps  # noqa: E402
+from app.services.stats import attendance_stats_query, bitmap_stats_rows  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+
+
+def legacy_stats(db):
+    """Previous implementation: two COUNT queries per employee"""
+    stats = []
+    for employee in db.query(Employee).all():
+        present = db.query(Attendance).filter(
+            Attendance.employee_id == employee.employee_id,
+            Attendance.status == "Present"
+        ).count()
+        absent = db.query(Attendance).filter(
+            Attendance.employee_id == employee.employee_id,
+            Attendance.status == "Absent"
+        ).count()
+        stats.append((employee.employee_id, present, absent))
+    return stats
+
+
+def query_stats(db):
+    return attendance_stats_query(db).all()
+
+
+def bitmap_stats_cold(db):
+    attendance_bitmaps.clear()
+    return bitmap_stats_rows(db)
+
+
+def measure(fn):
+    """Run fn with a fresh session, returning (rows, queries, seconds)"""
+    db = SessionLocal()
+    try:
+        with count_queries() as stats:
+            started = time.perf_counter()
+            rows = fn(db)
+            elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    return len(rows), stats.queries, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="Skip the legacy implementation above this many employees")
+    args = parser.parse_args()
+
+    print(f"{'employees':>10} {'impl':>8} {'rows':>8} {'queries':>8} {'seconds':>10}")
+    for size in args.sizes:
+        generate(employees=size, days=args.days, reset=True)
+        impls = [
+            ("query", query_stats),
+            ("bm-cold", bitmap_stats_cold),
+            ("bm-warm", bitmap_stats_rows),
+        ]
+        if size <= args.legacy_max:
+            impls.append(("legacy", legacy_stats))
+        for name, fn in impls:
+            rows, queries, elapsed = measure(fn)
+            print(f"{size:>10} {name:>8} {rows:>8} {queries:>8} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Synthetic data generator
+
+Bulk-loads N employees across M departments with D days of attendance
+into the database configured by DATABASE_URL (SQLite or PostgreSQL),
+then rebuilds the attendance rollups.
+
+Usage (from the backend directory):
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.datagen --employees 10000 --departments 12 --days 250 --reset
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import insert
+
+from app.database import SessionLocal, engine, init_db
+from app.migrations import reset as reset_schema
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.employee import Employee
+from app.services.rollups import refresh_rollups
+
+BATCH_SIZE = 10000
+
+
+def department_name(index: int) -> str:
+    return f"Department {index + 1:02d}"
+
+
+def employee_id(index: int) -> str:
+    return f"EMP{index:06d}"
+
+
+def _employee_rows(employees: int, departments: int) -> Iterator[Dict]:
+    for i in range(employees):
+        yield {
+            "employee_id": employee_id(i),
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": department_name(i % departments),
+        }
+
+
+def _attendance_rows(
+    employees: int,
+    days: List[date],
+    absent_ratio: float,
+    rng: random.Random,
+) -> Iterator[Dict]:
+    for day in days:
+        for i in range(employees):
+            yield {
+                "employee_id": employee_id(i),
+                "date": day,
+                "status": AttendanceStatus.ABSENT if rng.random() < absent_ratio else AttendanceStatus.PRESENT,
+            }
+
+
+def _insert_batched(model, rows: Iterator[Dict]) -> int:
+    inserted = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            with engine.begin() as conn:
+                conn.execute(insert(model), batch)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(insert(model), batch)
+        inserted += len(batch)
+    return inserted
+
+
+def generate(
+    employees: int,
+    departments: int = 5,
+    days: int = 30,
+    end: Optional[date] = None,
+    weekdays_only: bool = False,
+    absent_ratio: float = 0.1,
+    seed: int = 0,
+    reset: bool = False,
+) -> Dict:
+    """
+    Load synthetic employees and attendance; returns row counts and timing
+
+    Attendance covers the days calendar days ending at end (default
+    today), optionally skipping weekends. Output is deterministic for a
+    given seed.
+    """
+    started = time.perf_counter()
+    if reset:
+        reset_schema(engine)
+    init_db()
+
+    end = end or date.today()
+    calendar = [end - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    if weekdays_only:
+        calendar = [day for day in calendar if day.weekday() < 5]
+
+    employee_count = _insert_batched(Employee, _employee_rows(employees, departments))
+    attendance_count = _insert_batched(
+        Attendance,
+        _attendance_rows(employees, calendar, absent_ratio, random.Random(seed)),
+    )
+
+    db = SessionLocal()
+    try:
+        refresh_rollups(db, full=True)
+    finally:
+        db.close()
+
+    return {
+        "employees": employee_count,
+        "departments": departments,
+        "days": len(calendar),
+        "attendance": attendance_count,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--departments", type=int, default=5)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--weekdays-only", action="store_true")
+    parser.add_argument("--absent-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args()
+
+    print(generate(
+        employees=args.employees,
+        departments=args.departments,
+        days=args.days,
+        weekdays_only=args.weekdays_only,
+        absent_ratio=args.absent_ratio,
+        seed=args.seed,
+        reset=args.reset,
+    ))
+
+
+if __name__ == "__main__":
+    main()
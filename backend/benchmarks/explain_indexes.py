@@ -0,0 +1,84 @@
+"""
+Query plan check for the attendance indexes
+
+Builds the hot attendance queries the routers issue, runs EXPLAIN on
+them and fails if any of them does not use the expected index.
+
+Usage (from the backend directory):
+    python -m benchmarks.explain_indexes
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.explain_indexes
+"""
+import sys
+from datetime import date
+
+from benchmarks import use_scratch_database
+
+use_scratch_database("explain.db")
+
+from sqlalchemy import func, select, text  # noqa: E402
+
+from app.database import SessionLocal, engine, init_db  # noqa: E402
+from app.models.attendance import Attendance, AttendanceStatus  # noqa: E402
+from app.services.stats import attendance_stats_query  # noqa: E402
+
+
+def hot_queries(db):
+    """(description, statement, expected index) for the hot attendance queries"""
+    start, end = date(2024, 1, 1), date(2024, 1, 31)
+    return [
+        (
+            "attendance by employee",
+            select(Attendance).where(Attendance.employee_id == "EMP000001")
+            .order_by(Attendance.date.desc(), Attendance.id.desc()),
+            "uq_attendance_employee_date",
+        ),
+        (
+            "attendance by date range",
+            select(Attendance).where(Attendance.date >= start, Attendance.date <= end),
+            "ix_attendance_date",
+        ),
+        (
+            "present count",
+            select(func.count()).select_from(Attendance)
+            .where(Attendance.status == AttendanceStatus.PRESENT),
+            "ix_attendance_status_date",
+        ),
+        (
+            "employee stats",
+            attendance_stats_query(db, employee_id="EMP000001", start_date=start, end_date=end).statement,
+            "uq_attendance_employee_date",
+        ),
+    ]
+
+
+def explain(conn, statement) -> str:
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    if engine.dialect.name == "sqlite":
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return "\n".join(row[-1] for row in rows)
+    # Make PostgreSQL prefer indexes even on a small table; SET LOCAL ends
+    # with the transaction, so a pooled connection does not keep it
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    return "\n".join(row[0] for row in conn.execute(text(f"EXPLAIN {sql}")))
+
+
+def main():
+    init_db()
+    failures = 0
+    db = SessionLocal()
+    try:
+        with engine.connect() as conn:
+            for description, statement, index in hot_queries(db):
+                plan = explain(conn, statement)
+                ok = index in plan
+                failures += not ok
+                print(f"[{'ok' if ok else 'FAIL'}] {description}: expected {index}")
+                if not ok:
+                    print("    " + plan.replace("\n", "\n    "))
+    finally:
+        db.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+HTTP load scenarios against an in-process ASGI client
+
+Runs weighted mixes of list, stats, dashboard and mark-attendance
+requests with concurrent virtual users through the full middleware
+stack, then writes per-scenario latency percentiles as JSON tagged with
+the current git commit so runs can be compared across commits.
+
+Usage (from the backend directory):
+    python -m benchmarks.load --mix read-heavy --users 16 --duration 20
+    python -m benchmarks.load --mix clock-in --baseline benchmarks/results/load-abc1234.json
+    python -m benchmarks.load --mix clock-in --write-buffer
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from benchmarks import use_scratch_database
+
+use_scratch_database("load.db")
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.write_buffer import attendance_write_buffer  # noqa: E402
+from benchmarks.datagen import department_name, employee_id, generate  # noqa: E402
+
+MIXES: Dict[str, Dict[str, int]] = {
+    "read-heavy": {"list": 40, "stats": 20, "dashboard": 30, "mark": 10},
+    "clock-in": {"mark": 80, "dashboard": 10, "list": 10},
+    "reporting": {"stats": 50, "dashboard": 40, "list": 10},
+}
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Scenarios:
+    """Builds a request for each scenario against the generated dataset"""
+
+    def __init__(self, employees: int, departments: int, rng: random.Random):
+        self.employees = employees
+        self.departments = departments
+        self.rng = rng
+
+    def _employee(self) -> str:
+        return employee_id(self.rng.randrange(self.employees))
+
+    def list(self):
+        if self.rng.random() < 0.5:
+            return "GET", "/api/employees", {"params": {"limit": 100}}
+        return "GET", "/api/attendance", {"params": {"limit": 100, "employee_id": self._employee()}}
+
+    def stats(self):
+        if self.rng.random() < 0.3:
+            return "GET", "/api/attendance/stats/by-employee", {
+                "params": {"department": department_name(self.rng.randrange(self.departments))},
+            }
+        return "GET", f"/api/attendance/stats/{self._employee()}", {}
+
+    def dashboard(self):
+        choice = self.rng.random()
+        if choice < 0.6:
+            return "GET", "/api/employees/dashboard/summary", {}
+        if choice < 0.8:
+            return "GET", "/api/attendance/stats/department", {}
+        return "GET", "/api/attendance/stats/daily", {
+            "params": {"start_date": (date.today() - timedelta(days=30)).isoformat()},
+        }
+
+    def mark(self):
+        return "POST", "/api/attendance", {"json": {
+            "employee_id": self._employee(),
+            "date": date.today().isoformat(),
+            "status": "Present" if self.rng.random() < 0.9 else "Absent",
+        }}
+
+
+async def run_mix(mix: Dict[str, int], users: int, duration: float, scenarios: Scenarios) -> Dict:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+
+    # The transport skips the lifespan, so start the write buffer's flusher here
+    flusher_stop = asyncio.Event()
+    flusher = None
+    if settings.ATTENDANCE_WRITE_BUFFER:
+        flusher = asyncio.create_task(attendance_write_buffer.run(flusher_stop))
+        await asyncio.sleep(0)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+        stop = time.perf_counter() + duration
+
+        async def user():
+            while time.perf_counter() < stop:
+                name = scenarios.rng.choices(names, weights)[0]
+                method, path, kwargs = getattr(scenarios, name)()
+                started = time.perf_counter()
+                response = await client.request(method, path, **kwargs)
+                latencies[name].append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(users)))
+        elapsed = time.perf_counter() - started
+
+    if flusher:
+        flusher_stop.set()
+        await flusher
+
+    results = {}
+    for name in names:
+        samples = latencies[name]
+        if not samples:
+            continue
+        results[name] = {
+            "requests": len(samples),
+            "errors": errors[name],
+            "rps": round(len(samples) / elapsed, 2),
+            "mean_ms": round(sum(samples) / len(samples), 3),
+            "p50_ms": round(_percentile(samples, 50), 3),
+            "p95_ms": round(_percentile(samples, 95), 3),
+            "p99_ms": round(_percentile(samples, 99), 3),
+        }
+    total = sum(len(samples) for samples in latencies.values())
+    results["total"] = {"requests": total, "rps": round(total / elapsed, 2)}
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_results(results: Dict, baseline: Dict = None):
+    print(f"{'scenario':>10} {'requests':>9} {'errors':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'p95 vs base':>12}")
+    for name, row in results.items():
+        if name == "total":
+            continue
+        delta = ""
+        if baseline and name in baseline.get("results", {}):
+            before = baseline["results"][name]["p95_ms"]
+            delta = f"{(row['p95_ms'] - before) / before * 100:+.1f}%" if before else ""
+        print(f"{name:>10} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8} "
+              f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9} {delta:>12}")
+    print(f"{'total':>10} {results['total']['requests']:>9} {'':>7} {results['total']['rps']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mix", choices=sorted(MIXES), default="read-heavy")
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--departments", type=int, default=8)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--write-buffer", action="store_true", help="Group-commit marks (ATTENDANCE_WRITE_BUFFER)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/load-<mix>-<commit>.json)")
+    parser.add_argument("--baseline", help="Earlier result file to compare p95 latency against")
+    args = parser.parse_args()
+    if args.write_buffer:
+        settings.ATTENDANCE_WRITE_BUFFER = True
+
+    dataset = generate(
+        employees=args.employees, departments=args.departments, days=args.days,
+        seed=args.seed, reset=True,
+    )
+    scenarios = Scenarios(args.employees, args.departments, random.Random(args.seed))
+    results = asyncio.run(run_mix(MIXES[args.mix], args.users, args.duration, scenarios))
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "mix": args.mix,
+        "config": {
+            "users": args.users, "duration": args.duration, "seed": args.seed,
+            "write_buffer": settings.ATTENDANCE_WRITE_BUFFER,
+        },
+        "dataset": dataset,
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{args.mix}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(report, handle, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+    _print_results(results, baseline)
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Micro-benchmarks for the router functions (pytest-benchmark)
+
+Calls each route handler directly with a database session against a
+generated dataset, so the numbers exclude HTTP and serialization.
+Handlers coalesced by single_flight are called through __wrapped__,
+the computation a flight runs.
+Dataset size is controlled by BENCH_EMPLOYEES, BENCH_DEPARTMENTS and
+BENCH_DAYS.
+
+Usage (from the backend directory):
+    python -m pytest benchmarks --benchmark-json=benchmarks/results/micro-$(git rev-parse --short HEAD).json
+"""
+import os
+from datetime import date
+
+from benchmarks import use_scratch_database
+
+use_scratch_database("microbench.db")
+
+import pytest  # noqa: E402
+from fastapi import Response  # noqa: E402
+
+from app.database import SessionLocal  # noqa: E402
+from app.models.attendance import AttendanceStatus  # noqa: E402
+from app.routers import attendance, employees  # noqa: E402
+from app.schemas.attendance import AttendanceCreate  # noqa: E402
+from app.schemas.employee import EmployeeCreate  # noqa: E402
+from app.services.summary import summary_cache  # noqa: E402
+from benchmarks.datagen import department_name, employee_id, generate  # noqa: E402
+
+EMPLOYEES = int(os.environ.get("BENCH_EMPLOYEES", 2000))
+DEPARTMENTS = int(os.environ.get("BENCH_DEPARTMENTS", 8))
+DAYS = int(os.environ.get("BENCH_DAYS", 60))
+
+SAMPLE_EMPLOYEE = employee_id(EMPLOYEES // 2)
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return generate(employees=EMPLOYEES, departments=DEPARTMENTS, days=DAYS, reset=True)
+
+
+@pytest.fixture
+def db(dataset):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+# Employees
+
+def bench_get_employees_page(benchmark, db):
+    benchmark(employees.get_employees, Response(), limit=100, cursor=None, fields=None, db=db)
+
+
+def bench_get_employees_projection(benchmark, db):
+    benchmark(employees.get_employees, Response(), limit=1000, cursor=None, fields="employee_id,full_name", db=db)
+
+
+def bench_get_employee(benchmark, db):
+    benchmark(employees.get_employee, SAMPLE_EMPLOYEE, db=db)
+
+
+def bench_get_employee_profile(benchmark, db):
+    benchmark(
+        employees.get_employee_profile, SAMPLE_EMPLOYEE,
+        limit=30, cursor=None, start_date=None, end_date=None, db=db,
+    )
+
+
+def bench_create_and_delete_employee(benchmark, db):
+    counter = iter(range(10 ** 9))
+
+    def cycle():
+        new_id = f"BENCH{next(counter):09d}"
+        employees.create_employee(EmployeeCreate(
+            employee_id=new_id,
+            full_name="Bench Employee",
+            email=f"{new_id.lower()}@example.com",
+            department=department_name(0),
+        ), db=db)
+        employees.delete_employee(new_id, db=db)
+
+    benchmark(cycle)
+
+
+def bench_dashboard_summary_uncached(benchmark, db):
+    def uncached():
+        summary_cache.invalidate()
+        return employees.get_dashboard_summary.__wrapped__(db=db)
+
+    benchmark(uncached)
+
+
+def bench_dashboard_summary_cached(benchmark, db):
+    benchmark(employees.get_dashboard_summary.__wrapped__, db=db)
+
+
+# Attendance
+
+def bench_create_attendance(benchmark, db):
+    mark = AttendanceCreate(employee_id=SAMPLE_EMPLOYEE, date=date.today(), status=AttendanceStatus.PRESENT)
+    benchmark(attendance._mark_attendance, mark, db)
+
+
+def bench_get_all_attendance_page(benchmark, db):
+    benchmark(
+        attendance.get_all_attendance, Response(),
+        employee_id=None, start_date=None, end_date=None,
+        limit=100, cursor=None, fields=None, db=db,
+    )
+
+
+def bench_get_all_attendance_by_employee(benchmark, db):
+    benchmark(
+        attendance.get_all_attendance, Response(),
+        employee_id=SAMPLE_EMPLOYEE, start_date=None, end_date=None,
+        limit=100, cursor=None, fields=None, db=db,
+    )
+
+
+def bench_get_employee_attendance(benchmark, db):
+    benchmark(attendance.get_employee_attendance, SAMPLE_EMPLOYEE, Response(), db=db)
+
+
+def bench_stats_by_employee(benchmark, db):
+    benchmark(attendance.get_attendance_stats_by_employee.__wrapped__, department=None, start_date=None, end_date=None, db=db)
+
+
+def bench_stats_by_employee_department(benchmark, db):
+    benchmark(
+        attendance.get_attendance_stats_by_employee.__wrapped__,
+        department=department_name(0), start_date=None, end_date=None, db=db,
+    )
+
+
+def bench_employee_stats(benchmark, db):
+    benchmark(attendance.get_employee_attendance_stats, SAMPLE_EMPLOYEE, start_date=None, end_date=None, db=db)
+
+
+def bench_daily_stats(benchmark, db):
+    benchmark(attendance.get_daily_attendance_stats, start_date=None, end_date=None, department=None, db=db)
+
+
+def bench_department_stats(benchmark, db):
+    benchmark(attendance.get_department_attendance_stats, start_date=None, end_date=None, db=db)
+
+
+def bench_monthly_stats(benchmark, db):
+    benchmark(
+        attendance.get_monthly_attendance_stats,
+        employee_id=SAMPLE_EMPLOYEE, start_date=None, end_date=None, db=db,
+    )
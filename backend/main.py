@@ -2,10 +2,13 @@
 Entry point for the HRMS Lite API application
 """
 import uvicorn
-from app.main import app
 from app.config import settings
+from app.database import init_db
 
 if __name__ == "__main__":
+    # Development convenience: apply pending migrations before serving
+    init_db()
+    
     # Note: reload=False to avoid Windows multiprocessing permission issues
     # For development with auto-reload, use: uvicorn app.main:app --reload
     uvicorn.run(
@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the test suite
+
+DATABASE_URL is pointed at a scratch database (BENCH_DATABASE_URL, or a
+throwaway SQLite file) before the app is imported, and the session's
+dataset is loaded once with the benchmark data generator.
+"""
+import pytest
+
+from benchmarks import use_scratch_database
+
+use_scratch_database("tests.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+
+EMPLOYEES = 40
+DEPARTMENTS = 4
+DAYS = 30
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    """Synthetic employees and attendance, loaded into a fresh schema"""
+    return generate(employees=EMPLOYEES, departments=DEPARTMENTS, days=DAYS, reset=True)
+
+
+@pytest.fixture
+def db(dataset):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(dataset):
+    with TestClient(app) as client:
+        yield client
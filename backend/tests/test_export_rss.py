@@ -0,0 +1,33 @@
+"""
+Streaming exports must keep memory flat however many rows they return
+
+Runs benchmarks.bench_export_rss, which seeds its own SQLite file and
+drains each export format in a fresh process. EXPORT_RSS_ROWS (default
+5,000,000) and EXPORT_RSS_BUDGET_MB (default 150) size the check:
+
+    EXPORT_RSS_ROWS=500000 python -m pytest -m slow tests/test_export_rss.py
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.slow
+def test_export_rss_growth_within_budget():
+    rows = int(os.environ.get("EXPORT_RSS_ROWS", 5_000_000))
+    budget_mb = float(os.environ.get("EXPORT_RSS_BUDGET_MB", 150))
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.bench_export_rss",
+            "--rows", str(rows), "--budget-mb", str(budget_mb), "--format", "csv", "ndjson",
+        ],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, f"export RSS growth over {budget_mb} MB:\n{result.stdout}{result.stderr}"
@@ -0,0 +1,15 @@
+"""
+The hot attendance queries must keep using their indexes
+"""
+from app.database import engine
+from benchmarks.explain_indexes import explain, hot_queries
+
+
+def test_hot_queries_use_expected_indexes(db):
+    failures = []
+    with engine.connect() as conn:
+        for description, statement, index in hot_queries(db):
+            plan = explain(conn, statement)
+            if index not in plan:
+                failures.append(f"{description}: expected {index}\n{plan}")
+    assert not failures, "\n\n".join(failures)
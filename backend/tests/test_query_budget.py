@@ -0,0 +1,52 @@
+"""
+The list and stats routes must issue a fixed number of queries
+
+Runs each route with QUERY_BUDGET_MODE=error, so the statement that
+exceeds QUERY_BUDGET raises QueryBudgetExceeded. The dataset has more
+employees than the budget allows queries, so a per-row (N+1) query
+fails the test.
+"""
+import pytest
+
+from app.config import settings
+from app.metrics import QueryBudgetExceeded
+
+BUDGET = 5
+
+ROUTES = [
+    "/api/employees",
+    "/api/employees?fields=employee_id,full_name,department",
+    "/api/employees/search?q=Employee",
+    "/api/employees/EMP000001/profile",
+    "/api/employees/dashboard/summary",
+    "/api/attendance",
+    "/api/attendance?employee_id=EMP000001",
+    "/api/attendance/EMP000001",
+    "/api/attendance/EMP000001/calendar",
+    "/api/attendance/analytics",
+    "/api/attendance/stats/by-employee",
+    "/api/attendance/stats/daily",
+    "/api/attendance/stats/department",
+    "/api/attendance/stats/monthly",
+    "/api/attendance/stats/EMP000001",
+]
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET", BUDGET)
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "error")
+    return BUDGET
+
+
+@pytest.mark.parametrize("path", ROUTES)
+def test_route_within_query_budget(client, budget, path):
+    response = client.get(path)
+    assert response.status_code == 200, response.text
+
+
+def test_budget_exceeded_raises(client, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET", 1)
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "error")
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/api/attendance/stats/by-employee")
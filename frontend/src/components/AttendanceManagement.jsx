@@ -1,6 +1,9 @@
 import React, { useState, useEffect } from 'react';
 import { employeeAPI, attendanceAPI } from '../services/api';
 
+// Attendance records per request when viewing one employee
+const PROFILE_PAGE_SIZE = 1000;
+
 const AttendanceManagement = () => {
   const [employees, setEmployees] = useState([]);
   const [attendance, setAttendance] = useState([]);
@@ -115,8 +118,18 @@ const AttendanceManagement = () => {
   const viewEmployeeAttendance = async (employee) => {
     try {
       setSelectedEmployee(employee);
-      const response = await attendanceAPI.getByEmployeeId(employee.employee_id);
-      setAttendance(response.data);
+      const { data: profile } = await employeeAPI.getProfile(employee.employee_id, { limit: PROFILE_PAGE_SIZE });
+      const records = [...profile.attendance];
+      if (profile.next_cursor) {
+        for await (const page of attendanceAPI.pages({
+          employee_id: employee.employee_id,
+          limit: PROFILE_PAGE_SIZE,
+          cursor: profile.next_cursor,
+        })) {
+          records.push(...page);
+        }
+      }
+      setAttendance(records);
     } catch (err) {
       setError('Failed to fetch employee attendance');
       console.error('Error fetching employee attendance:', err);
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { employeeAPI, attendanceAPI } from '../services/api';
+import { batchAPI } from '../services/api';
 
 const Dashboard = () => {
   const [dashboardData, setDashboardData] = useState(null);
@@ -15,9 +15,9 @@ const Dashboard = () => {
     try {
       setLoading(true);
       setError(null);
-      const [summaryRes, statsRes] = await Promise.all([
-        employeeAPI.getDashboardSummary(),
-        attendanceAPI.getStatsByEmployee(),
+      const [summaryRes, statsRes] = await batchAPI.run([
+        { path: '/employees/dashboard/summary' },
+        { path: '/attendance/stats/by-employee' },
       ]);
       setDashboardData(summaryRes.data);
       setEmployeeStats(statsRes.data);
@@ -1,6 +1,9 @@
 import React, { useState, useEffect } from 'react';
 import { employeeAPI } from '../services/api';
 
+const SEARCH_DEBOUNCE_MS = 250;
+const SEARCH_LIMIT = 50;
+
 const EmployeeManagement = () => {
   const [employees, setEmployees] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -13,16 +16,22 @@ const EmployeeManagement = () => {
     department: '',
   });
   const [formErrors, setFormErrors] = useState({});
+  const [searchTerm, setSearchTerm] = useState('');
 
+  // Debounce typing so the server is queried once the user pauses
   useEffect(() => {
-    fetchEmployees();
-  }, []);
+    const timer = setTimeout(fetchEmployees, searchTerm ? SEARCH_DEBOUNCE_MS : 0);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
 
   const fetchEmployees = async () => {
     try {
       setLoading(true);
       setError(null);
-      const response = await employeeAPI.getAll();
+      const query = searchTerm.trim();
+      const response = query
+        ? await employeeAPI.search({ q: query, limit: SEARCH_LIMIT })
+        : await employeeAPI.getAll();
       setEmployees(response.data);
     } catch (err) {
       setError('Failed to fetch employees. Please try again later.');
@@ -138,14 +147,6 @@ const EmployeeManagement = () => {
     setFormErrors({});
   };
 
-  if (loading) {
-    return (
-      <div className="loading-container">
-        <div className="spinner"></div>
-      </div>
-    );
-  }
-
   return (
     <div>
       {error && (
@@ -163,7 +164,30 @@ const EmployeeManagement = () => {
           </button>
         </div>
 
-        {employees.length === 0 ? (
+        <div className="search-bar">
+          <input
+            type="search"
+            className="form-input"
+            value={searchTerm}
+            onChange={(e) => setSearchTerm(e.target.value)}
+            placeholder="Search by name, email or employee ID"
+          />
+        </div>
+
+        {/* The search bar stays mounted while a search is in flight */}
+        {loading ? (
+          <div className="loading-container">
+            <div className="spinner"></div>
+          </div>
+        ) : employees.length === 0 && searchTerm.trim() ? (
+          <div className="empty-state">
+            <div className="empty-state-icon">🔍</div>
+            <h3 className="empty-state-title">No Matching Employees</h3>
+            <p className="empty-state-text">
+              No employees match "{searchTerm.trim()}".
+            </p>
+          </div>
+        ) : employees.length === 0 ? (
           <div className="empty-state">
             <div className="empty-state-icon">👥</div>
             <h3 className="empty-state-title">No Employees Found</h3>
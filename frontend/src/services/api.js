@@ -8,12 +8,88 @@ const api = axios.create({
   headers: {
     'Content-Type': 'application/json',
   },
+  // 304 Not Modified is answered from responseCache below
+  validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
 });
 
+// GET responses are kept with their ETag and revalidated with If-None-Match;
+// when nothing changed the server answers 304 without running its queries
+// and the cached body is reused.
+const RESPONSE_CACHE_SIZE = 200;
+const responseCache = new Map();
+
+api.interceptors.request.use((config) => {
+  if ((config.method || 'get').toLowerCase() === 'get') {
+    const cached = responseCache.get(api.getUri(config));
+    if (cached) {
+      config.headers['If-None-Match'] = cached.etag;
+    }
+  }
+  return config;
+});
+
+// Resolve a 304 from the cache, or remember a response that carries an ETag
+const revalidated = (key, response) => {
+  if (response.status === 304) {
+    const cached = responseCache.get(key);
+    if (cached) {
+      // Refresh its position so the least recently used entry is evicted first
+      responseCache.delete(key);
+      responseCache.set(key, cached);
+      return { ...response, status: 200, data: cached.data, headers: { ...cached.headers, ...response.headers } };
+    }
+    return response;
+  }
+  const etag = response.headers.etag;
+  if (etag) {
+    responseCache.delete(key);
+    responseCache.set(key, { etag, data: response.data, headers: response.headers });
+    if (responseCache.size > RESPONSE_CACHE_SIZE) {
+      responseCache.delete(responseCache.keys().next().value);
+    }
+  }
+  return response;
+};
+
+api.interceptors.response.use((response) => {
+  const { config } = response;
+  if ((config.method || 'get').toLowerCase() !== 'get') {
+    return response;
+  }
+  return revalidated(api.getUri(config), response);
+});
+
+// List endpoints are keyset-paginated: the cursor for the next page is
+// returned in the X-Next-Cursor response header.
+// Pass params.cursor to continue from a cursor obtained elsewhere (e.g. a profile).
+export async function* iteratePages(url, params = {}) {
+  let { cursor } = params;
+  do {
+    const response = await api.get(url, { params: { ...params, cursor } });
+    yield response.data;
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+}
+
+// Collect every page into a single response-like object ({ data: [...] })
+const getAllPages = async (url, params = {}) => {
+  const data = [];
+  for await (const page of iteratePages(url, params)) {
+    data.push(...page);
+  }
+  return { data };
+};
+
 // Employee API calls
 export const employeeAPI = {
-  getAll: () => api.get('/employees'),
+  getAll: (params = {}) => getAllPages('/employees', params),
+  pages: (params = {}) => iteratePages('/employees', params),
+  // One page of matches for q (name, email or employee ID) and/or department
+  search: (params = {}) => api.get('/employees/search', { params }),
   getById: (employeeId) => api.get(`/employees/${employeeId}`),
+  // Employee, newest attendance (params.limit records, next_cursor for more)
+  // and stats in one request; start_date/end_date bound both
+  getProfile: (employeeId, params = {}) => api.get(`/employees/${employeeId}/profile`, { params }),
   create: (data) => api.post('/employees', data),
   delete: (employeeId) => api.delete(`/employees/${employeeId}`),
   getDashboardSummary: () => api.get('/employees/dashboard/summary'),
@@ -21,11 +97,40 @@ export const employeeAPI = {
 
 // Attendance API calls
 export const attendanceAPI = {
-  getAll: (params = {}) => api.get('/attendance', { params }),
+  getAll: (params = {}) => getAllPages('/attendance', params),
+  pages: (params = {}) => iteratePages('/attendance', params),
   getByEmployeeId: (employeeId) => api.get(`/attendance/${employeeId}`),
   create: (data) => api.post('/attendance', data),
   getStatsByEmployee: () => api.get('/attendance/stats/by-employee'),
   getStatsByEmployeeId: (employeeId) => api.get(`/attendance/stats/${employeeId}`),
 };
 
+// Several API calls in one HTTP request. Each call is { method, path, params, body }
+// with path relative to the API root; results come back in order as
+// response-like objects ({ status, headers, data }). GET calls are revalidated
+// against the same ETag cache as individual requests.
+export const batchAPI = {
+  run: async (calls) => {
+    const requests = calls.map(({ method = 'GET', path, params = {}, body }) => {
+      const call = { method, path, params, body };
+      if (method === 'GET') {
+        const cached = responseCache.get(api.getUri({ url: path, params }));
+        if (cached) {
+          call.headers = { 'If-None-Match': cached.etag };
+        }
+      }
+      return call;
+    });
+    const response = await api.post('/batch', { requests });
+    return response.data.responses.map(({ status, headers, body }, index) => {
+      const { method = 'GET', path, params = {} } = calls[index];
+      const result = { status, headers, data: body };
+      if (status >= 400) {
+        throw Object.assign(new Error(`${method} ${path} failed with status ${status}`), { response: result });
+      }
+      return method === 'GET' ? revalidated(api.getUri({ url: path, params }), result) : result;
+    });
+  },
+};
+
 export default api;